@@ -0,0 +1,81 @@
+"""
+@name
+    `gui_analytical.py`
+
+@description
+    `src file for the closed-form Ogata-Banks solution of the ADE mode`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import numpy as np
+from gui_solver import TransportModel, INACTIVE
+
+
+def _scaled_erfc(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    r'''
+    Function to evaluate exp(a) * erfc(b) without overflow,
+    using the Chebyshev fit of erfc (fractional error < 1.2e-7).
+    '''
+    z = np.abs(b)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (0.27886807
+           + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    positive = t * np.exp(np.minimum(a - z * z + poly, 700.0))
+    return np.where(b >= 0, positive, 2.0 * np.exp(np.minimum(a, 700.0)) - positive)
+
+
+def step_response(x: float, t: np.ndarray, velocity: float, dispersion: float, retardation: float) -> np.ndarray:
+    r'''
+    Function to return the Ogata-Banks concentration at depth
+    `x` for a constant unit inlet concentration from t = 0:
+
+        C = 1/2 [erfc((Rx - vt) / 2√(DRt)) + exp(vx/D) erfc((Rx + vt) / 2√(DRt))]
+    '''
+    t = np.asarray(t, dtype=np.float64)
+    positive = t > 0
+    ts = np.where(positive, t, 1.0)
+    scale = 2.0 * np.sqrt(dispersion * retardation * ts)
+    first = _scaled_erfc(np.zeros_like(ts), (retardation * x - velocity * ts) / scale)
+    second = _scaled_erfc(np.full_like(ts, velocity * x / dispersion), (retardation * x + velocity * ts) / scale)
+    return np.where(positive, 0.5 * (first + second), 0.0)
+
+
+def is_single_domain(model: TransportModel) -> bool:
+    r'''
+    Function to check that the model reduces to one mobile
+    region with equilibrium sorption only, the ADE setting.
+    '''
+    if len(model.regions) != 1:
+        return False
+    region = model.regions[0]
+    return region["velocity"] > 0 and (region["rate"] <= INACTIVE or region["kinetic_capacity"] <= INACTIVE)
+
+
+def breakthrough(variables: dict, observation_times: np.ndarray) -> np.ndarray:
+    r'''
+    Function to evaluate the outlet concentration at all
+    `observation_times` at once. The pulse of length
+    `Pulse time` is the superposition of a unit step at
+    t = 0 and a negative step at the pulse time.
+    '''
+    model = TransportModel(variables)
+    if not is_single_domain(model):
+        raise ValueError("The analytical solution needs a single mobile region with equilibrium sorption (ADE mode)")
+    region = model.regions[0]
+    velocity = region["velocity"]
+    dispersion = model.dispersivity * velocity
+    if dispersion <= 0:
+        raise ValueError("The analytical solution needs a positive Dispersivity")
+
+    times = np.asarray(observation_times, dtype=np.float64)
+    response = step_response(model.length, times, velocity, dispersion, region["retardation"])
+    return response - step_response(model.length, times - model.pulse_time, velocity, dispersion, region["retardation"])
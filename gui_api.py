@@ -0,0 +1,224 @@
+"""
+@name
+    `gui_api.py`
+
+@description
+    `src file for the headless Python API: forward and parameter estimation runs without any window`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+    * matplotlib (only for `Project.save_figure`)
+
+"""
+
+import os
+import shutil
+import numpy as np
+import gui_io
+from gui_loader import parse_output, parse_timestamps
+from gui_engine import AUTO, create_engine
+from gui_workspace import WorkspaceManager
+from gui_supervisor import ProcessSupervisor
+from gui_pestfile import ControlFile
+from gui_multistart import read_estimation_result
+from gui_pipeline import (EstimationPipeline, PE_ALIASES, APP_DIR, UTILITY_TIMEOUT, DEFAULT_CACHE_DIR, PREPARE_STAGES,
+                          ESTIMATE_STAGES, NATIVE_STAGES, MULTISTART_STAGES)
+
+
+class ProjectError(RuntimeError):
+    r'''
+    Exception raised when a headless run fails.
+    '''
+
+
+def resolve_name(name: str) -> str:
+    r'''
+    Function to map a variable name or the PEST
+    alias of an estimable variable (qs, qf, omegaim,
+    omegasf, alpha) to the variable name.
+    '''
+    aliases = {alias: key for key, alias in PE_ALIASES.items()}
+    name = aliases.get(name.strip(), name.strip())
+    if name not in gui_io.VARIABLE_NAMES:
+        raise ValueError("Unknown variable '{}'".format(name))
+    return name
+
+
+class Project(object):
+    r'''
+    Class to drive the model without a window: load the
+    input files, apply a mode, run forward or parameter
+    estimation jobs and write results and figures. Runs
+    happen in workspaces, the input files only change on
+    `save()`.
+
+    Usage:
+        >>> project = Project.from_directory(".")
+        >>> project.apply_mode("ADE")
+        >>> time, observed, simulated = project.run(output_path="./output.dat")
+        >>> project.save_figure("./btc.png", time, observed, simulated)
+    '''
+
+    def __init__(self, first_file_path: str, second_file_path: str, third_file_path: str, exe_file_path: str = None,
+                 workspace_root: str = "./.tmp/runs", log=print):
+        self.input_paths = [first_file_path, second_file_path, third_file_path]
+        self.exe_file_path = exe_file_path
+        self.mode = "TPNE"
+        self.log = log
+        self.variables = gui_io.read_variables(first_file_path, third_file_path)
+        self.observed = np.array(gui_io.read_concentrations(first_file_path), dtype=np.float64)
+        self.times = parse_timestamps(second_file_path)
+        self._workspaces = WorkspaceManager(workspace_root)
+
+    @classmethod
+    def from_directory(cls, directory: str = ".", exe_file_path: str = None, **kwargs):
+        paths = [os.path.join(directory, name) for name in gui_io.INPUT_FILES]
+        for path in paths:
+            if not os.path.exists(path):
+                raise ProjectError("Input file {} not found".format(path))
+        if exe_file_path is None and os.path.exists(os.path.join(directory, "test.exe")):
+            exe_file_path = os.path.join(directory, "test.exe")
+        return cls(*paths, exe_file_path=exe_file_path, **kwargs)
+
+    def set(self, name: str, value) -> None:
+        self.variables[resolve_name(name)] = str(value)
+
+    def apply_mode(self, mode: str) -> None:
+        gui_io.apply_mode(mode, self.variables)
+        self.mode = mode
+
+    def save(self) -> None:
+        r'''
+        Function to write the variables back to the input files.
+        '''
+        gui_io.write_variables(*self.input_paths, self.variables)
+
+    def _stage(self, kind: str):
+        workspace = self._workspaces.create(kind)
+        self._workspaces.stage_inputs(workspace, *self.input_paths, exe_file_path=self.exe_file_path)
+        gui_io.write_variables(workspace.file("in_1.dat"), workspace.file("in_2.dat"), workspace.file("in_3.dat"), self.variables)
+        return workspace
+
+    def run(self, engine: str = AUTO, output_path: str = None) -> tuple:
+        r'''
+        Function to run the forward model with the current
+        variables on the engine registered as `engine`,
+        optionally copying output.dat to `output_path`.
+
+        Returns the (time, observed, simulated) arrays.
+        '''
+        model = create_engine(engine, self.exe_file_path, mode=self.mode, variables=self.variables)
+        if model.identity is None:
+            raise ProjectError("Path of test.exe is not defined")
+
+        workspace = self._stage("run")
+        try:
+            returncode = model.run(workspace.path)
+            if returncode != 0 or not os.path.exists(workspace.file("output.dat")):
+                raise ProjectError("{} run failed with exit code {}".format(model.name, returncode))
+            output = parse_output(workspace.file("output.dat"))
+            if output_path:
+                shutil.copy(workspace.file("output.dat"), output_path)
+        finally:
+            self._workspaces.release(workspace)
+
+        self.log(">>> [INFO] Forward run done ({})".format(model.name))
+        n = min(len(self.times), len(output))
+        return self.times[:n], output[:n, 0], output[:n, 1]
+
+    def estimate(self, initial: dict, bounds: dict = None, method: str = "PEST", engine: str = AUTO, starts: int = 1,
+                 workers: int = None, timeout: float = None, app_dir: str = APP_DIR, cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+        r'''
+        Function to estimate the variables of `initial`
+        (variable name or alias -> initial guess) with
+        `method` ("PEST" or "Native LM"); the other
+        estimable variables keep their values. `bounds` maps
+        names to (lower, upper), PESTGEN defaults otherwise.
+        With `starts` above 1 a multi-start calibration runs.
+
+        Returns the result of <gui_multistart.read_estimation_result>
+        with the estimated "variables", the "record" path and the
+        kept "workspace" path.
+        '''
+        state = {key: "determined" for key in PE_ALIASES}
+        for name, value in initial.items():
+            key = resolve_name(name)
+            if key not in PE_ALIASES:
+                raise ValueError("Variable '{}' cannot be estimated".format(key))
+            state[key] = float(value)
+        if all(value == "determined" for value in state.values()):
+            raise ValueError("No variable to estimate")
+
+        model = create_engine(engine, self.exe_file_path, mode=self.mode, variables=self.variables)
+        workspace = self._stage("pe")
+        self.log(">>> [INFO] PE session directory: {}".format(workspace.path))
+        context = {
+            "aliases": list(PE_ALIASES.items()),
+            "variable_state": state,
+            "values": {key: self.variables[key] for key in PE_ALIASES},
+            "observations": [float(x) for x in self.observed],
+            "n_observations": len(self.observed),
+            "timeout": timeout,
+            "on_pest_line": None,
+            "engine": method,
+            "model_engine": model.name,
+            "starts": starts,
+            "variable_dictionary": dict(self.variables),
+            "workers": workers or os.cpu_count(),
+            "on_iteration": None,
+            "cancel_event": None,
+        }
+
+        supervisor = ProcessSupervisor(log=self.log)
+        pipeline = EstimationPipeline(supervisor, app_dir, cache_dir=cache_dir, utility_timeout=UTILITY_TIMEOUT, log=self.log)
+        try:
+            pipeline.run(PREPARE_STAGES, context, workspace)
+            pst = ControlFile.read(workspace.file("pestgen.pst"))
+            limits = {PE_ALIASES[resolve_name(name)]: value for name, value in (bounds or {}).items()}
+            context["bounds"] = {}
+            for alias, parameter in pst.parameters.items():
+                lower, upper = limits.get(alias, (parameter["lower"], parameter["upper"]))
+                context["bounds"][alias] = {"lower": str(float(lower)), "upper": str(float(upper))}
+            if starts > 1:
+                stages = MULTISTART_STAGES
+            else:
+                stages = NATIVE_STAGES if method == "Native LM" else ESTIMATE_STAGES
+            pipeline.run(stages, context, workspace)
+        finally:
+            supervisor.shutdown()
+            self._workspaces.release(workspace, keep=True)
+
+        if not os.path.exists(workspace.file("test.rec")):
+            raise ProjectError("Parameter estimation wrote no run record")
+        result = read_estimation_result(workspace.file("test.rec"))
+        keys = {alias: key for key, alias in PE_ALIASES.items()}
+        result["variables"] = {keys[alias]: value for alias, value in result["parameters"].items() if alias in keys}
+        result["record"] = workspace.file("test.rec")
+        result["workspace"] = workspace.path
+        return result
+
+    def save_figure(self, path: str, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray) -> None:
+        r'''
+        Function to save the observed and simulated
+        breakthrough curves to an image file, drawn on a
+        bare figure so no window toolkit is loaded.
+        '''
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8, 4))
+        ax = fig.subplots()
+        ax.scatter(time, observed, marker='o', label='Observed', color='black')
+        ax.plot(time, simulated, label='Simulated [ {} ]'.format(self.mode))
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Simulated-BTC [ {} ]'.format(self.mode))
+        ax.legend()
+        ax.grid()
+        fig.savefig(path)
+        self.log(">>> [INFO] Figure saved to {}".format(path))
@@ -25,6 +25,8 @@
 
 """
 
+from __future__ import annotations
+
 
 r'''
 Import necessary packages,
@@ -39,30 +41,50 @@ except AssertionError as aE:
     raise OSError(ver_error)
 import functools
 import PySimpleGUI as sg
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import io
-import pickle
+from gui_lazy import LazyModule, STARTUP
 from collections import deque
 import os
 import shutil
 import warnings
 import uuid
-from gui_radio import GUIVariableSetter, GUILimitSetter, GUIModeInitializer
-import subprocess
-from collections import defaultdict
+from gui_radio import GUIVariableSetter, GUILimitSetter, GUIModeInitializer, GUISweepSetter, GUISensitivitySetter, GUIEnsembleSetter, GUIConvergenceSetter
+from gui_tracker import FileChangeTracker
+from gui_loader import PlotDataLoader, OutputTail, parse_output, parse_timestamps
+from gui_cache import ResultCache
+from gui_workspace import WorkspaceManager
+from gui_supervisor import ProcessSupervisor, LineBuffer
+from gui_pest import PestProgressParser
+from gui_pestfile import ControlFile, format_number
+from gui_engine import ENGINES, AUTO, RunCancelled, create_engine
+from gui_lod import level_of_detail, minmax_decimate
+from gui_render import FigureRenderer, to_ppm
+from gui_table import ObservationTable
 import threading
 import time
 
+# Deferred until first use: numpy and matplotlib cost seconds on a cold start.
+# Figures are bare <matplotlib.figure.Figure> objects owned by the window, the
+# analysis modules (sweep, sensitivity, estimation, ...) are imported by their handlers.
+np = LazyModule("numpy")
+
+# Seconds between two polls of output.dat, i.e. frames of the live plot, while the model runs.
+LIVE_PLOT_INTERVAL = 0.3
 
-class _ToolbarGUI(NavigationToolbar2Tk):
+
+@functools.lru_cache(maxsize=None)
+def _toolbar_class():
     r'''
-    Create custom toolbar for <matplotplib.pyplot>
+    Create custom toolbar for <matplotplib.pyplot>,
+    on first use so the Tk backend loads lazily
     '''
+    from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+
+    class _ToolbarGUI(NavigationToolbar2Tk):
 
-    def __init__(self, *args, **kwargs):
-        super(_ToolbarGUI, self).__init__(*args, **kwargs)
+        def __init__(self, *args, **kwargs):
+            super(_ToolbarGUI, self).__init__(*args, **kwargs)
+
+    return _ToolbarGUI
 
 
 def GUI_exception(f):
@@ -91,26 +113,42 @@ class GUIError(RuntimeError):
         ID = str(uuid.uuid1())
         GUI_Warning = "[{}] Error in {}: {}".format(ID, name, message)
         warnings.warn(GUI_Warning)
-        sg.popup(GUI_Warning, title="Error")
+        # Tk must only be called from the GUI thread, e.g. not from the render worker.
+        if threading.current_thread() is threading.main_thread():
+            sg.popup(GUI_Warning, title="Error")
 
 
-def PlotEncapsulator(func):
+def PlotEncapsulator(plot_key):
     r'''
-    Wrapper function to catch matplotlib figure into <matplotlib.pyplot.figure> 
+    Wrapper function to draw a plot method on the long-lived
+    figure of the canvas `plot_key`. The method is called with
+    the axes and a dict of the artists it kept on them last time,
+    empty when another method drew on the figure in between,
+    so it can update their data in place. It runs on the render
+    worker, see <GUIBase._show_figure>.
     '''
-    def encapsulator(*args, **kwargs):
-        plt.figure(1)
-        fig = plt.gcf()
-        buf = io.BytesIO()
-        pickle.dump(fig, buf)
-        buf.seek(0)
-        fig = pickle.load(buf)
-        DPI = fig.get_dpi()
-        fig.set_size_inches(407 * 2 / float(DPI), 407 / float(DPI))
-        func(*args, **kwargs)
-        plt.grid()
-        return fig
-    return encapsulator
+    def wrapper(func):
+
+        @functools.wraps(func)
+        def encapsulator(self, *args, **kwargs):
+            fig, state = self._figure(plot_key)
+
+            def draw():
+                if state["owner"] != func.__name__:
+                    fig.clear()
+                    fig.add_subplot()
+                    state["owner"], state["artists"] = func.__name__, {}
+                ax = fig.axes[0]
+                func(self, ax, state["artists"], *args, **kwargs)
+                ax.grid(True)
+
+            if self._renderer.on_thread():
+                draw()
+            else:
+                self._show_figure(plot_key, draw)
+            return fig
+        return encapsulator
+    return wrapper
 
 
 class GUIBase(object):
@@ -123,7 +161,7 @@ class GUIBase(object):
                 auto_size_text=False, finalize=True, element_justification='center', resizable=True)
 
         >>> while True:
-                event, values = GUI.window.read(timeout=50)
+                event, values = GUI.window.read(timeout=GUI.read_timeout)
 
                 if event == GUI.WIN_CLOSED:
                     break 
@@ -138,8 +176,7 @@ class GUIBase(object):
         self._second_input_path = "./in_2.dat" if os.path.exists("./in_2.dat") else None
         self._third_input_path = "./in_3.dat" if os.path.exists("./in_3.dat") else None
         self._exe_file_path = "./test.exe" if os.path.exists("./test.exe") else None
-        self._refresh_memory = {}
-        self._thread_queue = deque()
+        self._job_queue = deque()
         self._GUIKeys = {}
         self._window = None
         self._rendered_layout = None
@@ -148,6 +185,7 @@ class GUIBase(object):
         self.PopupAnimated = sg.PopupAnimated
         self.DEFAULT_BASE64_LOADING_GIF = sg.DEFAULT_BASE64_LOADING_GIF
         self.processing = False
+        self._busy = False
         self._VariableDict = {
             "nz": None,
             "nm": None,
@@ -180,15 +218,49 @@ class GUIBase(object):
             "No. of observation time steps": None,
         }
         self.is_initialized = False
-        self._base_value = [[idx, "NA"] for idx in range(1, 43)] 
-        self._timestamp_value = [[idx, "NA"] for idx in range(1, 43)]
+        self._observations = ObservationTable(["NA"] * 42, ["NA"] * 42)
+        self._table_start = 0
         self.mode = None
 
         if not os.path.exists("./.tmp"):
             os.mkdir("./.tmp")
+
+        self._refresh_memory = FileChangeTracker("./.tmp/manifest.json")
+        self._plot_data_loader = PlotDataLoader()
+        self._result_cache = ResultCache("./.tmp/results")
+        self._workspaces = WorkspaceManager("./.tmp/runs")
+        self._workspaces.cleanup(keep_latest=5)
+        self._supervisor = ProcessSupervisor(max_concurrent=os.cpu_count(), log=self._log)
+        self._cancel_event = threading.Event()
+        self._pe_session = None
+        self._pest_parser = None
+        self._last_estimate = None
+        self._ensemble_bands = None
+        self._tab_builders = {}
+        self._built_tabs = set()
+        self._figures = {}
+        self._canvases = {}
+        self._stale_plots = set()
+        self._images = {}
+        self._renderer = FigureRenderer(self._render_figure, lambda key, image: self._post_event("-PLOT-RENDERED-", (key, image)), log=self._log)
+        self._live = None
+        self._log_buffer = LineBuffer(maxlen=1000, notify=lambda: self._post_event("-LOG-LINES-"))
         
 
 
+    # Milliseconds between window reads and between frames of the loading GIF while a job runs.
+    _BUSY_TICK = 50
+    _BUSY_FRAME = 100
+
+    # Plot canvases: canvas key -> (key of its tab, key of its toolbar canvas).
+    _PLOT_TABS = {
+        "fig_plot_1": ("-TAB-PLOT-1-", "controls_plot_1"),
+        "fig_plot_2": ("-TAB-PLOT-2-", "controls_plot_2"),
+        "fig_plot_3": ("-TAB-PLOT-3-", "controls_plot_3"),
+        "fig_plot_4": ("-TAB-PLOT-4-", "controls_plot_4"),
+        "fig_plot_5": ("-TAB-PLOT-5-", "controls_plot_5"),
+    }
+
     def _create_plot_tab(self, toolbar_key, plot_key, plot_size=(400*2, 400), bg_color="#DAE0E6"):
 
         tab_layout = [[
@@ -205,6 +277,133 @@ class GUIBase(object):
 
         return tab_layout
 
+    # Placeholder of a tab whose content is built by `builder` when the tab is first selected.
+    def _create_lazy_tab(self, tab_key, builder):
+
+        self._tab_builders[tab_key] = builder
+        return [[sg.Column(layout=[[]], key=tab_key + "BODY-", pad=(0, 0))]]
+
+    # Builds the content of a lazy tab once.
+    def _build_tab(self, tab_key):
+
+        if tab_key in self._tab_builders and tab_key not in self._built_tabs:
+            self._built_tabs.add(tab_key)
+            self.window.extend_layout(self.window[tab_key + "BODY-"], self._tab_builders[tab_key]())
+
+    # Handles "-TABS-": builds the selected tab and redraws the figures that changed while it was hidden.
+    def on_tab_selected(self, tab_key):
+
+        self._build_tab(tab_key)
+        for plot_key, (key, toolbar_key) in self._PLOT_TABS.items():
+            if key == tab_key and plot_key in self._stale_plots:
+                self._show_figure(plot_key)
+
+    # Long-lived figure of the canvas `plot_key` and the drawing state kept by <PlotEncapsulator>.
+    # Created on the GUI thread, the render worker only uses figures that exist.
+    def _figure(self, plot_key):
+
+        if plot_key not in self._figures:
+            from matplotlib.figure import Figure
+            self._figures[plot_key] = (Figure(figsize=(8.14, 4.07), dpi=100), {"owner": None, "artists": {}})
+        return self._figures[plot_key]
+
+    # Interactive Tk canvas and toolbar of the figure `plot_key`, created when the user clicks its image.
+    def _canvas(self, plot_key):
+
+        if plot_key not in self._canvases:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            tab_key, toolbar_key = self._PLOT_TABS[plot_key]
+            self._build_tab(tab_key)
+            figure_canvas_agg = FigureCanvasTkAgg(self._figure(plot_key)[0], master=self.window[plot_key].TKCanvas)
+            toolbar = _toolbar_class()(figure_canvas_agg, self.window[toolbar_key].TKCanvas)
+            toolbar.update()
+            figure_canvas_agg.get_tk_widget().pack(side='right', fill='both', expand=1)
+            self._canvases[plot_key] = figure_canvas_agg
+        return self._canvases[plot_key]
+
+    # Queues `draw` (an update of the figure `plot_key`) on the render worker, rasterized now if its tab is shown,
+    # else when the tab is next selected. An update drops the interactive canvas: the figure goes back to the worker.
+    def _show_figure(self, plot_key, draw=None):
+
+        self._figure(plot_key)
+        if plot_key in self._canvases:
+            if draw is None:
+                self._canvases[plot_key].draw_idle()
+                return
+            self._release_canvas(plot_key)
+        tab_key, toolbar_key = self._PLOT_TABS[plot_key]
+        shown = self.window["-TABS-"].get() == tab_key
+        if shown:
+            self._stale_plots.discard(plot_key)
+        else:
+            self._stale_plots.add(plot_key)
+        self._renderer.submit(plot_key, draw, rasterize=shown)
+
+    # Runs on the render worker: applies `draw` and renders the figure with Agg into a PPM image.
+    # `draw` returns True when it rendered the canvas itself (see <_draw_live_frame>).
+    def _render_figure(self, plot_key, draw, rasterize):
+
+        rendered = draw() if draw is not None else False
+        if not rasterize:
+            return None
+        canvas = self._render_canvas(plot_key)
+        if not rendered:
+            canvas.draw()
+        return to_ppm(canvas)
+
+    # Agg canvas the render worker draws the figure `plot_key` on, while it has no interactive canvas.
+    def _render_canvas(self, plot_key):
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig, state = self._figure(plot_key)
+        if type(fig.canvas) is not FigureCanvasAgg:
+            FigureCanvasAgg(fig)
+        return fig.canvas
+
+    # Destroys the interactive canvas and toolbar of the figure `plot_key`, which is then rendered as an image again.
+    def _release_canvas(self, plot_key):
+
+        canvas = self._canvases.pop(plot_key)
+        canvas.toolbar.destroy()
+        canvas.get_tk_widget().destroy()
+
+    # Handles "-PLOT-RENDERED-": swaps the finished image into its tab.
+    def on_plot_rendered(self, value):
+
+        import tkinter as tk
+
+        plot_key, image = value
+        if plot_key in self._canvases or image is None:
+            return
+        tab_key, toolbar_key = self._PLOT_TABS[plot_key]
+        self._build_tab(tab_key)
+        canvas = self.window[plot_key].TKCanvas
+        photo = tk.PhotoImage(master=canvas, data=image, format="PPM")
+        if plot_key in self._images:
+            item = self._images[plot_key][0]
+            canvas.itemconfigure(item, image=photo)
+        else:
+            item = canvas.create_image(0, 0, anchor="nw", image=photo)
+            canvas.configure(cursor="hand2")
+            self.window[plot_key].bind("<Button-1>", "+INTERACT")
+        # Tk does not hold a reference to the image: keep it until the next swap.
+        self._images[plot_key] = (item, photo)
+
+    # Handles "<plot key>+INTERACT" (a click on a plot image): replaces the image by the interactive canvas and its
+    # toolbar for zoom and pan, until the next update of the figure.
+    def make_interactive(self, plot_key):
+
+        if plot_key in self._canvases or plot_key not in self._images:
+            return
+        # The worker must be done with the figure before the GUI thread takes it over.
+        self._renderer.wait()
+        canvas = self.window[plot_key].TKCanvas
+        canvas.unbind("<Button-1>")
+        canvas.configure(cursor="")
+        canvas.delete(self._images.pop(plot_key)[0])
+        self._canvas(plot_key).draw_idle()
+
     def _create_search_tab(self):
         tab_layout = [[
             sg.Column(
@@ -231,10 +430,13 @@ class GUIBase(object):
 
 
     def _create_editable_table_tab(self):
-        table_data = [[x[0], y[1], x[1]] for x, y in zip(self._base_value, self._timestamp_value)]
+        table_data = self.convert_values()
         tab_layout = [[
             sg.Column(
                 layout=[
+                    [sg.Button("<", key="-TABLE-PREV-"), sg.Text(self._table_page_text(), key="-TABLE-PAGE-", size=(28, 1), justification="center"),
+                     sg.Button(">", key="-TABLE-NEXT-"), sg.Input(size=(8, 1), key="-TABLE-ROW-"), sg.Button("Go to row", key="-TABLE-GOTO-"),
+                     sg.Input(size=(12, 1), key="-TABLE-SEARCH-"), sg.Button("Find", key="-TABLE-FIND-")],
                     [sg.Table(values=table_data, headings=["S.No", "Time", "Concentration"], size=(800, 500),
                         justification='left', font=("Helvetica 10 bold"), row_height=50, col_widths=50,
                         num_rows=7, key="-BASE-VALUE-TABLE-", vertical_scroll_only=True, alternating_row_color="lightblue", enable_events=True)],
@@ -248,92 +450,152 @@ class GUIBase(object):
         return tab_layout
 
 
-    @staticmethod
-    def _draw_plot_with_toolbar(canvas, fig, canvas_toolbar):
-        if canvas.children:
-            for child in canvas.winfo_children():
-                child.destroy()
-        if canvas_toolbar.children:
-            for child in canvas_toolbar.winfo_children():
-                child.destroy()
-        figure_canvas_agg = FigureCanvasTkAgg(fig, master=canvas)
-        figure_canvas_agg.draw()
-        toolbar = _ToolbarGUI(figure_canvas_agg, canvas_toolbar)
-        toolbar.update()
-        figure_canvas_agg.get_tk_widget().pack(side='right', fill='both', expand=1)
-
-
     @classmethod
-    def _refresh_utility(cls, first_file_path: str, second_file_path: str, third_file_path: str, memory: dict) -> bool:
+    def _refresh_utility(cls, first_file_path: str, second_file_path: str, third_file_path: str, memory: FileChangeTracker, exe_file_path: str = None) -> bool:
         """
         name: _refresh_utility
         definition: gui_func.py
-        description: Checks if any of the input files are changed/updated.
+        description: Checks if any of the input files or the executable are changed/updated.
         @params:
         1. cls: Class object
         2. first_file_path: Path of the first input file
         3. second_file_path: Path of the second input file
         4. third_file_path: Path of the third input file
-        5. memory: A dictionary containing previous md5 fingerprint
+        5. memory: <gui_tracker.FileChangeTracker> holding the persisted fingerprints
+        6. exe_file_path: Path of the exec file, optional
         @returns: Bool:True, if any updates detected. Bool:False othewise.
         """
         raise NotImplementedError("This function needs to be implemented in child class by `Utkarsh Jain`")
 
     @classmethod
-    def _nonblocking_execute_external_code(cls, exe_file_path: str, thread_queue: list):
+    def _nonblocking_execute_external_code(cls, exe_file_path: str, job_queue: deque, supervisor: ProcessSupervisor, on_complete=None, cwd: str = None, timeout: float = None):
         """
         name: _nonblocking_execute_external_code
         definition: gui_func.py
-        description: Runs the modeling in a seperate thread to keep thr GUI interactive.
+        description: Runs the modeling through the process supervisor to keep thr GUI interactive.
         @params:
         1. cls: Class object
         2. exe_file_path: Path of the exec file
-        3. thread_queue: List of all the running threads
-        @returns: None
+        3. job_queue: Queue of all the running <gui_supervisor.Job>
+        4. supervisor: <gui_supervisor.ProcessSupervisor> running the job
+        5. on_complete: Optional callable receiving the exit code of the run, None if it timed out or was cancelled
+        6. cwd: Working directory of the run, see <gui_workspace.RunWorkspace>
+        7. timeout: Wall-clock limit of the run in seconds, None for no limit
+        @returns: <gui_supervisor.Job>
         """
         raise NotImplementedError("This function needs to be implemented in child class by `Om Pandey`")
 
-    @classmethod
-    @PlotEncapsulator
-    def _plot_first_2D_data(cls, output_file_path: str, time_file_path: str):
+    @PlotEncapsulator("fig_plot_1")
+    def _plot_first_2D_data(self, ax, artists, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray):
         """
         name: _plot_first_2D_data
         definition: gui_func.py
         description: Plot the concentration vs time graph for experimental data.
         @params:
-        1. cls: Class object
-        2. output_file_path: Path of the file containing the experimental data
-        3. time_file_path: Path of the file containing the time stamps
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. time: Array of the time stamps
+        5. observed: Array of the experimental concentrations
+        6. simulated: Array of the simulated concentrations
         @returns: None
         """
         raise NotImplementedError("This function needs to be implemented in child class by `Navya`")
 
-    @classmethod
-    @PlotEncapsulator
-    def _plot_second_2D_data(cls, output_file_path: str, time_file_path: str):
+    @PlotEncapsulator("fig_plot_2")
+    def _plot_second_2D_data(self, ax, artists, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray):
         """
         name: _plot_second_2D_data
         definition: gui_func.py
         description: Plot the concentration vs time graph for experimental data.
         @params:
-        1. cls: Class object
-        2. output_file_path: Path of the file containing the simulated data
-        3. time_file_path: Path of the file containing the time stamps
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. time: Array of the time stamps
+        5. observed: Array of the experimental concentrations
+        6. simulated: Array of the simulated concentrations
         @returns: None
         """
         raise NotImplementedError("This function needs to be implemented in child class by `Navya`")
 
-    @classmethod
-    @PlotEncapsulator
-    def _plot_both_2D_data(cls, output_file_path: str, time_file_path: str):
+    @PlotEncapsulator("fig_plot_4")
+    def _plot_convergence(self, ax, artists, records: list):
+        """
+        name: _plot_convergence
+        definition: gui_func.py
+        description: Plot phi and Marquardt lambda against the PEST iteration number.
+        @params:
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. records: Iteration records of <gui_pest.PestProgressParser>
+        @returns: None
+        """
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    @PlotEncapsulator("fig_plot_5")
+    def _plot_sensitivity(self, ax, artists, indices: dict):
+        """
+        name: _plot_sensitivity
+        definition: gui_func.py
+        description: Plot the sensitivity indices as a ranked horizontal bar chart.
+        @params:
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. indices: Result of <gui_sensitivity.SensitivityStudy.indices>
+        @returns: None
+        """
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    @PlotEncapsulator("fig_plot_4")
+    def _plot_grid_convergence(self, ax, artists, time: np.ndarray, result: dict):
+        """
+        name: _plot_grid_convergence
+        definition: gui_func.py
+        description: Overlay the simulated curves of every grid of a convergence study.
+        @params:
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. time: Array of the time stamps
+        5. result: Result of <gui_convergence.run_grid_convergence>
+        @returns: None
+        """
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    @PlotEncapsulator("fig_plot_3")
+    def _plot_mode_comparison(self, ax, artists, time: np.ndarray, observed: np.ndarray, result: dict):
+        """
+        name: _plot_mode_comparison
+        definition: gui_func.py
+        description: Overlay the simulated curves of every mode on the observations.
+        @params:
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. time: Array of the time stamps
+        5. observed: Array of the experimental concentrations
+        6. result: Result of <gui_compare.compare_modes>
+        @returns: None
+        """
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    @PlotEncapsulator("fig_plot_3")
+    def _plot_both_2D_data(self, ax, artists, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray, bands: dict = None):
         """
         name: _plot_second_2D_data
         definition: gui_func.py
         description: Plot the combined experimental and simulated data in a single graph.
         @params:
-        1. cls: Class object
-        2. output_file_path: Path of the file containing the simulated data
-        3. time_file_path: Path of the file containing the time stamps
+        1. self: Class instance
+        2. ax: Axes of the long-lived figure of the canvas
+        3. artists: Dict of the artists kept by the previous call, to update in place
+        4. time: Array of the time stamps
+        5. observed: Array of the experimental concentrations
+        6. simulated: Array of the simulated concentrations
+        7. bands: Optional result of <gui_ensemble.run_ensemble> drawn as percentile bands
         @returns: None
         """
         raise NotImplementedError("This function needs to be implemented in child class by `Navya`")
@@ -353,14 +615,23 @@ class GUIBase(object):
             "plot_2_toolbar": "controls_plot_2",
             "plot_2_canvas":  "fig_plot_2",
             "plot_3_toolbar": "controls_plot_3",
-            "plot_3_canvas":  "fig_plot_3"
+            "plot_3_canvas":  "fig_plot_3",
+            "plot_4_toolbar": "controls_plot_4",
+            "plot_4_canvas":  "fig_plot_4",
+            "plot_5_toolbar": "controls_plot_5",
+            "plot_5_canvas":  "fig_plot_5"
         }
 
-        plot1_layout = self._create_plot_tab("controls_plot_1", "fig_plot_1")
-        plot2_layout = self._create_plot_tab("controls_plot_2", "fig_plot_2")
-        plot3_layout = self._create_plot_tab("controls_plot_3", "fig_plot_3")
-        plot4_layout = self._create_search_tab()
+        # Only the first tab is built with the window, the others when first selected.
+        plot_tabs = {plot_key: functools.partial(self._create_plot_tab, toolbar_key, plot_key)
+                     for plot_key, (tab_key, toolbar_key) in self._PLOT_TABS.items()}
+        plot1_layout = self._create_lazy_tab("-TAB-PLOT-1-", plot_tabs["fig_plot_1"])
+        plot2_layout = self._create_lazy_tab("-TAB-PLOT-2-", plot_tabs["fig_plot_2"])
+        plot3_layout = self._create_lazy_tab("-TAB-PLOT-3-", plot_tabs["fig_plot_3"])
+        plot4_layout = self._create_lazy_tab("-TAB-EDITOR-", self._create_search_tab)
         plot5_layout = self._create_editable_table_tab()
+        plot6_layout = self._create_lazy_tab("-TAB-PLOT-4-", plot_tabs["fig_plot_4"])
+        plot7_layout = self._create_lazy_tab("-TAB-PLOT-5-", plot_tabs["fig_plot_5"])
 
         layout = [
             [sg.Text('Triple Porosity Dual Permeability Three Site Interface', justification='center', size=(50, 1), font=("Helvetica 20 bold"))],
@@ -370,13 +641,25 @@ class GUIBase(object):
             sg.Input(key='-FILE4-', visible=False, enable_events=True), sg.B(button_text="EXE Browse", key="EXE Browse", visible=False),
             sg.Button(button_text="Run", key="-REFRESH-"),
             sg.Button(button_text="PE Mode", key="PE/FM"),
+            sg.Combo(["PEST", "Native LM"], default_value="PEST", key="-PE-ENGINE-", readonly=True, size=(10, 1)),
+            sg.Text("Starts"), sg.Spin(list(range(1, 65)), initial_value=1, key="-PE-STARTS-", size=(3, 1)),
+            sg.Button(button_text="Sweep", key="-SWEEP-"),
+            sg.Button(button_text="Sensitivity", key="-SENSITIVITY-"),
+            sg.Button(button_text="Compare Modes", key="-COMPARE-"),
+            sg.Button(button_text="Uncertainty", key="-ENSEMBLE-"),
+            sg.Button(button_text="Grid Study", key="-GRID-"),
+            sg.Text("Engine"), sg.Combo([AUTO] + list(ENGINES.keys()), default_value=AUTO, key="-ENGINE-", readonly=True, size=(10, 1)),
+            sg.Button(button_text="Cancel", key="-CANCEL-", disabled=True),
+            sg.Text("Timeout [s]"), sg.Input(key="-TIMEOUT-", size=(6, 1)),
             sg.Button(button_text="Select Model", key="mode-select")],
-            [sg.TabGroup([[sg.Tab('Experimental Data', plot5_layout),
-                        sg.Tab('Experimental Plot', plot1_layout), 
-                        sg.Tab('Simulation Plot', plot2_layout, visible=False),
-                        sg.Tab('Simulated Plot', plot3_layout),
-                        sg.Tab('Variable Editor', plot4_layout, visible=False),
-                        ]])],
+            [sg.TabGroup([[sg.Tab('Experimental Data', plot5_layout, key="-TAB-DATA-"),
+                        sg.Tab('Experimental Plot', plot1_layout, key="-TAB-PLOT-1-"), 
+                        sg.Tab('Simulation Plot', plot2_layout, visible=False, key="-TAB-PLOT-2-"),
+                        sg.Tab('Simulated Plot', plot3_layout, key="-TAB-PLOT-3-"),
+                        sg.Tab('Variable Editor', plot4_layout, visible=False, key="-TAB-EDITOR-"),
+                        sg.Tab('Convergence', plot6_layout, key="-TAB-PLOT-4-"),
+                        sg.Tab('Sensitivity', plot7_layout, key="-TAB-PLOT-5-"),
+                        ]], key="-TABS-", enable_events=True)],
             [sg.Text('Logs', font=("Helvetica 15 bold"), justification='center', size=(50, 1))],
             [sg.Output(size=(114, 10), key="-output-")]
 
@@ -396,7 +679,9 @@ class GUIBase(object):
             modes = variable_dict.keys()
             all_variables = self._VariableDict.keys()
             initializer = GUIModeInitializer(modes, all_variables, variable_dict, auto_dict=self._VariableDict)
+            STARTUP.mark("mode dialog")
             result, mode = initializer.run()
+            STARTUP.resume()
             self.mode = mode
             if result == None:
                 raise SystemExit("GUI operation terminated")
@@ -409,34 +694,95 @@ class GUIBase(object):
         if self._window:
             return self._window
         else:
-            self._window = sg.Window(size=self._window_size, **self._extra_argument, 
-                layout=self._rendered_layout if self._rendered_layout else self._create_layout())
+            layout = self._rendered_layout if self._rendered_layout else self._create_layout()
+            STARTUP.mark("layout")
+            self._window = sg.Window(size=self._window_size, **self._extra_argument, layout=layout)
+            self._window["-BASE-VALUE-TABLE-"].bind("<Double-Button-1>", "+EDIT")
+            STARTUP.mark("main window")
+            print(">>> [INFO] {}".format(STARTUP.write()))
 
             return self._window
 
     # Function to plot all the three graphs and display them in their repsective tabs.
+    @GUI_exception
     def _draw_plots(self):
 
-        fig1 = self._plot_first_2D_data("./output.dat", self._second_input_path)
-        fig2 = self._plot_second_2D_data("./output.dat", self._second_input_path)
-        fig3 = self._plot_both_2D_data("./output.dat", self._second_input_path)
-        self._draw_plot_with_toolbar(self.window['fig_plot_1'].TKCanvas, fig1, self.window['controls_plot_1'].TKCanvas)
-        self._draw_plot_with_toolbar(self.window['fig_plot_2'].TKCanvas, fig2, self.window['controls_plot_2'].TKCanvas)
-        self._draw_plot_with_toolbar(self.window['fig_plot_3'].TKCanvas, fig3, self.window['controls_plot_3'].TKCanvas)
-
-    # Function to check if any thread is still running.
-    def _is_any_thread_running(self):
-
-        if self._thread_queue:
-            for idx in range(len(self._thread_queue)):
-                curr_thread = self._thread_queue.popleft()
-                if curr_thread.is_alive():
-                    self._thread_queue.append(curr_thread)
-                else:
-                    curr_thread.join()
-                    self._draw_plots()
-        
-        return True if self._thread_queue else False
+        data = self._plot_data_loader.load("./output.dat", self._second_input_path)
+        self._plot_first_2D_data(*data)
+        self._plot_second_2D_data(*data)
+        self._plot_both_2D_data(*data, bands=self._ensemble_bands)
+
+    # Posts an event from a background thread into the window's event queue.
+    def _post_event(self, key, value=None):
+
+        if self._window:
+            self._window.write_event_value(key, value)
+
+    # Thread-safe logging: background threads hand their messages to the event loop.
+    def _log(self, message):
+
+        if self._window:
+            self._window.write_event_value("-LOG-", message)
+        else:
+            print(message)
+
+    # Handles "-RUN-DONE-": drops ended jobs and redraws after a successful model run.
+    def on_run_done(self, returncode):
+
+        self._stop_live_plot()
+        self._job_queue = deque(job for job in self._job_queue if not job.done())
+        if returncode == 0:
+            self._refresh_memory.commit()
+            self._draw_plots()
+            self._refreshed = True
+
+    # Timeout of the event loop's window.read: a tick that animates the busy indicator while a job runs, else blocking.
+    @property
+    def read_timeout(self):
+
+        return self._BUSY_TICK if self._busy else None
+
+    # Shows/animates/hides the busy indicator; freezes/unfreezes the buttons only when the state changes.
+    def update_busy_state(self):
+
+        busy = self.is_processing
+        if busy:
+            # PopupAnimated advances the GIF only when called again, once per read_timeout tick.
+            self.PopupAnimated(self.DEFAULT_BASE64_LOADING_GIF, background_color='green', transparent_color='green',
+                               time_between_frames=self._BUSY_FRAME)
+        if busy == self._busy:
+            return
+        self._busy = busy
+        if busy:
+            self.freeze_buttons()
+        else:
+            self.PopupAnimated(None)
+            self.unfreeze_buttons()
+
+    # Wall-clock limit for model runs entered next to the Run button, None if empty.
+    def _model_timeout(self):
+
+        try:
+            value = float(self.window["-TIMEOUT-"].get())
+        except (TypeError, ValueError):
+            return None
+        return value if value > 0 else None
+
+    # Cancels every supervised job and any running sweep.
+    def cancel_jobs(self):
+
+        print(">>> [INFO] Cancelling running jobs")
+        self._cancel_event.set()
+        self._supervisor.cancel_all()
+
+    # Stops all jobs and closes the main window.
+    def close(self):
+
+        self._cancel_event.set()
+        self._supervisor.shutdown()
+        self._renderer.close()
+        if self._window:
+            self._window.close()
 
     # Controls the functionality of the Run/Refresh buttons. Checks if all the files are uploaded or not.
     def refresh(self):
@@ -451,32 +797,244 @@ class GUIBase(object):
             sg.Popup("Path of Input file 3 is not defined")
             return    
 
+        engine = self._model_engine()
         is_refresh_required = False
-        is_refresh_required = self._refresh_utility(self._first_input_path, self._second_input_path, self._third_input_path, self._refresh_memory)
-
-        if is_refresh_required is False:
+        is_refresh_required = self._refresh_utility(self._first_input_path, self._second_input_path, self._third_input_path, self._refresh_memory, engine.identity)
+
+        if is_refresh_required is False and os.path.exists("./output.dat"):
+            # Workspace unchanged since the last completed run, possibly
+            # in an earlier session: reuse output.dat instead of re-running.
+            if not self._refreshed:
+                self._update_tables()
+                self._draw_plots()
+                self._refreshed = True
             return
         
-        if self._exe_file_path is None:
+        if engine.identity is None:
             sg.Popup("Path of test.exe is not defined")
             return
 
-        self._nonblocking_execute_external_code(self._exe_file_path, self._thread_queue)
-        self.window["-VARIABLE-TABLE-"].update(values=[[x, str(self._VariableDict[x])] for x in self._VariableDict.keys()])
-        to_write = self._import_timestamps_data(self.first_input_path, self.second_input_path, self.third_input_path)
-        self._timestamp_value = [[idx+1, val] for idx, val in enumerate(to_write)]
-        to_write = self._import_concentration_data(self.first_input_path, self.second_input_path, self.third_input_path)
-        self._base_value = [[idx+1, val] for idx, val in enumerate(to_write)]
-        self.window["-BASE-VALUE-TABLE-"].update(values=self.convert_values())
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        result_key = self._result_cache.key(engine.identity, input_paths)
+        if self._result_cache.restore(result_key, "./output.dat"):
+            self._refresh_memory.commit()
+            self._update_tables()
+            self._draw_plots()
+            self._refreshed = True
+            return
+
+        # Read on the GUI thread, collect_result runs on a worker.
+        timeout = self._model_timeout()
+        self._cancel_event.clear()
+        workspace = self._workspaces.create("run")
+        self._workspaces.stage_inputs(workspace, *input_paths, exe_file_path=None if engine.in_process else self._exe_file_path)
+        live_done = self._start_live_plot(workspace.file("output.dat"))
+
+        def collect_result(returncode):
+            live_done.set()
+            if returncode == 0 and workspace.collect("output.dat", "./output.dat"):
+                self._result_cache.store(result_key, "./output.dat")
+                if engine.in_process and self._exe_file_path is not None:
+                    self._cross_check(engine, input_paths, parse_output("./output.dat")[:, 1], timeout)
+            else:
+                self._refresh_memory.discard()
+            self._workspaces.release(workspace)
+            self._post_event("-RUN-DONE-", returncode)
+
+        if engine.in_process:
+            self._run_in_process(engine, workspace, collect_result)
+        else:
+            self._nonblocking_execute_external_code(workspace.file("test.exe"), self._job_queue, self._supervisor, on_complete=collect_result,
+                                                    cwd=workspace.path, timeout=timeout)
+        self.update_busy_state()
+        self._update_tables()
+
+    # Follows `output_path` of a running model on a background thread, posting "-RUN-PROGRESS-" when rows arrive.
+    def _start_live_plot(self, output_path):
+
+        done = threading.Event()
+        tail = OutputTail(output_path)
+        self._live = {"tail": tail, "time": parse_timestamps(self._second_input_path), "line": None, "background": None, "view": None}
+
+        def follow():
+            try:
+                while not done.wait(LIVE_PLOT_INTERVAL):
+                    if tail.poll():
+                        self._post_event("-RUN-PROGRESS-")
+            except Exception as e:
+                self._log(" >>> [ERROR] Live plot stopped: {}".format(e))
+
+        threading.Thread(target=follow, daemon=True).start()
+        return done
+
+    # Handles "-RUN-PROGRESS-": queues a frame extending the simulated curve of the Simulated Plot.
+    def on_run_progress(self):
+
+        live = self._live
+        if live is None:
+            return
+        observed = self._observations.concentrations
+        self._show_figure("fig_plot_3", functools.partial(self._draw_live_frame, live, observed))
+
+    # Runs on the render worker: draws the curve read so far over a background saved without it, so a frame
+    # only rasterizes the line. The background is saved again whenever the view or the canvas changed.
+    def _draw_live_frame(self, live, observed):
+
+        rows = live["tail"].rows()
+        n = min(len(rows), len(live["time"]))
+        if n == 0:
+            return False
+        fig, state = self._figure("fig_plot_3")
+        if live["line"] is None or state["artists"].get("simulated") is not live["line"]:
+            if state["owner"] != "_plot_both_2D_data":
+                m = min(len(live["time"]), len(observed))
+                self._plot_both_2D_data(live["time"][:m], observed[:m], np.full(m, np.nan))
+            line = live["line"] = state["artists"].get("simulated")
+            if line is None:
+                return False
+            level_of_detail(line.axes).discard(line)
+            live["background"] = None
+
+        line, ax = live["line"], live["line"].axes
+        x, y = live["time"][:n], rows[:n, 1]
+        budget = level_of_detail(ax).budget()
+        if n > budget:
+            x, y = minmax_decimate(x, y, 2 * -(-n // budget))
+
+        for values, get_limits, set_limits in ((x, ax.get_xlim, ax.set_xlim), (y, ax.get_ylim, ax.set_ylim)):
+            low, high = get_limits()
+            finite = values[np.isfinite(values)]
+            if len(finite) and (finite.min() < low or finite.max() > high):
+                margin = 0.05 * (max(high, finite.max()) - min(low, finite.min()))
+                set_limits(min(low, finite.min() - margin), max(high, finite.max() + margin))
+
+        canvas = self._render_canvas("fig_plot_3")
+        view = (ax.get_xlim(), ax.get_ylim(), canvas.get_width_height(), id(canvas))
+        if live["background"] is None or live["view"] != view:
+            line.set_data([], [])
+            canvas.draw()
+            live["background"], live["view"] = canvas.copy_from_bbox(fig.bbox), view
+        else:
+            canvas.restore_region(live["background"])
+        line.set_data(x, y)
+        ax.draw_artist(line)
+        return True
+
+    # Ends the live plot, <_draw_plots> then redraws the final curve in full.
+    def _stop_live_plot(self):
+
+        self._live = None
+
+    # Function to create the model engine selected in the "-ENGINE-" combo.
+    def _model_engine(self):
+
+        return create_engine(self.window["-ENGINE-"].get() or AUTO, self._exe_file_path, mode=self.mode, variables=self._VariableDict)
+
+    # Runs test.exe on the same inputs in the background and logs how far an in-process engine deviates from it.
+    # Called from worker threads: `timeout` is read by the caller, no widget is touched here.
+    def _cross_check(self, engine, input_paths, simulated, timeout=None):
+
+        workspace = self._workspaces.create("check")
+        self._workspaces.stage_inputs(workspace, *input_paths, exe_file_path=self._exe_file_path)
+
+        def compare(job):
+            try:
+                if job.ok and os.path.exists(workspace.file("output.dat")):
+                    reference = parse_output(workspace.file("output.dat"))[:, 1]
+                    n = min(len(reference), len(simulated))
+                    self._log(">>> [INFO] Cross-check of {} against test.exe: max |difference| = {:.3G}".format(
+                        engine.name, float(np.max(np.abs(reference[:n] - simulated[:n]))) if n else float("nan")))
+            finally:
+                self._workspaces.release(workspace)
+
+        self._supervisor.submit([os.path.abspath(workspace.file("test.exe"))], cwd=workspace.path, timeout=timeout,
+                                name="Cross-check", on_done=compare)
+
+    # Runs an in-process model engine on a background thread, reporting like a supervised job.
+    # "-CANCEL-" stops it through `_cancel_event`.
+    def _run_in_process(self, engine, workspace, on_complete):
+
+        def engine_process(obj):
+            obj.processing = True
+            start = time.time()
+            returncode = None
+            try:
+                returncode = engine.run(workspace.path, cancel_event=obj._cancel_event)
+                obj._log(">>> [INFO] {} finished in {:.2f}s".format(engine.name, time.time() - start))
+            except RunCancelled as e:
+                obj._log(">>> [INFO] {} after {:.2f}s".format(e, time.time() - start))
+            except Exception as e:
+                obj._log(" >>> [ERROR] {} failed: {}".format(engine.name, e))
+            finally:
+                obj.processing = False
+                on_complete(returncode)
+
+        self.processing = True
+        engine_thread = threading.Thread(target=engine_process, args=(self,), daemon=True)
+        engine_thread.start()
+
+    # Function to reload the variable and experimental data tables from the input files.
+    def _update_tables(self):
+
+        if "-TAB-EDITOR-" in self._built_tabs:
+            self.window["-VARIABLE-TABLE-"].update(values=[[x, str(self._VariableDict[x])] for x in self._VariableDict.keys()])
+        self._observations.set_times(self._import_timestamps_data(self.first_input_path, self.second_input_path, self.third_input_path))
+        self._observations.set_concentrations(self._import_concentration_data(self.first_input_path, self.second_input_path, self.third_input_path))
+        self.show_table_page(self._table_start)
 
     @property
     def is_processing(self):
-        return self._is_any_thread_running() or self.processing
+        return bool(self._job_queue) or self.processing
 
+    # Rows of the shown page of the experimental data table.
     @GUI_exception
     def convert_values(self):
-        table_data = [[x[0], y[1], x[1]] for x, y in zip(self._base_value, self._timestamp_value)]
-        return table_data
+        return self._observations.page(self._table_start)
+
+    # "Rows a-b of n" label of the shown page.
+    def _table_page_text(self):
+        n = len(self._observations)
+        return "Rows {}-{} of {}".format(min(self._table_start + 1, n), min(self._table_start + self._observations.page_size, n), n)
+
+    # Shows the page of the experimental data table holding `row`, selecting that row when `select` is set.
+    def show_table_page(self, row, select=False):
+
+        self._table_start = self._observations.page_start(row)
+        table = self.window["-BASE-VALUE-TABLE-"]
+        if select:
+            table.update(values=self.convert_values(), select_rows=[row - self._table_start])
+            table.Widget.see(table.tree_ids[row - self._table_start])
+        else:
+            table.update(values=self.convert_values())
+        self.window["-TABLE-PAGE-"].update(self._table_page_text())
+
+    # Handles "-TABLE-PREV-"/"-TABLE-NEXT-".
+    def turn_table_page(self, step):
+
+        self.show_table_page(max(self._table_start + step * self._observations.page_size, 0))
+
+    # Handles "-TABLE-GOTO-": jumps to the 1-based row number entered in "-TABLE-ROW-".
+    def goto_table_row(self, text):
+
+        try:
+            row = int(text) - 1
+        except ValueError:
+            sg.popup("Enter a row number")
+            return
+        if not 0 <= row < len(self._observations):
+            sg.popup("Row {} is out of range 1-{}".format(text, len(self._observations)))
+            return
+        self.show_table_page(row, select=True)
+
+    # Handles "-TABLE-FIND-": jumps to the next row whose time or concentration contains `text`.
+    def find_in_table(self, text, selected):
+
+        after = self._table_start + selected[0] if selected else self._table_start - 1
+        row = self._observations.find(text, after=after)
+        if row is None:
+            sg.popup("No row contains '{}'".format(text))
+            return
+        self.show_table_page(row, select=True)
 
     def freeze_buttons(self):
         self.window["File1 Browse"].update(disabled=True)
@@ -485,6 +1043,12 @@ class GUIBase(object):
         self.window["EXE Browse"].update(disabled=True)
         self.window["-REFRESH-"].update(disabled=True)
         self.window["PE/FM"].update(disabled=True)
+        self.window["-SWEEP-"].update(disabled=True)
+        self.window["-SENSITIVITY-"].update(disabled=True)
+        self.window["-COMPARE-"].update(disabled=True)
+        self.window["-ENSEMBLE-"].update(disabled=True)
+        self.window["-GRID-"].update(disabled=True)
+        self.window["-CANCEL-"].update(disabled=False)
 
     def unfreeze_buttons(self):
         self.window["File1 Browse"].update(disabled=False)
@@ -493,6 +1057,12 @@ class GUIBase(object):
         self.window["EXE Browse"].update(disabled=False)
         self.window["-REFRESH-"].update(disabled=False)
         self.window["PE/FM"].update(disabled=False)
+        self.window["-SWEEP-"].update(disabled=False)
+        self.window["-SENSITIVITY-"].update(disabled=False)
+        self.window["-COMPARE-"].update(disabled=False)
+        self.window["-ENSEMBLE-"].update(disabled=False)
+        self.window["-GRID-"].update(disabled=False)
+        self.window["-CANCEL-"].update(disabled=True)
 
     @property
     def first_input_path(self):
@@ -568,15 +1138,22 @@ class GUIBase(object):
 
         raise NotImplementedError("This function needs to be implemented in child class")
 
+    # Handles "-BASE-VALUE-TABLE-+EDIT" (double click): edits the concentration of the row `row_value`
+    # (0-based, over all pages) and patches that one cell of the table.
     def edit_table_cells(self, table_key, row_value):
         if table_key == "-BASE-VALUE-TABLE-":
-            new_val = sg.popup_get_text("Enter value for entry {} from Base Values".format(row_value+1), default_text=str(self._base_value[row_value][1]))
+            new_val = sg.popup_get_text("Enter value for entry {} from Base Values".format(row_value+1), default_text=str(self._observations.rows(row_value, row_value + 1)[0][2]))
             if new_val:
                 row_value = int(row_value)
-                self._base_value[row_value][1] = float(new_val)
-                self.window[table_key].update(values=self._base_value)
-                to_save = ['2.64E-01', '3.60E-01', '4.70E-05', '5.20E-01', '9.76E-03', len(self._base_value)] + list(map(lambda x: x[1], self._base_value))
-                self._VariableDict["No. of observation time steps"] = str(len(self._base_value))
+                row = self._observations.set_concentration(row_value, float(new_val))
+                table = self.window[table_key]
+                idx = row_value - self._table_start
+                if 0 <= idx < len(table.tree_ids):
+                    table.Values[idx] = row
+                    table.Widget.item(table.tree_ids[idx], values=row)
+                concentrations = [x[2] for x in self._observations.rows(0, len(self._observations))]
+                to_save = ['2.64E-01', '3.60E-01', '4.70E-05', '5.20E-01', '9.76E-03', len(concentrations)] + concentrations
+                self._VariableDict["No. of observation time steps"] = str(len(concentrations))
                 self._export_concentration_data(to_save, self.first_input_path, self.second_input_path, self.third_input_path)
                 self._write_updated_values(self.first_input_path, self.second_input_path, self.third_input_path, self._VariableDict)
 
@@ -606,10 +1183,10 @@ class GUIBase(object):
             value = value.split("\n")
             value = list(filter(lambda x: len(x) > 0, value))
 
-            self._base_value = [[idx+1, val] for idx, val in enumerate(value)]
-            to_save = ['2.64E-01', '3.60E-01', '4.70E-05', '5.20E-01', '9.76E-03', len(self._base_value)] + list(map(lambda x: x[1], self._base_value))
-            self.window["-BASE-VALUE-TABLE-"].update(values=self.convert_values())
-            self._VariableDict["No. of observation time steps"] = str(len(self._base_value))
+            self._observations.set_concentrations(value)
+            to_save = ['2.64E-01', '3.60E-01', '4.70E-05', '5.20E-01', '9.76E-03', len(value)] + value
+            self.show_table_page(self._table_start)
+            self._VariableDict["No. of observation time steps"] = str(len(value))
             self._export_concentration_data(to_save, self.first_input_path, self.second_input_path, self.third_input_path)
             self._write_updated_values(self.first_input_path, self.second_input_path, self.third_input_path, self._VariableDict)
 
@@ -618,9 +1195,9 @@ class GUIBase(object):
             value = value.split("\n")
             value = list(filter(lambda x: len(x) > 0, value))
 
-            self._timestamp_value = [[idx+1, val] for idx, val in enumerate(value)]
-            self.window["-BASE-VALUE-TABLE-"].update(values=self.convert_values())
-            to_save = [1, 16.87] + list(map(lambda x: x[1], self._timestamp_value))
+            self._observations.set_times(value)
+            self.show_table_page(self._table_start)
+            to_save = [1, 16.87] + value
             self._export_timestamps_data(to_save, self.first_input_path, self.second_input_path, self.third_input_path)
 
     def _export_timestamps_data(self, time_series: list, first_file_path: str, second_file_path: str, third_file_path: str) -> None:
@@ -660,21 +1237,10 @@ class GUIBase(object):
         raise NotImplementedError("This function is to be implemented in child class")
 
     def run_parameter_estimation(self):
+        from gui_pipeline import EstimationPipeline, PE_ALIASES, APP_DIR, UTILITY_TIMEOUT, PREPARE_STAGES
 
-        variable_name = [
-            "Mesopore seepage velocity",
-            "Macropore seepage velocity",
-            "Solute mass transfer rate b/w meso-micropore",
-            "Solute mass transfer rate b/w meso-macropore",
-            "Dispersivity",
-        ]
-        variable_alias = {
-            "Mesopore seepage velocity": "qs",
-            "Macropore seepage velocity": "qf",
-            "Solute mass transfer rate b/w meso-micropore": "omegaim",
-            "Solute mass transfer rate b/w meso-macropore": "omegasf",
-            "Dispersivity": "alpha"
-        }
+        variable_name = list(PE_ALIASES.keys())
+        variable_alias = PE_ALIASES
 
         ve = GUIVariableSetter(variable_name)
         variable_state = ve.run()
@@ -682,147 +1248,152 @@ class GUIBase(object):
         	print(">>> PE Mode was cancelled")
         	return None
 
-        with open("in_1.tpl", "w") as f:
-            f.write("ptf #\n")
-            for key in variable_alias:
-                if variable_state[key] == "determined":
-                    f.write("{}\n".format(self._VariableDict[key]))
-                else:
-                    f.write("# {} #\n".format(variable_alias[key]))
-            f.write("{}\n".format(len(self._base_value)))
-            f_values = map(lambda x: str(x[1]), self._base_value)
-            f.write("\n".join(f_values))
-
-        process = subprocess.Popen("tempchek.exe in_1.tpl", shell=True, stdout=subprocess.PIPE)
-        process_out = "{}".format(process.stdout.read().decode("utf-8"))
-        print(">>> [INFO] Running tempchek")
-        print(process_out)
-
-        if "No errors encountered" in process_out:
-            print("Executed Successfully")
-            # print(process_out)
-
-        with open("in_1.par", "w") as f:
-            f.write("single point\n")
-            for key in variable_alias:
-                if variable_state[key] != "determined":
-                    f.write("{} {} 1.0 0.0\n".format(variable_alias[key], variable_state[key]))
-        
-        process = subprocess.Popen("tempchek.exe in_1.tpl in_1.dat in_1.par", shell=True, stdout=subprocess.PIPE)
-        process_out = "{}".format(process.stdout.read().decode("utf-8"))
-        print(">>> [INFO] Running tempchek again")
-        print(process_out)
-
-        with open("output.ins", "w") as f:
-            f.write("pif #\n")
-            to_write = ["l1 (o{})19:26".format(idx) for idx in range(1, len(self._base_value)+1)]
-            f.write("\n".join(to_write))
-
-        process = subprocess.Popen("inschek.exe output.ins output.dat", shell=True, stdout=subprocess.PIPE)
-        process_out = "{}".format(process.stdout.read().decode("utf-8"))
-        print(">>> [INFO] Running inschek")
-        print(process_out)
-
-        with open("measure.obf", "w") as f:
-            to_write = map(lambda x: "o{} {}".format(x[0], x[1]), self._base_value)
-            f.write("\n".join(to_write))
-
-        process = subprocess.Popen("pestgen.exe test in_1.par measure.obf", shell=True, stdout=subprocess.PIPE)
-        process_out = "{}".format(process.stdout.read().decode("utf-8"))
-        print(">>> [INFO] Running pestgen")
-        print(process_out)
-        
+        workspace = self._workspaces.create("pe")
+        self._workspaces.stage_inputs(workspace, self._first_input_path, self._second_input_path, self._third_input_path, exe_file_path=self._exe_file_path)
+        if os.path.exists("./output.dat"):
+            workspace.stage("./output.dat")
+        print(">>> [INFO] PE session directory: {}".format(workspace.path))
+
+        observations = self._observations.concentrations.tolist()
+        context = {
+            "aliases": list(variable_alias.items()),
+            "variable_state": variable_state,
+            "values": {key: self._VariableDict[key] for key in variable_alias},
+            "observations": observations,
+            "n_observations": len(observations),
+            "timeout": self._model_timeout(),
+            "on_pest_line": self._on_pest_line,
+            "engine": self.window["-PE-ENGINE-"].get(),
+            "model_engine": self._model_engine().name,
+            "starts": int(self.window["-PE-STARTS-"].get() or 1),
+            "variable_dictionary": dict(self._VariableDict),
+            "workers": os.cpu_count(),
+            "on_iteration": self._on_estimator_iteration,
+            "cancel_event": self._cancel_event,
+        }
+        self._pest_parser = PestProgressParser()
+        pipeline = EstimationPipeline(self._supervisor, APP_DIR, cache_dir="./.tmp/pe_cache", utility_timeout=UTILITY_TIMEOUT, log=self._log)
+        self._pe_session = (pipeline, context, workspace)
+        self._start_pe_phase(PREPARE_STAGES, "-PE-BOUNDS-")
 
-        test_pst = ""
+    # Called from the supervisor thread with every line PEST prints.
+    def _on_pest_line(self, line):
 
-        with open("test.pst", "r") as f:
-            test_pst = f.readlines()
+        self._log_buffer.append(line)
+        if self._pest_parser.feed(line):
+            self._post_event("-PE-PROGRESS-")
 
-        test_pst_store = defaultdict(list)
-        curr = None
+    # Called from the estimator thread after every Levenberg-Marquardt iteration.
+    def _on_estimator_iteration(self, record):
 
-        for line in test_pst:
-            if "*" in line:
-                curr = line.replace("\n", "")
-            elif curr:
-                test_pst_store[curr].append(line.replace("\n", ""))
+        self._pest_parser.records.append(record)
+        self._post_event("-PE-PROGRESS-")
+
+    # Handles "-LOG-LINES-": prints the buffered output lines.
+    def flush_log(self):
+
+        lines = self._log_buffer.drain()
+        if lines:
+            print("\n".join(lines))
+
+    # Handles "-PE-PROGRESS-": redraws the convergence plot with the latest PEST iteration.
+    def on_pe_progress(self):
+
+        if self._pest_parser is None or not self._pest_parser.records:
+            return
+        self._plot_convergence(self._pest_parser.records)
+
+    # Runs a list of pipeline stages of the current PE session on a background thread.
+    def _start_pe_phase(self, stages, done_event):
+        from gui_pipeline import PipelineCancelled
+
+        pipeline, context, workspace = self._pe_session
+        self._cancel_event.clear()
+
+        def pe_process(obj):
+            obj.processing = True
+            try:
+                pipeline.run(stages, context, workspace, cancel_event=obj._cancel_event)
+            except PipelineCancelled:
+                obj._log(">>> PE Mode was cancelled")
+                obj._post_event("-PE-FAILED-", None)
+            except Exception as e:
+                obj._log(" >>> [ERROR] Parameter estimation failed: {}".format(e))
+                obj._post_event("-PE-FAILED-", str(e))
+            else:
+                obj._post_event(done_event, None)
+            finally:
+                obj.processing = False
+
+        self.processing = True
+        pe_thread = threading.Thread(target=pe_process, args=(self,), daemon=True)
+        pe_thread.start()
+        self.update_busy_state()
+
+    # Handles "-PE-BOUNDS-": asks for the parameter bounds, then starts the estimation stages.
+    def on_pe_bounds(self):
+        from gui_pipeline import ESTIMATE_STAGES, NATIVE_STAGES, MULTISTART_STAGES
+
+        pipeline, context, workspace = self._pe_session
+        pst = ControlFile.read(workspace.file("pestgen.pst"))
 
         variable_name = {}
 
-        for ln in test_pst_store["* parameter data"]:
-            line = ln.split()
-            variable_name[line[0]] = {"lower": line[4], "upper": line[5]}
+        for name, parameter in pst.parameters.items():
+            variable_name[name] = {"lower": format_number(parameter["lower"]), "upper": format_number(parameter["upper"])}
 
         bound_gui = GUILimitSetter(variable_name)
         variable_state = bound_gui.run()
 
         if variable_state is None:
         	print(">>> PE Mode was cancelled")
+        	self._workspaces.release(workspace)
+        	self._pe_session = None
         	return None
 
+        context["bounds"] = variable_state
+        if context["starts"] > 1:
+            if any(abs(float(x[side])) >= 1e9 for x in variable_state.values() for side in ("lower", "upper")):
+                sg.popup_error("Multi-start needs finite bounds for every parameter")
+                self._workspaces.release(workspace)
+                self._pe_session = None
+                return None
+            self._start_pe_phase(MULTISTART_STAGES, "-PE-DONE-")
+        else:
+            self._start_pe_phase(NATIVE_STAGES if context["engine"] == "Native LM" else ESTIMATE_STAGES, "-PE-DONE-")
 
-        for idx, ln in enumerate(test_pst_store["* parameter data"]):
-            line = ln.split()
-            test_pst_store["* parameter data"][idx] = "  ".join([line[0], line[1], line[2], line[3], variable_state[line[0]]["lower"], variable_state[line[0]]["upper"]] + line[6:])
-
-       
-        test_pst_store["* model command line"][0] = "test"
-        test_pst_store["* model input/output"][0] = "in_1.tpl  in_1.dat"
-        test_pst_store["* model input/output"][1] = "output.ins  output.dat"
-
-        with open("test.pst", "w") as f:
-            f.write("pcf\n")
-            for key in test_pst_store:
-                f.write("{}\n".format(key))
-                if test_pst_store[key]:
-                    f.write("\n".join(test_pst_store[key]))
-                    f.write("\n")
-
-        process = subprocess.Popen("pestchek.exe test", shell=True, stdout=subprocess.PIPE)
-        process_out = "{}".format(process.stdout.read().decode("utf-8"))
-        print(">>> [INFO] Running pestchek")
-        print(process_out)
-        
-        def pest_process(obj):
-            obj.processing = True
-            process = subprocess.Popen("pest.exe test", shell=True, stdout=subprocess.PIPE)
-            process_out = "{}".format(process.stdout.read().decode("utf-8"))
-            print(">>> [INFO] Running pest")
-            print(process_out)
-            # print(process_out)
-            obj.processing = False
-
-        pest_thread = threading.Thread(target=pest_process, args=(self,), daemon=True)
-        pest_thread.start()
-
-        while self.processing:
-            self.PopupAnimated(self.DEFAULT_BASE64_LOADING_GIF, background_color='green', transparent_color='green')
-            self.freeze_buttons()
-            time.sleep(0.1)
-        
-        self.PopupAnimated(None)
-        self.unfreeze_buttons()
-
-        test_rec = {}
+    # Handles "-PE-FAILED-": keeps the session directory for inspection.
+    def on_pe_failed(self):
 
-        with open("test.rec", "r") as f:
-            test_rec = f.readlines()
+        if self._pe_session:
+            pipeline, context, workspace = self._pe_session
+            self._workspaces.release(workspace, keep=True)
+            self._pe_session = None
+        sg.popup_error("Some error occurred, please check logs for more info\n")
 
-        for idx, line in enumerate(test_rec):
-            test_rec[idx] = test_rec[idx].replace("\n", "")
+    # Handles "-PE-DONE-": shows the sections of the PEST run record.
+    def on_pe_done(self):
+        from gui_pipeline import read_record_sections
+        from gui_multistart import read_estimation_result
 
-        test_rec_store = defaultdict(list)
-        curr = None
+        pipeline, context, workspace = self._pe_session
+        self._pe_session = None
+        self._workspaces.release(workspace, keep=True)
 
-        for line in test_rec:
-            if "----->" in line:
-                curr = line.replace("\n", "")
-            if curr:
-                test_rec_store[curr].append(line.replace("\n", ""))
+        if not os.path.exists(workspace.file("test.rec")):
+            sg.popup_error("Some error occurred, please check logs for more info\n")
+            return
 
+        test_rec_store = read_record_sections(workspace.file("test.rec"))
+        estimate = read_estimation_result(workspace.file("test.rec"))
+        keys = {alias: key for key, alias in context["aliases"]}
+        names = [name for name in estimate["limits"] if name in keys]
+        if names:
+            self._last_estimate = ([keys[name] for name in names], [estimate["parameters"][name] for name in names],
+                                   [estimate["limits"][name][0] for name in names], [estimate["limits"][name][1] for name in names])
 
-        def show_information(content, title):
-            layout = [[sg.Multiline(default_text=content, size=(60,20))]]
+        def show_information(content, title, size=(60,20)):
+            layout = [[sg.Multiline(default_text=content, size=size)]]
             window = sg.Window(title=title, layout=layout)
             events, values = window.read(close=True)
 
@@ -831,6 +1402,296 @@ class GUIBase(object):
         else:
             show_information("\n".join(test_rec_store["K-L information statistics ----->"]), title="K-L information statistics")
             show_information("\n".join(test_rec_store["Parameters ----->"]), title="Parameter Estimation Result")
+            if os.path.exists(workspace.file("multistart.txt")):
+                with open(workspace.file("multistart.txt"), "r") as f:
+                    show_information(f.read(), title="Multi-start Summary", size=(110,20))
+
+    # Runs the forward model for a table of parameter sets on a pool of worker processes.
+    def run_parameter_sweep(self):
+        from gui_sweep import parse_parameter_table, run_sweep, save_sweep
+
+        engine = self._model_engine()
+        if engine.identity is None:
+            sg.Popup("Path of test.exe is not defined")
+            return
+
+        setter = GUISweepSetter(self._VariableDict.keys(), os.cpu_count() or 1)
+        sweep_state = setter.run()
+        if sweep_state is None:
+            print(">>> Sweep was cancelled")
+            return None
+        text, workers, product = sweep_state
+
+        try:
+            names, table = parse_parameter_table(text, list(self._VariableDict.keys()), product=product)
+        except ValueError as e:
+            sg.popup_error(str(e))
+            return None
+
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        variables = dict(self._VariableDict)
+        exe_file_path = self._exe_file_path
+
+        self._cancel_event.clear()
+
+        def sweep_process(obj):
+            obj.processing = True
+            try:
+                results = run_sweep(names, table, variables, input_paths, exe_file_path, workers=workers,
+                                    log=obj._log, cancel_event=obj._cancel_event, engine=engine.name)
+                if not os.path.exists("./.tmp/sweeps"):
+                    os.makedirs("./.tmp/sweeps")
+                path = "./.tmp/sweeps/sweep-{}.npz".format(time.strftime("%Y%m%d-%H%M%S"))
+                save_sweep(path, names, table, results)
+                obj._log(">>> [INFO] Sweep results saved to {}".format(path))
+            except Exception as e:
+                obj._log(" >>> [ERROR] Sweep failed: {}".format(e))
+            finally:
+                obj.processing = False
+                obj._post_event("-SWEEP-DONE-")
+
+        self.processing = True
+        sweep_thread = threading.Thread(target=sweep_process, args=(self,), daemon=True)
+        sweep_thread.start()
+        self.update_busy_state()
+
+    # Runs a Morris or Sobol study over user given ranges, resuming finished batches from disk.
+    def run_sensitivity_analysis(self):
+        from gui_sensitivity import SensitivityStudy, parse_ranges
+
+        engine = self._model_engine()
+        if engine.identity is None:
+            sg.Popup("Path of test.exe is not defined")
+            return
+
+        setter = GUISensitivitySetter(self._VariableDict.keys(), os.cpu_count() or 1)
+        state = setter.run()
+        if state is None:
+            print(">>> Sensitivity analysis was cancelled")
+            return None
+        text, method, size, workers = state
+
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        variables = dict(self._VariableDict)
+        fingerprint = self._result_cache.key(engine.identity, input_paths)
+        try:
+            names, lower, upper = parse_ranges(text, list(self._VariableDict.keys()))
+            study = SensitivityStudy(method, names, lower, upper, size, fingerprint=fingerprint)
+        except ValueError as e:
+            sg.popup_error(str(e))
+            return None
+
+        self._cancel_event.clear()
+
+        def sensitivity_process(obj):
+            obj.processing = True
+            indices = None
+            try:
+                if study.run(variables, input_paths, obj._exe_file_path, workers=workers, engine=engine.name,
+                             log=obj._log, cancel_event=obj._cancel_event):
+                    indices = study.indices()
+            except Exception as e:
+                obj._log(" >>> [ERROR] Sensitivity analysis failed: {}".format(e))
+            finally:
+                obj.processing = False
+                obj._post_event("-SENSITIVITY-DONE-", indices)
+
+        self.processing = True
+        sensitivity_thread = threading.Thread(target=sensitivity_process, args=(self,), daemon=True)
+        sensitivity_thread.start()
+        self.update_busy_state()
+
+    # Handles "-SENSITIVITY-DONE-": logs the ranking and draws it on the Sensitivity tab.
+    def on_sensitivity_done(self, indices):
+
+        if indices is None:
+            return
+        order = np.argsort(indices["score"])[::-1]
+        print(">>> [INFO] {} ranking ({} runs used):".format(indices["method"], indices["used"]))
+        for rank, idx in enumerate(order, start=1):
+            print("    {:>2}. {:<60} {:.4G}".format(rank, indices["names"][idx], indices["score"][idx]))
+        self._plot_sensitivity(indices)
+
+    # Forward-runs every mode of `gui_io.mode_definitions` concurrently and scores them against the observations.
+    def compare_all_modes(self):
+        from gui_compare import mode_variables, compare_modes
+
+        if self._first_input_path is None or self._second_input_path is None or self._third_input_path is None:
+            sg.Popup("Paths of the input files are not defined")
+            return
+
+        modes = mode_variables(self._VariableDict)
+        selected = self.window["-ENGINE-"].get() or AUTO
+        engines = {mode: create_engine(selected, self._exe_file_path, mode=mode, variables=variables).name
+                   for mode, (variables, _) in modes.items()}
+        if self._exe_file_path is None and "Executable" in engines.values():
+            sg.Popup("Path of test.exe is not defined")
+            return
+
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        observed = self._observations.concentrations
+        exe_file_path = self._exe_file_path
+
+        self._cancel_event.clear()
+
+        def compare_process(obj):
+            obj.processing = True
+            result = None
+            try:
+                result = compare_modes(modes, engines, input_paths, exe_file_path, observed, log=obj._log,
+                                       cancel_event=obj._cancel_event)
+            except Exception as e:
+                obj._log(" >>> [ERROR] Mode comparison failed: {}".format(e))
+            finally:
+                obj.processing = False
+                obj._post_event("-COMPARE-DONE-", result)
+
+        self.processing = True
+        compare_thread = threading.Thread(target=compare_process, args=(self,), daemon=True)
+        compare_thread.start()
+        self.update_busy_state()
+
+    # Handles "-COMPARE-DONE-": prints the ranked table and overlays all modes on the Simulated Plot tab.
+    def on_compare_done(self, result):
+        from gui_compare import format_comparison
+
+        if result is None:
+            return
+        print(">>> [INFO] Mode comparison (ranked by AIC):")
+        print(format_comparison(result))
+        time = parse_timestamps(self._second_input_path)
+        observed = self._observations.concentrations
+        n = min(len(time), len(observed))
+        self._plot_mode_comparison(time[:n], observed[:n], result)
+
+    # Propagates parameter uncertainty to the breakthrough curve with a Monte Carlo ensemble of forward runs.
+    def run_uncertainty_ensemble(self):
+        from gui_sensitivity import parse_ranges
+        from gui_ensemble import run_ensemble, sample_normal, sample_uniform
+
+        engine = self._model_engine()
+        if engine.identity is None:
+            sg.Popup("Path of test.exe is not defined")
+            return
+
+        setter = GUIEnsembleSetter(self._VariableDict.keys(), os.cpu_count() or 1, self._last_estimate)
+        state = setter.run()
+        if state is None:
+            print(">>> Uncertainty ensemble was cancelled")
+            return None
+        source, text, size, workers = state
+
+        try:
+            if source == "estimate":
+                names, values, lower, upper = self._last_estimate
+                samples = sample_normal(values, lower, upper, size)
+            else:
+                names, lower, upper = parse_ranges(text, list(self._VariableDict.keys()))
+                samples = sample_uniform(lower, upper, size)
+        except ValueError as e:
+            sg.popup_error(str(e))
+            return None
+
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        variables = dict(self._VariableDict)
+        exe_file_path = self._exe_file_path
+
+        self._cancel_event.clear()
+
+        def ensemble_process(obj):
+            obj.processing = True
+            bands = None
+            try:
+                bands = run_ensemble(names, samples, size, variables, input_paths, exe_file_path, workers=workers,
+                                     engine=engine.name, log=obj._log, cancel_event=obj._cancel_event)
+            except Exception as e:
+                obj._log(" >>> [ERROR] Uncertainty ensemble failed: {}".format(e))
+            finally:
+                obj.processing = False
+                obj._post_event("-ENSEMBLE-DONE-", bands)
+
+        self.processing = True
+        ensemble_thread = threading.Thread(target=ensemble_process, args=(self,), daemon=True)
+        ensemble_thread.start()
+        self.update_busy_state()
+
+    # Handles "-ENSEMBLE-DONE-": keeps the percentile bands and redraws the Simulated Plot tab with them.
+    def on_ensemble_done(self, bands):
+
+        if bands is None or bands["quantiles"] is None:
+            return
+        print(">>> [INFO] Uncertainty ensemble: {} members, {} failed".format(bands["count"], bands["failed"]))
+        self._ensemble_bands = bands
+        self._draw_plots()
+
+    # Reruns the current parameters on a ladder of grids to find the coarsest one within a tolerance.
+    def run_grid_study(self):
+        from gui_convergence import run_grid_convergence, grid_engine
+
+        try:
+            engine = grid_engine(self.window["-ENGINE-"].get() or AUTO, self._exe_file_path)
+        except ValueError as e:
+            sg.Popup(str(e))
+            return
+        if engine.identity is None:
+            sg.Popup("Path of test.exe is not defined")
+            return
+
+        setter = GUIConvergenceSetter(os.cpu_count() or 1)
+        state = setter.run()
+        if state is None:
+            print(">>> Grid study was cancelled")
+            return None
+        tolerance, coarser, finer, refine, workers = state
+
+        input_paths = [self._first_input_path, self._second_input_path, self._third_input_path]
+        variables = dict(self._VariableDict)
+        exe_file_path = self._exe_file_path
+
+        self._cancel_event.clear()
+
+        def grid_process(obj):
+            obj.processing = True
+            result = None
+            try:
+                result = run_grid_convergence(variables, input_paths, exe_file_path, tolerance=tolerance, coarser=coarser,
+                                              finer=finer, refine=refine, workers=workers, engine=engine.name, log=obj._log,
+                                              cancel_event=obj._cancel_event)
+            except RunCancelled:
+                obj._log(">>> [INFO] Grid study cancelled")
+            except Exception as e:
+                obj._log(" >>> [ERROR] Grid study failed: {}".format(e))
+            finally:
+                obj.processing = False
+                obj._post_event("-GRID-DONE-", result)
+
+        self.processing = True
+        grid_thread = threading.Thread(target=grid_process, args=(self,), daemon=True)
+        grid_thread.start()
+        self.update_busy_state()
+
+    # Handles "-GRID-DONE-": prints the levels, plots them and offers to apply the recommended grid.
+    def on_grid_done(self, result):
+        from gui_convergence import format_convergence
+
+        if result is None:
+            return
+        print(">>> [INFO] Grid convergence (observed order {}):".format("-" if result["order"] is None else "{:.2f}".format(result["order"])))
+        print(format_convergence(result))
+        time = parse_timestamps(self._second_input_path)
+        self._plot_grid_convergence(time, result)
+
+        if result["recommended"] is None:
+            return
+        grid = result["grids"][result["recommended"]]
+        if all(str(self._VariableDict[name]) == str(value) for name, value in grid.items()):
+            return
+        text = ", ".join("{} = {:G}".format(name, value) for name, value in grid.items())
+        if sg.popup_yes_no("Apply the recommended grid?\n{}".format(text), title="Grid Study") == "Yes":
+            for name, value in grid.items():
+                self._VariableDict[name] = str(value)
+            self._write_updated_values(self._first_input_path, self._second_input_path, self._third_input_path, self._VariableDict)
+            print(">>> [INFO] Grid set to {}".format(text))
 
     @GUI_exception
     def _initialize_variables(self):
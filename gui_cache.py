@@ -0,0 +1,158 @@
+"""
+@name
+    `gui_cache.py`
+
+@description
+    `src file for the content-addressed forward-model result cache`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from gui_tracker import file_signature, hash_file
+
+
+DEFAULT_CACHE_DIR = "./.tmp/results"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _normalize_token(token: str) -> str:
+    try:
+        return repr(float(token))
+    except ValueError:
+        return token
+
+
+def normalized_content(path: str) -> bytes:
+    r'''
+    Function to return the content of an input file with
+    whitespace collapsed, blank lines dropped and numbers
+    rewritten in a canonical form, so that e.g. `2.64E-01`
+    and `0.264` produce the same cache key.
+    '''
+    lines = []
+    with open(path, "r") as f:
+        for line in f:
+            tokens = line.split()
+            if tokens:
+                lines.append(" ".join(_normalize_token(token) for token in tokens))
+    return "\n".join(lines).encode("utf-8")
+
+
+class ResultCache(object):
+    r'''
+    Class to store model outputs keyed by the executable
+    and the normalized input files, with size-bounded
+    least-recently-used eviction.
+
+    Usage:
+        >>> cache = ResultCache("./.tmp/results")
+        >>> key = cache.key("./test.exe", ["./in_1.dat", "./in_2.dat", "./in_3.dat"])
+        >>> if not cache.restore(key, "./output.dat"):
+                ... run the model ...
+                cache.store(key, "./output.dat")
+    '''
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._exe_digests = {}
+        self._index_path = os.path.join(cache_dir, "index.json")
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose payload was removed behind our back.
+        return {key: entry for key, entry in index.items() if os.path.exists(self._entry_path(key))}
+
+    def _save_index(self) -> None:
+        temp_path = self._index_path + ".part"
+        with open(temp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self._index_path)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "{}.dat".format(key))
+
+    def _exe_digest(self, exe_file_path: str) -> str:
+        signature = file_signature(exe_file_path)
+        entry = self._exe_digests.get(exe_file_path)
+        if entry is None or entry[0] != signature:
+            entry = (signature, hash_file(exe_file_path))
+            self._exe_digests[exe_file_path] = entry
+        return entry[1]
+
+    def key(self, exe_file_path, input_paths: list) -> str:
+        r'''
+        Function to compute the cache key of a model run.
+        `exe_file_path` is the executable, or a tuple of the
+        source files of an in-process engine.
+        '''
+        digest = hashlib.sha256()
+        for path in (exe_file_path,) if isinstance(exe_file_path, str) else exe_file_path:
+            digest.update(self._exe_digest(path).encode("ascii"))
+        for path in input_paths:
+            content = normalized_content(path)
+            digest.update(str(len(content)).encode("ascii"))
+            digest.update(content)
+        return digest.hexdigest()
+
+    def restore(self, key: str, output_file_path: str) -> bool:
+        r'''
+        Function to copy a cached output to `output_file_path`.
+        Returns False on a cache miss.
+        '''
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                print(">>> [INFO] Result cache miss (hits: {}, misses: {})".format(self.hits, self.misses))
+                return False
+            shutil.copyfile(self._entry_path(key), output_file_path)
+            self._index[key]["used"] = time.time()
+            self._save_index()
+            self.hits += 1
+            print(">>> [INFO] Result cache hit, model run skipped (hits: {}, misses: {})".format(self.hits, self.misses))
+            return True
+
+    def store(self, key: str, output_file_path: str) -> None:
+        r'''
+        Function to add a model output to the cache and
+        evict least recently used entries above `max_bytes`.
+        '''
+        with self._lock:
+            entry_path = self._entry_path(key)
+            shutil.copyfile(output_file_path, entry_path + ".part")
+            os.replace(entry_path + ".part", entry_path)
+            self._index[key] = {"size": os.path.getsize(entry_path), "used": time.time()}
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(entry["size"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
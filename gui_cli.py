@@ -0,0 +1,102 @@
+"""
+@name
+    `gui_cli.py`
+
+@description
+    `src file for the headless command line: python -m gui_cli {run,estimate} ...`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+r'''
+Command line entry point for batch scripts and
+compute nodes, uses the Project class from gui_api.py
+and never imports a GUI toolkit.
+
+Examples:
+    python -m gui_cli run --dir ./case --mode ADE --set Dispersivity=0.01 --output out.dat --figure btc.png
+    python -m gui_cli estimate --dir ./case --estimate qf=0.3 --estimate alpha=0.01 --bounds alpha=1e-4:1 --method "Native LM"
+'''
+
+import sys
+import argparse
+from gui_api import Project, ProjectError
+from gui_engine import AUTO, ENGINES
+
+
+def _pairs(values: list, separator: str = "=") -> list:
+    pairs = []
+    for value in values or []:
+        if separator not in value:
+            raise ValueError("Expected NAME{}VALUE, got '{}'".format(separator, value))
+        name, value = value.rsplit(separator, 1)
+        pairs.append((name, value))
+    return pairs
+
+
+def _bounds(values: list) -> dict:
+    bounds = {}
+    for name, value in _pairs(values):
+        lower, upper = value.split(":")
+        bounds[name] = (float(lower), float(upper))
+    return bounds
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m gui_cli", description="Run the model without the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--dir", default=".", help="directory with in_1.dat, in_2.dat and in_3.dat (default: .)")
+    common.add_argument("--exe", default=None, help="model executable (default: test.exe in --dir)")
+    common.add_argument("--mode", default="TPNE", help="ADE, MIM, MPNE, DADE or TPNE (default: TPNE)")
+    common.add_argument("--set", action="append", metavar="NAME=VALUE", help="set a variable, by name or PEST alias")
+    common.add_argument("--engine", default=AUTO, choices=[AUTO] + list(ENGINES.keys()), help="forward-model engine")
+    common.add_argument("--output", default=None, help="copy output.dat of the final forward run here")
+    common.add_argument("--figure", default=None, help="save the breakthrough curve of the final forward run here")
+    common.add_argument("--save", action="store_true", help="write the final variables back to the input files")
+
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    commands.add_parser("run", parents=[common], help="forward run")
+    estimate = commands.add_parser("estimate", parents=[common], help="parameter estimation, then a forward run at the estimate")
+    estimate.add_argument("--estimate", action="append", metavar="NAME=GUESS", required=True, help="variable to estimate and its initial guess")
+    estimate.add_argument("--bounds", action="append", metavar="NAME=LOWER:UPPER", help="bounds of an estimated variable")
+    estimate.add_argument("--method", default="PEST", choices=["PEST", "Native LM"], help="estimator (default: PEST)")
+    estimate.add_argument("--starts", type=int, default=1, help="multi-start points (default: 1)")
+    estimate.add_argument("--workers", type=int, default=None, help="worker processes (default: number of cores)")
+    estimate.add_argument("--timeout", type=float, default=None, help="timeout of pest.exe in seconds")
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        project = Project.from_directory(args.dir, exe_file_path=args.exe)
+        project.apply_mode(args.mode)
+        for name, value in _pairs(args.set):
+            project.set(name, value)
+
+        if args.command == "estimate":
+            result = project.estimate(dict(_pairs(args.estimate)), bounds=_bounds(args.bounds), method=args.method, engine=args.engine,
+                                      starts=args.starts, workers=args.workers, timeout=args.timeout)
+            print(">>> [INFO] Phi = {:.6G}, record: {}".format(result["phi"], result["record"]))
+            for name, value in result["variables"].items():
+                print("    {:<50} {:.6G}".format(name, value))
+                project.set(name, value)
+
+        time, observed, simulated = project.run(engine=args.engine, output_path=args.output)
+        if args.figure:
+            project.save_figure(args.figure, time, observed, simulated)
+        if args.save:
+            project.save()
+    except (ProjectError, ValueError, OSError, RuntimeError) as e:
+        print(" >>> [ERROR] {}".format(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
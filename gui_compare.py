@@ -0,0 +1,120 @@
+"""
+@name
+    `gui_compare.py`
+
+@description
+    `src file for comparing the model modes against the observations`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+from gui_io import mode_definitions, apply_mode
+from gui_sweep import iter_runs
+
+
+# Grid, geometry and run settings: shared by every mode, not fitted parameters.
+STRUCTURAL = ("nz", "nm", "Length", "Bulk density of porous media", "Run time", "Pulse time", "delta_t", "delta_x",
+              "No. of observation time steps")
+
+
+def mode_variables(variable_dictionary: dict) -> OrderedDict:
+    r'''
+    Function to build the variable dictionary of every mode
+    of <gui_io.mode_definitions> (plus TPNE, the full model)
+    through <gui_io.apply_mode>: the current values with the
+    values the mode pins.
+
+    Returns an OrderedDict mode -> (variables, n_parameters),
+    n_parameters being the number of free model parameters.
+    '''
+    result = OrderedDict()
+    for mode, pinned in list(mode_definitions().items()) + [("TPNE", {})]:
+        variables = apply_mode(mode, dict(variable_dictionary))
+        free = sum(1 for name in variable_dictionary if pinned.get(name) is None and name not in STRUCTURAL)
+        result[mode] = (variables, free)
+    return result
+
+
+def model_statistics(observed: np.ndarray, simulated: np.ndarray, n_parameters: np.ndarray) -> dict:
+    r'''
+    Function to compute SSE, RMSE, AIC and BIC of every row of
+    the (n_modes, n_times) `simulated` array in one pass.
+    AIC and BIC assume Gaussian errors of unknown variance.
+    '''
+    observed = np.asarray(observed, dtype=np.float64)
+    n = observed.shape[-1]
+    k = np.asarray(n_parameters, dtype=np.float64)
+    residuals = observed[None, :] - simulated[:, :n]
+    sse = np.sum(residuals ** 2, axis=1)
+    with np.errstate(divide="ignore"):
+        fit = n * np.log(2 * np.pi * np.maximum(sse, 1e-300) / n) + n
+    return {
+        "SSE": sse,
+        "RMSE": np.sqrt(sse / n),
+        "AIC": fit + 2 * k,
+        "BIC": fit + k * np.log(n),
+    }
+
+
+def compare_modes(modes: OrderedDict, engines: dict, input_paths: list, exe_file_path: str, observed: np.ndarray,
+                  workers: int = None, workspace_root: str = "./.tmp/runs", log=print, cancel_event=None) -> dict:
+    r'''
+    Function to forward-run every mode concurrently, each in
+    its own workspace with the engine named in `engines`, and
+    score the curves against `observed`. Setting `cancel_event`
+    stops the runs; modes not finished by then stay NaN.
+
+    Returns a dict with the modes, the (n_modes, n_times)
+    simulated array (NaN rows for failed modes) and the
+    statistics of <model_statistics>.
+    '''
+    names = list(modes.keys())
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    input_paths = [os.path.abspath(path) for path in input_paths]
+    exe_file_path = os.path.abspath(exe_file_path) if exe_file_path else None
+    workspace_root = os.path.abspath(workspace_root)
+    n = len(observed)
+
+    start = time.time()
+    simulated = np.full((len(names), n), np.nan)
+    tasks = [(idx, [], [], modes[mode][0], input_paths, exe_file_path, workspace_root, engines[mode]) for idx, mode in enumerate(names)]
+    for index, curve, error, duration in iter_runs(tasks, workers, cancel_event):
+        if error:
+            log(" >>> [ERROR] Mode {} failed: {}".format(names[index], error))
+            continue
+        length = min(len(curve), n)
+        simulated[index, :length] = curve[:length]
+        log(">>> [INFO] Mode {} done in {:.2f}s ({})".format(names[index], duration, engines[names[index]]))
+    if cancel_event is not None and cancel_event.is_set():
+        log(">>> [INFO] Mode comparison cancelled")
+
+    statistics = model_statistics(observed, simulated, [modes[mode][1] for mode in names])
+    log(">>> [INFO] Mode comparison finished in {:.2f}s".format(time.time() - start))
+    return {"modes": names, "simulated": simulated, "statistics": statistics, "parameters": [modes[mode][1] for mode in names]}
+
+
+def format_comparison(result: dict) -> str:
+    r'''
+    Function to return the comparison as a table
+    ranked by AIC, failed modes last.
+    '''
+    statistics = result["statistics"]
+    order = np.argsort(np.where(np.isnan(statistics["AIC"]), np.inf, statistics["AIC"]))
+    lines = [" {:<6}{:<4}{:<14}{:<14}{:<14}{:<14}".format("Mode", "k", "SSE", "RMSE", "AIC", "BIC")]
+    for idx in order:
+        lines.append(" {:<6}{:<4}{:<14.6G}{:<14.6G}{:<14.6G}{:<14.6G}".format(
+            result["modes"][idx], result["parameters"][idx], statistics["SSE"][idx], statistics["RMSE"][idx],
+            statistics["AIC"][idx], statistics["BIC"][idx]))
+    return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""
+@name
+    `gui_convergence.py`
+
+@description
+    `src file for grid-convergence studies over nz, delta_x and delta_t`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import time
+import numpy as np
+from gui_sweep import iter_runs
+from gui_engine import ENGINES, AUTO, ExecutableEngine, NumericalEngine, RunCancelled, create_engine
+
+
+GRID_VARIABLES = ("nz", "delta_x", "delta_t")
+RATIO = 2
+
+
+def grid_engine(name: str, exe_file_path: str = None):
+    r'''
+    Function to create the engine of a grid study from the
+    engine selection `name`. `AUTO` never resolves to a
+    closed-form engine here: it runs test.exe, or the NumPy
+    FD solver when no executable is set.
+    '''
+    if name == AUTO:
+        name = ExecutableEngine.name if exe_file_path else NumericalEngine.name
+    engine = create_engine(name, exe_file_path)
+    if not engine.gridded:
+        raise ValueError("The {} engine has no grid, select the Executable or {} engine".format(name, NumericalEngine.name))
+    return engine
+
+
+def grid_ladder(variable_dictionary: dict, coarser: int = 2, finer: int = 2, refine: tuple = GRID_VARIABLES) -> list:
+    r'''
+    Function to build the ladder of grids around the current
+    one: `coarser` halvings and `finer` doublings of the
+    resolution of every variable of `refine` (nz multiplied,
+    delta_x and delta_t divided by the refinement factor).
+
+    Returns a list of (factor, {name: value}) from coarsest to finest.
+    '''
+    ladder = []
+    for level in range(-coarser, finer + 1):
+        factor = float(RATIO) ** level
+        grid = {}
+        for name in refine:
+            value = float(variable_dictionary[name])
+            if name == "nz":
+                grid[name] = max(1, int(round(value * factor)))
+            else:
+                grid[name] = value / factor
+        ladder.append((factor, grid))
+    return ladder
+
+
+def discretization_errors(curves: np.ndarray) -> tuple:
+    r'''
+    Function to estimate the discretization error of every
+    level of the (n_levels, n_times) `curves`, ordered from
+    coarsest to finest with a constant refinement ratio.
+    The observed order of convergence comes from the last
+    three levels (Richardson); the error of the finest level
+    is extrapolated from it and every coarser level adds its
+    distance to the finest curve. Errors are RMS differences
+    relative to the highest concentration of all levels.
+
+    Returns the error array and the observed order, None
+    when every level gives the same curve: it does not
+    depend on the grid and no level can be recommended.
+    '''
+    finest = curves[-1]
+    scale = np.max(np.abs(curves)) or 1.0
+    distance = lambda a, b: np.sqrt(np.mean((a - b) ** 2)) / scale
+    steps = [distance(curves[idx], curves[idx + 1]) for idx in range(len(curves) - 1)]
+    if not any(steps):
+        return np.zeros(len(curves)), None
+
+    order = 1.0
+    if len(steps) >= 2 and steps[-1] > 0 and steps[-2] > 0:
+        order = float(np.clip(np.log(steps[-2] / steps[-1]) / np.log(RATIO), 0.5, 4.0))
+    finest_error = steps[-1] / (RATIO ** order - 1) if steps else 0.0
+    errors = np.array([distance(curve, finest) for curve in curves]) + finest_error
+    return errors, order
+
+
+def run_grid_convergence(variable_dictionary: dict, input_paths: list, exe_file_path: str, tolerance: float = 0.01,
+                         coarser: int = 2, finer: int = 2, refine: tuple = GRID_VARIABLES, workers: int = None,
+                         engine: str = "Executable", workspace_root: str = "./.tmp/runs", log=print, cancel_event=None) -> dict:
+    r'''
+    Function to rerun the current parameter set at every grid
+    of <grid_ladder> concurrently, estimate the discretization
+    error of each level and recommend the coarsest grid whose
+    error is within `tolerance` (fraction of the highest
+    concentration). Setting `cancel_event` stops the runs
+    and raises <gui_engine.RunCancelled>.
+
+    Returns a dict with the factors, grids, curves, run times,
+    errors, the observed order and the recommended level index
+    (None when the curves do not depend on the grid).
+    '''
+    if not ENGINES[engine].gridded:
+        raise ValueError("The {} engine has no grid".format(engine))
+    ladder = grid_ladder(variable_dictionary, coarser, finer, refine)
+    names = list(refine)
+    workers = workers or min(len(ladder), os.cpu_count() or 1)
+    input_paths = [os.path.abspath(path) for path in input_paths]
+    exe_file_path = os.path.abspath(exe_file_path) if exe_file_path else None
+    workspace_root = os.path.abspath(workspace_root)
+
+    start = time.time()
+    log(">>> [INFO] Grid convergence over {} on {} levels ({})".format(", ".join(names), len(ladder), engine))
+    curves, durations = [None] * len(ladder), np.full(len(ladder), np.nan)
+    tasks = [(idx, names, [grid[name] for name in names], variable_dictionary, input_paths, exe_file_path, workspace_root, engine)
+             for idx, (factor, grid) in enumerate(ladder)]
+    for index, curve, error, duration in iter_runs(tasks, workers, cancel_event):
+        if error:
+            log(" >>> [ERROR] Grid x{:g} failed: {}".format(ladder[index][0], error))
+            continue
+        curves[index], durations[index] = curve, duration
+        log(">>> [INFO] Grid x{:g} done in {:.2f}s".format(ladder[index][0], duration))
+    if cancel_event is not None and cancel_event.is_set():
+        raise RunCancelled("Grid convergence cancelled")
+
+    finished = [idx for idx, curve in enumerate(curves) if curve is not None]
+    if len(finished) < 2:
+        raise ValueError("Grid convergence needs at least two finished levels")
+    length = min(len(curves[idx]) for idx in finished)
+    errors, order = discretization_errors(np.array([curves[idx][:length] for idx in finished]))
+    level_errors = np.full(len(ladder), np.nan)
+    level_errors[finished] = errors
+
+    if order is None:
+        log(">>> [INFO] Grid convergence finished in {:.2f}s, every level gives the same curve".format(time.time() - start))
+        within, recommended = [], None
+    else:
+        within = [idx for idx in finished if level_errors[idx] <= tolerance]
+        recommended = within[0] if within else finished[-1]
+        log(">>> [INFO] Grid convergence finished in {:.2f}s, observed order {:.2f}".format(time.time() - start, order))
+    return {"factors": [factor for factor, grid in ladder], "grids": [grid for factor, grid in ladder], "curves": curves,
+            "durations": durations, "errors": level_errors, "order": order, "tolerance": tolerance,
+            "recommended": recommended, "converged": bool(within)}
+
+
+def format_convergence(result: dict) -> str:
+    r'''
+    Function to return the levels of a grid-convergence
+    study as a table, marking the recommended grid.
+    '''
+    names = list(result["grids"][0].keys())
+    lines = [" {:<8}".format("Level") + "".join("{:<14}".format(name) for name in names) + "{:<12}{:<10}".format("Error [%]", "Time [s]")]
+    for idx, (factor, grid) in enumerate(zip(result["factors"], result["grids"])):
+        mark = " <-" if idx == result["recommended"] else ""
+        lines.append(" {:<8}".format("x{:g}".format(factor)) + "".join("{:<14.6G}".format(grid[name]) for name in names)
+                     + "{:<12.4G}{:<10.3G}".format(100 * result["errors"][idx], result["durations"][idx]) + mark)
+    if result["recommended"] is None:
+        lines.append(" The curve does not depend on the grid, no grid is recommended")
+    elif not result["converged"]:
+        lines.append(" No level is within the {:g}% tolerance, the finest grid is recommended".format(100 * result["tolerance"]))
+    return "\n".join(lines)
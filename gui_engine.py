@@ -0,0 +1,177 @@
+"""
+@name
+    `gui_engine.py`
+
+@description
+    `src file for the interchangeable forward-model engines`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from collections import OrderedDict
+from gui_io import read_model_inputs
+from gui_pestfile import format_value
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+gui_solver = LazyModule("gui_solver")
+gui_analytical = LazyModule("gui_analytical")
+
+# Seconds between checks of the cancel event while test.exe runs.
+CANCEL_POLL = 0.2
+
+
+class RunCancelled(RuntimeError):
+    r'''
+    Exception raised when a model run is stopped through its cancel event.
+    '''
+
+
+def write_output(path: str, observed: np.ndarray, simulated: np.ndarray) -> None:
+    r'''
+    Function to write output.dat in the layout of the
+    Fortran model: observed value in columns 1-18 and
+    simulated value in columns 19-26 of every line.
+    '''
+    n = min(len(observed), len(simulated))
+    with open(path + ".part", "w") as f:
+        for obs, sim in zip(observed[:n], simulated[:n]):
+            f.write("{:>18}{:>8}\n".format(format_value(obs, 17), format_value(sim, 7)))
+    os.replace(path + ".part", path)
+
+
+class ModelEngine(object):
+    r'''
+    Base class of a forward-model engine. `run(directory)`
+    reads the input files of `directory`, writes output.dat
+    there and returns an exit code, 0 on success. Setting
+    the optional `cancel_event` (threading or multiprocessing
+    Event) stops a run with <RunCancelled>.
+    `identity` is the file, or tuple of source files, whose
+    content versions the results,
+    `gridded` tells whether they depend on nz, delta_x and delta_t.
+    '''
+    name = None
+    in_process = True
+    gridded = True
+
+    @property
+    def identity(self) -> str:
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    def supports(self, variables: dict) -> bool:
+        return True
+
+    def simulate(self, variables: dict, observation_times: np.ndarray, cancel_event=None) -> np.ndarray:
+        raise NotImplementedError("This function needs to be implemented in child class")
+
+    def run(self, directory: str, cancel_event=None) -> int:
+        variables, observed, times = read_model_inputs(directory)
+        simulated = self.simulate(variables, times[:len(observed)], cancel_event=cancel_event)
+        write_output(os.path.join(directory, "output.dat"), observed, simulated)
+        return 0
+
+
+class ExecutableEngine(ModelEngine):
+    r'''
+    Engine running the compiled model `test.exe`.
+    '''
+    name = "Executable"
+    in_process = False
+
+    def __init__(self, exe_file_path: str = None):
+        self.exe_file_path = exe_file_path
+
+    @property
+    def identity(self) -> str:
+        return self.exe_file_path
+
+    def run(self, directory: str, cancel_event=None) -> int:
+        exe_file_path = os.path.join(directory, "test.exe")
+        if not os.path.exists(exe_file_path):
+            exe_file_path = self.exe_file_path
+        process = subprocess.Popen([os.path.abspath(exe_file_path)], cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        while True:
+            try:
+                return process.wait(timeout=None if cancel_event is None else CANCEL_POLL)
+            except subprocess.TimeoutExpired:
+                if cancel_event.is_set():
+                    process.kill()
+                    process.wait()
+                    raise RunCancelled("{} cancelled".format(self.name))
+
+
+class NumericalEngine(ModelEngine):
+    r'''
+    Engine solving the model in-process
+    with <gui_solver.TransportModel>.
+    '''
+    name = "NumPy FD"
+
+    def __init__(self, exe_file_path: str = None):
+        pass
+
+    @property
+    def identity(self) -> tuple:
+        return (gui_solver.__file__,)
+
+    def simulate(self, variables: dict, observation_times: np.ndarray, cancel_event=None) -> np.ndarray:
+        return gui_solver.TransportModel(variables).simulate(observation_times, cancel_event=cancel_event)
+
+
+class AnalyticalEngine(ModelEngine):
+    r'''
+    Engine evaluating the Ogata-Banks solution of
+    <gui_analytical.breakthrough>, ADE mode only.
+    '''
+    name = "Analytical ADE"
+    gridded = False
+
+    def __init__(self, exe_file_path: str = None):
+        pass
+
+    @property
+    def identity(self) -> tuple:
+        # Input parsing and supports() go through gui_solver.TransportModel.
+        return (gui_analytical.__file__, gui_solver.__file__)
+
+    def supports(self, variables: dict) -> bool:
+        try:
+            return gui_analytical.is_single_domain(gui_solver.TransportModel(variables))
+        except (ValueError, TypeError):
+            return False
+
+    def simulate(self, variables: dict, observation_times: np.ndarray, cancel_event=None) -> np.ndarray:
+        return gui_analytical.breakthrough(variables, observation_times)
+
+
+ENGINES = OrderedDict((engine.name, engine) for engine in (ExecutableEngine, NumericalEngine, AnalyticalEngine))
+AUTO = "Auto"
+
+
+def create_engine(name: str, exe_file_path: str = None, mode: str = None, variables: dict = None) -> ModelEngine:
+    r'''
+    Function to create the engine registered as `name`.
+    With `AUTO`, the analytical engine is used for the ADE
+    `mode` when it supports `variables`, else the executable.
+    '''
+    if name == AUTO:
+        analytical = AnalyticalEngine(exe_file_path)
+        if mode == "ADE" and variables is not None and analytical.supports(variables):
+            return analytical
+        return ExecutableEngine(exe_file_path)
+    if name not in ENGINES:
+        raise ValueError("Unknown model engine '{}'".format(name))
+    return ENGINES[name](exe_file_path)
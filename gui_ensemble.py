@@ -0,0 +1,195 @@
+"""
+@name
+    `gui_ensemble.py`
+
+@description
+    `src file for Monte Carlo ensembles of the forward model with streaming quantiles`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from gui_sweep import _sweep_worker
+
+
+class StreamingQuantiles(object):
+    r'''
+    Class to track quantiles of every time step of a stream
+    of curves with the P-square algorithm (Jain & Chlamtac,
+    1985): five markers per quantile and time step, updated
+    in one vectorized pass per curve, so memory does not grow
+    with the number of curves.
+
+    Usage:
+        >>> bands = StreamingQuantiles((0.05, 0.5, 0.95))
+        >>> for curve in curves:
+                bands.update(curve)
+        >>> lower, median, upper = bands.result()
+    '''
+
+    def __init__(self, probabilities: tuple = (0.05, 0.5, 0.95)):
+        self.probabilities = tuple(probabilities)
+        self.count = 0
+        self.mean = None
+        self._first = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = np.array([[0.0, p / 2, p, (1 + p) / 2, 1.0] for p in self.probabilities])
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        self.count += 1
+        self.mean = values.copy() if self.mean is None else self.mean + (values - self.mean) / self.count
+
+        if self._heights is None:
+            self._first.append(values)
+            if len(self._first) == 5:
+                initial = np.sort(np.stack(self._first), axis=0).T
+                q = len(self.probabilities)
+                self._heights = np.repeat(initial[None], q, axis=0)
+                self._positions = np.tile(np.arange(1.0, 6.0), (q, len(values), 1))
+                self._desired = 1 + 4 * self._increments[:, None, :] * np.ones((q, len(values), 5))
+                self._first = []
+            return
+
+        x = np.broadcast_to(values, self._heights.shape[:2])
+        heights, positions = self._heights, self._positions
+        heights[..., 0] = np.minimum(heights[..., 0], x)
+        heights[..., 4] = np.maximum(heights[..., 4], x)
+        # Cell of x: markers above it move one position up.
+        cell = np.clip((x[..., None] >= heights[..., 1:4]).sum(axis=-1), 0, 3)
+        positions += np.arange(5) > cell[..., None]
+        self._desired += self._increments[:, None, :]
+
+        for i in (1, 2, 3):
+            d = self._desired[..., i] - positions[..., i]
+            up = (d >= 1) & (positions[..., i + 1] - positions[..., i] > 1)
+            down = (d <= -1) & (positions[..., i - 1] - positions[..., i] < -1)
+            move = up | down
+            if not move.any():
+                continue
+            d = np.where(up, 1.0, -1.0)
+            q_low, q, q_high = heights[..., i - 1], heights[..., i], heights[..., i + 1]
+            n_low, n, n_high = positions[..., i - 1], positions[..., i], positions[..., i + 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                parabolic = q + d / (n_high - n_low) * ((n - n_low + d) * (q_high - q) / (n_high - n)
+                                                        + (n_high - n - d) * (q - q_low) / (n - n_low))
+                neighbour_q = np.where(up, q_high, q_low)
+                neighbour_n = np.where(up, n_high, n_low)
+                linear = q + d * (neighbour_q - q) / (neighbour_n - n)
+            inside = (q_low < parabolic) & (parabolic < q_high)
+            heights[..., i] = np.where(move, np.where(inside, parabolic, linear), q)
+            positions[..., i] = np.where(move, n + d, n)
+
+    def result(self) -> np.ndarray:
+        r'''
+        Function to return the (n_probabilities, n_times)
+        quantile estimates.
+        '''
+        if self._heights is None:
+            if not self._first:
+                return None
+            return np.quantile(np.stack(self._first), self.probabilities, axis=0)
+        return self._heights[..., 2].copy()
+
+
+def sample_uniform(lower: np.ndarray, upper: np.ndarray, size: int, seed: int = None):
+    r'''
+    Generator of `size` parameter sets drawn
+    uniformly inside [lower, upper].
+    '''
+    rng = np.random.default_rng(seed)
+    lower, upper = np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+    for _ in range(size):
+        yield lower + rng.random(len(lower)) * (upper - lower)
+
+
+def sample_normal(values: np.ndarray, lower_limits: np.ndarray, upper_limits: np.ndarray, size: int, seed: int = None):
+    r'''
+    Generator of `size` parameter sets drawn from independent
+    normals fitted to estimates and their 95% confidence
+    limits. Parameters with a positive estimate are kept
+    positive by redrawing.
+    '''
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=np.float64)
+    sigma = np.abs(np.asarray(upper_limits, dtype=np.float64) - np.asarray(lower_limits, dtype=np.float64)) / (2 * 1.959964)
+    sigma = np.where(np.isfinite(sigma), sigma, 0.0)
+    positive = values > 0
+    for _ in range(size):
+        row = values + rng.standard_normal(len(values)) * sigma
+        for _ in range(100):
+            bad = positive & (row <= 0)
+            if not bad.any():
+                break
+            row[bad] = values[bad] + rng.standard_normal(int(bad.sum())) * sigma[bad]
+        yield np.where(positive & (row <= 0), values, row)
+
+
+def run_ensemble(names: list, samples, size: int, variable_dictionary: dict, input_paths: list, exe_file_path: str,
+                 workers: int = None, engine: str = "Executable", probabilities: tuple = (0.05, 0.5, 0.95),
+                 workspace_root: str = "./.tmp/runs", log=print, cancel_event=None) -> dict:
+    r'''
+    Function to run the forward model for `size` parameter
+    sets from the `samples` generator on `workers` processes.
+    Only a bounded window of runs is in flight and every curve
+    is folded into <StreamingQuantiles> as it arrives, so
+    memory stays flat for any ensemble size.
+
+    Returns a dict with the probabilities, the quantile curves,
+    the mean curve and the number of finished and failed runs.
+    '''
+    workers = workers or os.cpu_count() or 1
+    input_paths = [os.path.abspath(path) for path in input_paths]
+    exe_file_path = os.path.abspath(exe_file_path) if exe_file_path else None
+    workspace_root = os.path.abspath(workspace_root)
+    window = workers * 4
+
+    bands = StreamingQuantiles(probabilities)
+    failed, submitted = 0, 0
+    start = time.time()
+    log(">>> [INFO] Monte Carlo ensemble of {} members on {} workers ({})".format(size, workers, engine))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        samples = iter(samples)
+        while True:
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            while not cancelled and submitted < size and len(pending) < window:
+                row = next(samples)
+                pending.add(pool.submit(_sweep_worker, (submitted, names, list(map(float, row)), variable_dictionary,
+                                                        input_paths, exe_file_path, workspace_root, engine)))
+                submitted += 1
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, simulated, error, duration = future.result()
+                if error or simulated is None or np.isnan(simulated).any():
+                    failed += 1
+                    continue
+                if bands.mean is not None and len(simulated) != len(bands.mean):
+                    failed += 1
+                    continue
+                bands.update(simulated)
+            finished = bands.count + failed
+            if finished % max(size // 20, 1) == 0 or finished == size:
+                log(">>> [INFO] Ensemble {}/{} done, {} failed, {:.2f}s elapsed".format(finished, size, failed, time.time() - start))
+            if cancelled and not pending:
+                log(">>> [INFO] Ensemble cancelled after {} members".format(finished))
+                break
+
+    return {"probabilities": bands.probabilities, "quantiles": bands.result(), "mean": bands.mean,
+            "count": bands.count, "failed": failed}
@@ -0,0 +1,263 @@
+"""
+@name
+    `gui_estimator.py`
+
+@description
+    `src file for the built-in parallel Levenberg-Marquardt parameter estimator`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import math
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from gui_sweep import _sweep_worker
+
+
+class EstimationError(RuntimeError):
+    r'''
+    Exception raised when a model run of the estimator fails.
+    '''
+
+
+class EstimationCancelled(RuntimeError):
+    r'''
+    Exception raised when the estimation is cancelled between model batches.
+    '''
+
+
+def t_quantile(probability: float, dof: int) -> float:
+    r'''
+    Function to approximate the Student t quantile with
+    Hill's expansion of the normal quantile, within 0.2 %
+    for `dof` >= 3 and 1e-5 for `dof` >= 10.
+    '''
+    # Acklam's rational approximation of the normal quantile.
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01, -1.328068155288572e+01]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00]
+    if probability < 0.02425:
+        q = math.sqrt(-2 * math.log(probability))
+        z = (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1)
+    elif probability > 1 - 0.02425:
+        q = math.sqrt(-2 * math.log(1 - probability))
+        z = -(((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1)
+    else:
+        q = probability - 0.5
+        r = q * q
+        z = (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q / (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1)
+
+    g1 = (z**3 + z) / 4
+    g2 = (5*z**5 + 16*z**3 + 3*z) / 96
+    g3 = (3*z**7 + 19*z**5 + 17*z**3 - 15*z) / 384
+    g4 = (79*z**9 + 776*z**7 + 1482*z**5 - 1920*z**3 - 945*z) / 92160
+    return z + g1/dof + g2/dof**2 + g3/dof**3 + g4/dof**4
+
+
+def information_criteria(phi: float, n_observations: int, n_parameters: int) -> dict:
+    r'''
+    Function to compute AIC, AICc and BIC of a least squares
+    fit with Gaussian errors of unknown variance.
+    '''
+    n, k = n_observations, n_parameters
+    log_likelihood = -0.5 * n * (math.log(2 * math.pi * max(phi, 1e-300) / n) + 1)
+    aic = -2 * log_likelihood + 2 * k
+    aicc = aic + 2 * k * (k + 1) / (n - k - 1) if n - k - 1 > 0 else float("nan")
+    bic = -2 * log_likelihood + k * math.log(n)
+    return {"AIC": aic, "AICC": aicc, "BIC": bic}
+
+
+class LevenbergMarquardt(object):
+    r'''
+    Class to estimate model parameters with bounded
+    Levenberg-Marquardt updates. Every Jacobian column and
+    every trial lambda of an iteration is an independent
+    model run, so each batch goes to a pool of `workers`
+    processes, each run staged in its own workspace.
+
+    `names` are keys of `GUIBase._VariableDict`, `aliases`
+    their PEST names. Defaults follow the PEST control data
+    written by `ControlFile.build`. Several estimators can
+    share one process `pool`.
+
+    Usage:
+        >>> lm = LevenbergMarquardt(names, aliases, initial, lower, upper, observed, variable_dictionary,
+                                    input_paths, exe_file_path, workers=8)
+        >>> result = lm.run()
+        >>> write_record("test.rec", result)
+    '''
+
+    def __init__(self, names: list, aliases: list, initial: list, lower: list, upper: list, observed: list,
+                 variable_dictionary: dict, input_paths: list, exe_file_path: str, workers: int = None,
+                 workspace_root: str = "./.tmp/runs", max_iterations: int = 30, derivative_increment: float = 0.01,
+                 initial_lambda: float = 5.0, lambda_factor: float = 2.0, phi_reduction_stop: float = 0.01,
+                 no_reduction_limit: int = 3, engine: str = "Executable", log=print, on_iteration=None, cancel_event=None, pool=None):
+        self.names = list(names)
+        self.aliases = list(aliases)
+        self.initial = np.array(initial, dtype=np.float64)
+        self.lower = np.array(lower, dtype=np.float64)
+        self.upper = np.array(upper, dtype=np.float64)
+        self.observed = np.array(observed, dtype=np.float64)
+        self.variable_dictionary = variable_dictionary
+        self.input_paths = [os.path.abspath(path) for path in input_paths]
+        self.exe_file_path = os.path.abspath(exe_file_path) if exe_file_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.workspace_root = os.path.abspath(workspace_root)
+        self.max_iterations = max_iterations
+        self.derivative_increment = derivative_increment
+        self.initial_lambda = initial_lambda
+        self.lambda_factor = lambda_factor
+        self.phi_reduction_stop = phi_reduction_stop
+        self.no_reduction_limit = no_reduction_limit
+        self.engine = engine
+        self.log = log
+        self.on_iteration = on_iteration
+        self.cancel_event = cancel_event
+        self.model_runs = 0
+        self.pool = pool
+        self._pool = None
+
+    def _evaluate(self, parameter_sets: list) -> list:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise EstimationCancelled("Estimation cancelled")
+
+        tasks = [(idx, self.names, list(values), self.variable_dictionary, self.input_paths, self.exe_file_path, self.workspace_root, self.engine)
+                 for idx, values in enumerate(parameter_sets)]
+        residuals = [None] * len(tasks)
+        for index, simulated, error, duration in self._pool.map(_sweep_worker, tasks):
+            if error:
+                raise EstimationError("Model run with {} failed: {}".format(
+                    dict(zip(self.aliases, parameter_sets[index])), error))
+            length = min(len(simulated), len(self.observed))
+            residual = self.observed.copy()
+            residual[:length] -= simulated[:length]
+            residuals[index] = residual
+        self.model_runs += len(tasks)
+        return residuals
+
+    def _jacobian(self, parameters: np.ndarray, residual: np.ndarray) -> np.ndarray:
+        steps = self.derivative_increment * np.maximum(np.abs(parameters), 1e-10)
+        # One-sided steps inside [lower, upper]: forward, else backward, else the wider side shortened to fit.
+        above, below = self.upper - parameters, parameters - self.lower
+        steps = np.where(above >= steps, steps, np.where(below >= steps, -steps, np.where(above >= below, above, -below)))
+        sets = []
+        for idx in range(len(parameters)):
+            shifted = parameters.copy()
+            shifted[idx] += steps[idx]
+            sets.append(np.clip(shifted, self.lower, self.upper))
+        columns = self._evaluate(sets)
+        # Residuals are observed - simulated, so d(simulated)/dp = -d(residual)/dp.
+        # A parameter with lower == upper cannot move and gets a zero column.
+        return np.column_stack([(residual - shifted) / step if step else np.zeros_like(residual)
+                                for shifted, step in zip(columns, steps)])
+
+    def _upgrade(self, parameters: np.ndarray, jacobian: np.ndarray, residual: np.ndarray, lam: float) -> np.ndarray:
+        normal = jacobian.T @ jacobian
+        gradient = jacobian.T @ residual
+        damping = lam * np.diag(np.maximum(np.diag(normal), 1e-12))
+        step = np.linalg.lstsq(normal + damping, gradient, rcond=None)[0]
+        return np.clip(parameters + step, self.lower, self.upper)
+
+    def run(self) -> dict:
+        r'''
+        Function to run the estimation. Returns a dict with
+        the aliases, estimated values, 95% confidence limits,
+        phi, the information criteria and the iteration records.
+        '''
+        start = time.time()
+        parameters = np.clip(self.initial, self.lower, self.upper)
+        lam = self.initial_lambda
+        records = []
+        stalled = 0
+
+        self.log(">>> [INFO] Levenberg-Marquardt estimation of {} on {} workers".format(", ".join(self.aliases), self.workers))
+        with nullcontext(self.pool) if self.pool is not None else ProcessPoolExecutor(max_workers=self.workers) as pool:
+            self._pool = pool
+            residual = self._evaluate([parameters])[0]
+            phi = float(residual @ residual)
+
+            for iteration in range(1, self.max_iterations + 1):
+                jacobian = self._jacobian(parameters, residual)
+                lambdas = [lam / self.lambda_factor, lam, lam * self.lambda_factor]
+                trials = [self._upgrade(parameters, jacobian, residual, x) for x in lambdas]
+                trial_residuals = self._evaluate(trials)
+                trial_phis = [float(r @ r) for r in trial_residuals]
+
+                best = int(np.argmin(trial_phis))
+                record = {"iteration": iteration, "starting_phi": phi, "lambdas": lambdas, "phis": trial_phis,
+                          "best_phi": min(phi, trial_phis[best]), "best_lambda": lambdas[best]}
+                records.append(record)
+                if self.on_iteration is not None:
+                    self.on_iteration(record)
+                self.log(">>> [INFO] LM iteration {}: phi = {:.6G}, lambda = {:.4G}".format(iteration, record["best_phi"], lambdas[best]))
+
+                if trial_phis[best] < phi:
+                    reduction = (phi - trial_phis[best]) / phi if phi > 0 else 0.0
+                    parameters, residual, phi, lam = trials[best], trial_residuals[best], trial_phis[best], lambdas[best]
+                    stalled = stalled + 1 if reduction < self.phi_reduction_stop else 0
+                else:
+                    lam *= self.lambda_factor ** 3
+                    stalled += 1
+                if stalled >= self.no_reduction_limit or phi == 0.0:
+                    break
+
+            jacobian = self._jacobian(parameters, residual)
+            self._pool = None
+
+        n, k = len(self.observed), len(parameters)
+        dof = n - k
+        if dof > 0:
+            covariance = phi / dof * np.linalg.pinv(jacobian.T @ jacobian)
+            half_width = t_quantile(0.975, dof) * np.sqrt(np.maximum(np.diag(covariance), 0.0))
+        else:
+            half_width = np.full(k, np.nan)
+
+        self.log(">>> [INFO] Estimation finished with phi = {:.6G} after {} model runs in {:.2f}s".format(
+            phi, self.model_runs, time.time() - start))
+        return {
+            "aliases": self.aliases,
+            "values": parameters,
+            "lower_limits": parameters - half_width,
+            "upper_limits": parameters + half_width,
+            "phi": phi,
+            "n_observations": n,
+            "criteria": information_criteria(phi, n, k),
+            "records": records,
+            "model_runs": self.model_runs,
+        }
+
+
+def write_record(path: str, result: dict) -> None:
+    r'''
+    Function to write the estimation result as a run record
+    with the `----->` sections of the PEST record file, so
+    `read_record_sections` and the result windows apply.
+    '''
+    lines = ["Objective function ----->", "",
+             "  Sum of squared weighted residuals (ie phi)         = {:.6G}".format(result["phi"]),
+             "  Number of model runs                               = {}".format(result["model_runs"]),
+             ""]
+    lines += ["K-L information statistics ----->", ""]
+    lines += ["  {:<6}= {:.6G}".format(name, value) for name, value in result["criteria"].items()]
+    lines += ["", "Parameters ----->", "",
+              " Parameter        Estimated         95% percent confidence limits",
+              "                  value             lower limit       upper limit"]
+    for alias, value, lower, upper in zip(result["aliases"], result["values"], result["lower_limits"], result["upper_limits"]):
+        lines.append("  {:<16}{:<18.6G}{:<18.6G}{:.6G}".format(alias, value, lower, upper))
+    lines += ["", " Note: confidence limits provide only an indication of parameter uncertainty.",
+              "       They rely on a linearity assumption which may not extend as far in",
+              "       parameter space as the confidence limits themselves.", ""]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
@@ -20,17 +20,66 @@
 
 """
 
+from __future__ import annotations
+
 from gui_base import GUIBase, PlotEncapsulator, GUI_exception
-import threading
+from gui_tracker import FileChangeTracker
+from gui_supervisor import ProcessSupervisor
+import gui_io
+from gui_lod import level_of_detail, band_envelope
+from collections import deque
 import time
-import numpy as np
-import matplotlib.pyplot as plt
 import os
-import hashlib
 import random
-import subprocess
 from copy import deepcopy
 import math
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+def _update_line(ax, artists: dict, name: str, x, y, **kwargs) -> None:
+    r'''
+    Function to update the data of the line `name` of
+    `artists`, plotting it on `ax` on first use. Long
+    curves are drawn at screen resolution, see <gui_lod>.
+    '''
+    if name in artists:
+        if "label" in kwargs:
+            artists[name].set_label(kwargs["label"])
+    else:
+        artists[name], = ax.plot([], [], **kwargs)
+    level_of_detail(ax).set(artists[name], x, y)
+
+
+def _update_scatter(ax, artists: dict, name: str, x, y, **kwargs) -> None:
+    r'''
+    Function to update the points of the scatter `name`
+    of `artists`, left untouched when they did not change.
+    '''
+    if name not in artists:
+        artists[name] = ax.scatter([], [], **kwargs)
+    level_of_detail(ax).set(artists[name], x, y)
+
+
+def _autoscale(ax, artists: dict) -> None:
+    r'''
+    Function to fit the view of `ax` to the full curves
+    of its lines and to the collections of `artists`,
+    which relim skips.
+    '''
+    from matplotlib.collections import Collection
+
+    ax.relim()
+    extent = level_of_detail(ax).extent()
+    if extent is not None and np.all(np.isfinite(extent)):
+        ax.update_datalim(extent)
+    for artist in artists.values():
+        if isinstance(artist, Collection) and artist.axes is ax:
+            bounds = artist.get_datalim(ax.transData)
+            if np.all(np.isfinite(bounds.get_points())):
+                ax.update_datalim(bounds.get_points())
+    ax.autoscale_view()
+
 
 class GUIMain(GUIBase):
     r'''
@@ -42,138 +91,190 @@ class GUIMain(GUIBase):
 
     @classmethod
     @GUI_exception
-    def _refresh_utility(cls, first_file_path: str, second_file_path: str, third_file_path: str, memory: dict) -> bool:
+    def _refresh_utility(cls, first_file_path: str, second_file_path: str, third_file_path: str, memory: FileChangeTracker, exe_file_path: str = None) -> bool:
         r'''
-        Function to check if any input file is changed/updated
-        and run the executable in case files are changed/updated.
+        Function to check if any input file or the executable
+        (or the tuple of engine source files) is changed/updated
+        since the last completed run.
         '''
-        isupdates = False
-        checksum_file_1 = hashlib.sha256(open(first_file_path, 'r').read().encode('utf-8')).hexdigest()
-        checksum_file_2 = hashlib.sha256(open(second_file_path, 'r').read().encode('utf-8')).hexdigest()
-        checksum_file_3 = hashlib.sha256(open(third_file_path, 'r').read().encode('utf-8')).hexdigest()
-
-        if memory.get(first_file_path, None) != checksum_file_1:
-            memory[first_file_path] = checksum_file_1
-            isupdates = True
-
-        if memory.get(second_file_path, None) != checksum_file_2:
-            memory[second_file_path] = checksum_file_2
-            isupdates = True
-            
-        if memory.get(third_file_path, None) != checksum_file_3:
-            memory[third_file_path] = checksum_file_3
-            isupdates = True  
+        paths = [first_file_path, second_file_path, third_file_path]
+        if isinstance(exe_file_path, str):
+            paths.append(exe_file_path)
+        elif exe_file_path is not None:
+            paths.extend(exe_file_path)
+
+        isupdates = memory.stage(paths)
 
         if isupdates == False:
             print("No updates found in the input file.")
 
-        return type(isupdates) is bool
+        return isupdates
 
     @classmethod
     @GUI_exception
-    def _nonblocking_execute_external_code(cls, exe_file_path: str, thread_queue: list):
+    def _nonblocking_execute_external_code(cls, exe_file_path: str, job_queue: deque, supervisor: ProcessSupervisor, on_complete=None, cwd: str = None, timeout: float = None):
         r'''
         Function to execute the fortran
         executable and generate output file.
+        `on_complete` is called with the exit code
+        once the executable returns.
         '''
-        def target_func(x):
-            return subprocess.call([x])
+        def target_func(job):
+            if on_complete is not None:
+                on_complete(job.returncode if job.state in ("finished", "failed") else None)
 
-        t = threading.Thread(target=target_func, args=(exe_file_path,))
-        thread_queue.append(t)
-        t.start()
+        job = supervisor.submit([os.path.abspath(exe_file_path)], cwd=cwd, timeout=timeout, name="Model run", on_done=target_func)
+        job_queue.append(job)
+        return job
 
 
-    @PlotEncapsulator
+    @PlotEncapsulator("fig_plot_1")
     @GUI_exception
-    def _plot_first_2D_data(self, output_file_path: str, time_file_path: str):
+    def _plot_first_2D_data(self, ax, artists: dict, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray):
         r'''
         Function to plot experimental data
         with reespect to timestamp.
         '''
-        time = []
-        conc = []
-
-        with open(time_file_path,'r') as file:
-            data = file.read().splitlines()
-            for row in range(1,len(data)):
-                if row>int(data[0]):
-                    time.append(float(data[row]))
-
-        with open(output_file_path,'r') as file:
-            data = file.read().splitlines()
-            for line in data:
-                x, y = line.split()
-                x = float(x)
-                conc.append(x)
-
-        plt.scatter(time,conc, marker='o', color='black')
-        plt.xlabel('Time')
-        plt.ylabel('Concentration')
-        plt.title('Observed-BTC [ {} ]'.format(self.mode))
+        _update_scatter(ax, artists, "observed", time, observed, marker='o', color='black')
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Observed-BTC [ {} ]'.format(self.mode))
+        _autoscale(ax, artists)
 
 
-    @PlotEncapsulator
+    @PlotEncapsulator("fig_plot_2")
     @GUI_exception
-    def _plot_second_2D_data(self, output_file_path: str, time_file_path: str):
+    def _plot_second_2D_data(self, ax, artists: dict, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray):
         r'''
         Function to plot simulation data
         with reespect to timestamp.
         '''
-        time = []
-        conc = []
+        _update_line(ax, artists, "simulated", time, simulated)
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Concentration-Time graph [ {} ]'.format(self.mode))
+        _autoscale(ax, artists)
 
-        with open(time_file_path,'r') as file:
-            data = file.read().splitlines()
-            for row in range(1,len(data)):
-                if row>int(data[0]):
-                    time.append(float(data[row]))
 
-        with open(output_file_path,'r') as file:
-            data = file.read().splitlines()
-            for line in data:
-                x, y = line.split()
-                y = float(y)
-                conc.append(y)
-
-        plt.plot(time,conc)
-        plt.xlabel('Time')
-        plt.ylabel('Concentration')
-        plt.title('Concentration-Time graph [ {} ]'.format(self.mode))
-
-
-    @PlotEncapsulator
+    @PlotEncapsulator("fig_plot_3")
     @GUI_exception
-    def _plot_both_2D_data(self, output_file_path: str, time_file_path: str):
+    def _plot_both_2D_data(self, ax, artists: dict, time: np.ndarray, observed: np.ndarray, simulated: np.ndarray, bands: dict = None):
         r'''
         Function to plot simulation and experimental data
-        on same canvas.
+        on same canvas, with the ensemble percentile
+        bands when given.
         '''
-        time = []
-        conc1 = []
-        conc2=[]
-
-        with open(time_file_path,'r') as file:
-            data = file.read().splitlines()
-            for row in range(1,len(data)):
-                if row>int(data[0]):
-                    time.append(float(data[row]))
-
-        with open(output_file_path,'r') as file:
-            data = file.read().splitlines()
-            for line in data:
-                x, y = line.split()
-                x, y = float(x), float(y)
-                conc1.append(x)
-                conc2.append(y)
-
-        plt.scatter(time,conc1, marker='o',label='Observed',color='black')
-        plt.plot(time,conc2, label='Simulated [ {} ]'.format(self.mode))
-        plt.xlabel('Time')
-        plt.ylabel('Concentration')
-        plt.title('Simulated-BTC [ {} ]'.format(self.mode))
-        plt.legend()
+        if "band" in artists:
+            artists.pop("band").remove()
+        if bands is not None:
+            lower, median, upper = [curve[:len(time)] for curve in bands["quantiles"]]
+            n = len(lower)
+            artists["band"] = ax.fill_between(*band_envelope(time[:n], lower, upper, level_of_detail(ax).budget()), color='tab:blue', alpha=0.25,
+                             label='{:g}-{:g}% band ({} runs)'.format(100 * bands["probabilities"][0], 100 * bands["probabilities"][-1], bands["count"]))
+            _update_line(ax, artists, "median", time[:n], median, color='tab:blue', linestyle='--', label='Ensemble median')
+        elif "median" in artists:
+            artists.pop("median").remove()
+        _update_scatter(ax, artists, "observed", time, observed, marker='o', label='Observed', color='black')
+        _update_line(ax, artists, "simulated", time, simulated, label='Simulated [ {} ]'.format(self.mode))
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Simulated-BTC [ {} ]'.format(self.mode))
+        ax.legend()
+        _autoscale(ax, artists)
     
+    @PlotEncapsulator("fig_plot_4")
+    @GUI_exception
+    def _plot_convergence(self, ax, artists: dict, records: list):
+        r'''
+        Function to plot the objective function (phi)
+        and the Marquardt lambda of every PEST iteration.
+        '''
+        records = [record for record in records if record["best_phi"] is not None]
+        iterations = [record["iteration"] for record in records]
+        phi = [record["best_phi"] for record in records]
+        lambdas = [record["best_lambda"] for record in records]
+
+        ax.set_yscale('log')
+        _update_line(ax, artists, "phi", iterations, phi, marker='o', color='black', label='Phi')
+        ax.set_xlabel('Iteration')
+        ax.set_ylabel('Phi')
+        ax.set_title('PEST convergence [ {} ]'.format(self.mode))
+        _autoscale(ax, artists)
+        if any(x is not None for x in lambdas):
+            if "lambda_axis" not in artists:
+                artists["lambda_axis"] = ax.twinx()
+                artists["lambda_axis"].set_yscale('log')
+                artists["lambda_axis"].set_ylabel('Lambda', color='tab:blue')
+            axis = artists["lambda_axis"]
+            _update_line(axis, artists, "lambda", iterations, [x if x is not None else np.nan for x in lambdas], marker='s', linestyle='--', color='tab:blue')
+            axis.relim()
+            axis.autoscale_view()
+
+    @PlotEncapsulator("fig_plot_4")
+    @GUI_exception
+    def _plot_grid_convergence(self, ax, artists: dict, time: np.ndarray, result: dict):
+        r'''
+        Function to overlay the simulated curves
+        of every grid of a convergence study.
+        '''
+        ax.clear()
+        artists.clear()
+        for idx, (factor, curve, error) in enumerate(zip(result["factors"], result["curves"], result["errors"])):
+            if curve is None:
+                continue
+            n = min(len(time), len(curve))
+            style = '-' if idx == result["recommended"] else '--'
+            _update_line(ax, artists, factor, time[:n], curve[:n], linestyle=style, label='x{:g} (error {:.3G}%)'.format(factor, 100 * error))
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Grid convergence [ {} ]'.format(self.mode))
+        ax.legend()
+        _autoscale(ax, artists)
+
+    @PlotEncapsulator("fig_plot_3")
+    @GUI_exception
+    def _plot_mode_comparison(self, ax, artists: dict, time: np.ndarray, observed: np.ndarray, result: dict):
+        r'''
+        Function to overlay the simulated curves
+        of every mode on the experimental data.
+        '''
+        ax.clear()
+        artists.clear()
+        _update_scatter(ax, artists, "observed", time, observed, marker='o', label='Observed', color='black')
+        for mode, curve, aic in zip(result["modes"], result["simulated"], result["statistics"]["AIC"]):
+            if not np.all(np.isnan(curve)):
+                _update_line(ax, artists, mode, time, curve[:len(time)], label='{} (AIC {:.1f})'.format(mode, aic))
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Concentration')
+        ax.set_title('Mode comparison [ current: {} ]'.format(self.mode))
+        ax.legend()
+        _autoscale(ax, artists)
+
+    @PlotEncapsulator("fig_plot_5")
+    @GUI_exception
+    def _plot_sensitivity(self, ax, artists: dict, indices: dict):
+        r'''
+        Function to plot the sensitivity indices
+        as a ranked horizontal bar chart.
+        '''
+        ax.clear()
+        order = np.argsort(indices["score"])
+        names = [indices["names"][idx] for idx in order]
+        positions = np.arange(len(order))
+
+        if indices["method"] == "Sobol":
+            ax.barh(positions + 0.2, indices["ST"][order], height=0.4, color='black', label='Total (ST)')
+            ax.barh(positions - 0.2, indices["S1"][order], height=0.4, color='tab:blue', label='First order (S1)')
+            ax.set_xlabel('Sobol index')
+        else:
+            ax.barh(positions, indices["mu_star"][order], xerr=indices["sigma"][order], color='black', ecolor='tab:blue', label='mu* (sigma)')
+            ax.set_xlabel('Morris mu*')
+        ax.set_yticks(positions)
+        ax.set_yticklabels(names, fontsize=7)
+        ax.set_title('Sensitivity [ {} ]'.format(self.mode))
+        ax.legend()
+        ax.figure.tight_layout()
+
     @classmethod
     @GUI_exception
     def _inplace_update_variable_dictionary(cls, first_file_path: str, second_file_path: str, third_file_path: str, variable_dictionary: dict) -> None:        
@@ -181,49 +282,7 @@ class GUIMain(GUIBase):
         Function to update variable dictionary in place 
         using the manually entered values
         '''
-        try:
-            file1 = open(first_file_path, "r")
-            variable_dictionary["Mesopore seepage velocity"] = file1.readline().strip()
-            variable_dictionary["Macropore seepage velocity"] = file1.readline().strip()
-            variable_dictionary["Solute mass transfer rate b/w meso-micropore"] = file1.readline().strip()
-            variable_dictionary["Solute mass transfer rate b/w meso-macropore"] = file1.readline().strip()
-            variable_dictionary["Dispersivity"] = file1.readline().strip()
-            variable_dictionary["No. of observation time steps"] = file1.readline().strip()
-        finally:
-            file1.close()
-
-        try:
-            file3 = open(third_file_path, "r")
-            line = file3.readline().split()
-            variable_dictionary["nz"] = line[0]
-            variable_dictionary["nm"] = line[1]
-            line = file3.readline().split()
-            variable_dictionary["Length"] = line[0]
-            variable_dictionary["Bulk density of porous media"] = line[1]
-            variable_dictionary["Run time"] = line[2]
-            variable_dictionary["Pulse time"] = line[3]
-            variable_dictionary["delta_t"] = line[4]
-            variable_dictionary["delta_x"] = line[5]
-            line = file3.readline().split()
-            variable_dictionary["Porosity of the macropore region"] = line[0]
-            variable_dictionary["Porosity of the mesopore region"] = line[1]
-            variable_dictionary["Porosity of the micropore region"] = line[2]
-            line = file3.readline().split()
-            variable_dictionary["Instantaneous sorption fraction in macropore region"] = line[0]
-            variable_dictionary["Instantaneous sorption fraction in mesopore region"] = line[1]
-            variable_dictionary["Instantaneous sorption fraction in micropore region"] = line[2]
-            variable_dictionary["Fraction of sorption site available for macropore region"] = line[3]
-            variable_dictionary["Fraction of sorption site available for mesopore region"] = line[4]
-            variable_dictionary["Fraction of sorption site available for immobile region"] = line[5]
-            line = file3.readline().split()
-            variable_dictionary["Equilibrium sorption coefficient in macropore region"] = line[0]
-            variable_dictionary["Equilibrium sorption coefficient in mesopore region"] = line[1]
-            variable_dictionary["Equilibrium sorption coefficient in micropore region"] = line[2]
-            variable_dictionary["Rate-limited sorbed coefficient in macropore region"] = line[3]
-            variable_dictionary["Rate-limited sorbed coefficient in mesopore region"] = line[4]
-            variable_dictionary["Rate-limited sorbed coefficient in micropore region"] = line[5]
-        finally:
-            file3.close()
+        gui_io.read_variables(first_file_path, third_file_path, variable_dictionary)
 
     @classmethod
     @GUI_exception
@@ -232,42 +291,7 @@ class GUIMain(GUIBase):
         Function to update values (manually entered by user)
         in the files from the variable dictionary.
         '''
-        try:
-            with open(first_file_path, "r") as f:
-                temp = f.readlines()
-            file1 = open(first_file_path, "w")
-            lines = ["Mesopore seepage velocity", "Macropore seepage velocity", "Solute mass transfer rate b/w meso-micropore", "Solute mass transfer rate b/w meso-macropore", "Dispersivity", "No. of observation time steps"]
-            for line in lines[:-1]:
-                file1.write(variable_dictionary[line]+str("\n"))
-            file1.write(str(int(float(variable_dictionary[lines[-1]])))+str("\n"))
-            file1.write("".join(temp[6:]))
-        finally:
-            file1.close()
-
-        try:
-            file3 = open(third_file_path, "w")
-            lines = ["nz", "nm"]
-            for line in lines[:-1]:
-                file3.write(str(int(float(variable_dictionary[line])))+str(" "))
-            file3.write(str(int(float(variable_dictionary[lines[-1]])))+str("\n"))
-            lines = ["Length", "Bulk density of porous media", "Run time", "Pulse time", "delta_t", "delta_x"]
-            for line in lines[:-1]:
-                file3.write(variable_dictionary[line]+str(" "))
-            file3.write(variable_dictionary[lines[-1]]+str("\n"))
-            lines = ["Porosity of the macropore region", "Porosity of the mesopore region", "Porosity of the micropore region"]
-            for line in lines[:-1]:
-                file3.write(variable_dictionary[line]+str(" "))
-            file3.write(variable_dictionary[lines[-1]]+str("\n"))
-            lines = ["Instantaneous sorption fraction in macropore region", "Instantaneous sorption fraction in mesopore region", "Instantaneous sorption fraction in micropore region", "Fraction of sorption site available for macropore region", "Fraction of sorption site available for mesopore region", "Fraction of sorption site available for immobile region"]
-            for line in lines[:-1]:
-                file3.write(variable_dictionary[line]+str(" "))
-            file3.write(variable_dictionary[lines[-1]]+str("\n"))
-            lines = ["Equilibrium sorption coefficient in macropore region", "Equilibrium sorption coefficient in mesopore region", "Equilibrium sorption coefficient in micropore region", "Rate-limited sorbed coefficient in macropore region", "Rate-limited sorbed coefficient in mesopore region", "Rate-limited sorbed coefficient in micropore region"]
-            for line in lines[:-1]:
-                file3.write(variable_dictionary[line]+str(" "))
-            file3.write(variable_dictionary[lines[-1]]+str("\n"))
-        finally:
-            file3.close()
+        gui_io.write_variables(first_file_path, second_file_path, third_file_path, variable_dictionary)
 
     @GUI_exception
     def _export_timestamps_data(self, time_series: list, first_file_path: str, second_file_path: str, third_file_path: str) -> None:
@@ -275,11 +299,7 @@ class GUIMain(GUIBase):
         Function to export timestamp data
         to an external file.
         '''
-        time_series_copy = map(lambda x: str(x), time_series)
-        as_string = "\n".join(time_series_copy)
-
-        with open(second_file_path, "w") as f:
-            f.write(as_string)
+        gui_io.write_values(second_file_path, time_series)
 
     @GUI_exception
     def _import_timestamps_data(self, first_file_path: str, second_file_path: str, third_file_path: str) -> list:
@@ -287,16 +307,7 @@ class GUIMain(GUIBase):
         Function to import time-stamp data
         manually.
         '''
-        try:
-            file2 = open(second_file_path, "r")
-            skip = int(file2.readline())
-            for i in range(skip):
-                file2.readline()
-            timestamps_data = file2.read().splitlines()
-        finally:
-            file2.close()
-        time_series = [float(i) for i in timestamps_data]
-        return time_series
+        return gui_io.read_timestamps(second_file_path)
 
     @GUI_exception
     def _export_concentration_data(self, time_series: list, first_file_path: str, second_file_path: str, third_file_path: str) -> None:
@@ -304,11 +315,7 @@ class GUIMain(GUIBase):
         Function to export concentration data
         to an external file.
         '''
-        time_series_copy = map(lambda x: str(x), time_series)
-        as_string = "\n".join(time_series_copy)
-
-        with open(first_file_path, "w") as f:
-            f.write(as_string)
+        gui_io.write_values(first_file_path, time_series)
 
     @GUI_exception
     def _import_concentration_data(self, first_file_path: str, second_file_path: str, third_file_path: str) -> list:
@@ -316,15 +323,7 @@ class GUIMain(GUIBase):
         Function to import concentration data
         manually.
         '''
-        try:
-            file1 = open(first_file_path, "r")
-            for i in range(6):
-                file1.readline()
-            concentration_data = file1.read().splitlines()
-        finally:
-            file1.close()
-        consentration_series = [float(i) for i in concentration_data]
-        return consentration_series
+        return gui_io.read_concentrations(first_file_path)
 
     @GUI_exception
     def _initialize_variables(self):
@@ -332,132 +331,4 @@ class GUIMain(GUIBase):
         Function to initialise variables in accordance with 
         the modes as suggested in first feedback.
         '''
-        return {
-            "ADE": {
-                "nz": None,
-                "nm": None,
-                "Length": None,
-                "Bulk density of porous media": None,
-                "Run time": None,
-                "Pulse time": None,
-                "delta_t": None,
-                "delta_x": None,
-                "Porosity of the macropore region": None,
-                "Porosity of the mesopore region": 1e-16,
-                "Porosity of the micropore region": 1e-16,
-                "Instantaneous sorption fraction in macropore region": 1,
-                "Instantaneous sorption fraction in mesopore region": 1e-16,
-                "Instantaneous sorption fraction in micropore region": 1e-16,
-                "Fraction of sorption site available for macropore region": 1,
-                "Fraction of sorption site available for mesopore region": 1e-16,
-                "Fraction of sorption site available for immobile region": 1e-16,
-                "Equilibrium sorption coefficient in macropore region": None,
-                "Equilibrium sorption coefficient in mesopore region": 1e-16,
-                "Equilibrium sorption coefficient in micropore region": 1e-16,
-                "Rate-limited sorbed coefficient in macropore region": 1e-16,
-                "Rate-limited sorbed coefficient in mesopore region": 1e-16,
-                "Rate-limited sorbed coefficient in micropore region": 1e-16,
-                "Mesopore seepage velocity": 1e-16,
-                "Macropore seepage velocity": None,
-                "Solute mass transfer rate b/w meso-micropore": 1e-16,
-                "Solute mass transfer rate b/w meso-macropore": 1e-16,
-                "Dispersivity": None,
-                "No. of observation time steps": None,
-            },
-
-            "MIM": {
-                 "nz": None,
-                "nm": None,
-                "Length": None,
-                "Bulk density of porous media": None,
-                "Run time": None,
-                "Pulse time": None,
-                "delta_t": None,
-                "delta_x": None,
-                "Porosity of the macropore region": None,
-                "Porosity of the mesopore region": 1e-16,
-                "Porosity of the micropore region": 1e-16,
-                "Instantaneous sorption fraction in macropore region": None,
-                "Instantaneous sorption fraction in mesopore region": None,
-                "Instantaneous sorption fraction in micropore region": 1e-16,
-                "Fraction of sorption site available for macropore region": None,
-                "Fraction of sorption site available for mesopore region": None,
-                "Fraction of sorption site available for immobile region": 1e-16,
-                "Equilibrium sorption coefficient in macropore region": None,
-                "Equilibrium sorption coefficient in mesopore region": None,
-                "Equilibrium sorption coefficient in micropore region": None,
-                "Rate-limited sorbed coefficient in macropore region": 1e-16,
-                "Rate-limited sorbed coefficient in mesopore region": 1e-16,
-                "Rate-limited sorbed coefficient in micropore region": 1e-16,
-                "Mesopore seepage velocity": 1e-16,
-                "Macropore seepage velocity": None,
-                "Solute mass transfer rate b/w meso-micropore": 1e-16,
-                "Solute mass transfer rate b/w meso-macropore": None,
-                "Dispersivity": None,
-                "No. of observation time steps": None,
-            },
-
-            "MPNE": {
-                "nz": None,
-                "nm": None,
-                "Length": None,
-                "Bulk density of porous media": None,
-                "Run time": None,
-                "Pulse time": None,
-                "delta_t": None,
-                "delta_x": None,
-                "Porosity of the macropore region": None,
-                "Porosity of the mesopore region": None,
-                "Porosity of the micropore region": 1e-16,
-                "Instantaneous sorption fraction in macropore region": None,
-                "Instantaneous sorption fraction in mesopore region": None,
-                "Instantaneous sorption fraction in micropore region": 1e-16,
-                "Fraction of sorption site available for macropore region": None,
-                "Fraction of sorption site available for mesopore region": None,
-                "Fraction of sorption site available for immobile region": 1e-16,
-                "Equilibrium sorption coefficient in macropore region": None,
-                "Equilibrium sorption coefficient in mesopore region": None,
-                "Equilibrium sorption coefficient in micropore region": 1e-16,
-                "Rate-limited sorbed coefficient in macropore region": None,
-                "Rate-limited sorbed coefficient in mesopore region": None,
-                "Rate-limited sorbed coefficient in micropore region": None,
-                "Mesopore seepage velocity": None,
-                "Macropore seepage velocity": None,
-                "Solute mass transfer rate b/w meso-micropore": 1e-16,
-                "Solute mass transfer rate b/w meso-macropore": None,
-                "Dispersivity": None,
-                "No. of observation time steps": None,
-            },
-
-            "DADE": {
-                "nz": None,
-                "nm": None,
-                "Length": None,
-                "Bulk density of porous media": None,
-                "Run time": None,
-                "Pulse time": None,
-                "delta_t": None,
-                "delta_x": None,
-                "Porosity of the macropore region": None,
-                "Porosity of the mesopore region": None,
-                "Porosity of the micropore region": 1e-16,
-                "Instantaneous sorption fraction in macropore region": 1e-16,
-                "Instantaneous sorption fraction in mesopore region": 1e-16,
-                "Instantaneous sorption fraction in micropore region": 1e-16,
-                "Fraction of sorption site available for macropore region": 1e-16,
-                "Fraction of sorption site available for mesopore region": 1e-16,
-                "Fraction of sorption site available for immobile region": 1e-16,
-                "Equilibrium sorption coefficient in macropore region": 1e-16,
-                "Equilibrium sorption coefficient in mesopore region": 1e-16,
-                "Equilibrium sorption coefficient in micropore region": 1e-16,
-                "Rate-limited sorbed coefficient in macropore region": 1e-16,
-                "Rate-limited sorbed coefficient in mesopore region": 1e-16,
-                "Rate-limited sorbed coefficient in micropore region": 1e-16,
-                "Mesopore seepage velocity": None,
-                "Macropore seepage velocity": None,
-                "Solute mass transfer rate b/w meso-micropore": 1e-16,
-                "Solute mass transfer rate b/w meso-macropore": None,
-                "Dispersivity": None,
-                "No. of observation time steps": None,
-            }
-        }
\ No newline at end of file
+        return dict(gui_io.mode_definitions())
\ No newline at end of file
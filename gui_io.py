@@ -0,0 +1,223 @@
+"""
+@name
+    `gui_io.py`
+
+@description
+    `src file for reading and writing the model input files, free of any GUI toolkit`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from gui_loader import parse_timestamps
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+
+INPUT_FILES = ("in_1.dat", "in_2.dat", "in_3.dat")
+
+# in_1.dat: one value per line, followed by the observed concentrations.
+FIRST_FILE_VARIABLES = ["Mesopore seepage velocity", "Macropore seepage velocity", "Solute mass transfer rate b/w meso-micropore",
+                        "Solute mass transfer rate b/w meso-macropore", "Dispersivity", "No. of observation time steps"]
+
+# in_3.dat: one list of space separated values per line.
+THIRD_FILE_LINES = [
+    ["nz", "nm"],
+    ["Length", "Bulk density of porous media", "Run time", "Pulse time", "delta_t", "delta_x"],
+    ["Porosity of the macropore region", "Porosity of the mesopore region", "Porosity of the micropore region"],
+    ["Instantaneous sorption fraction in macropore region", "Instantaneous sorption fraction in mesopore region",
+     "Instantaneous sorption fraction in micropore region", "Fraction of sorption site available for macropore region",
+     "Fraction of sorption site available for mesopore region", "Fraction of sorption site available for immobile region"],
+    ["Equilibrium sorption coefficient in macropore region", "Equilibrium sorption coefficient in mesopore region",
+     "Equilibrium sorption coefficient in micropore region", "Rate-limited sorbed coefficient in macropore region",
+     "Rate-limited sorbed coefficient in mesopore region", "Rate-limited sorbed coefficient in micropore region"],
+]
+
+INTEGER_VARIABLES = ("nz", "nm", "No. of observation time steps")
+
+VARIABLE_NAMES = [name for line in THIRD_FILE_LINES for name in line] + FIRST_FILE_VARIABLES
+
+
+def read_variables(first_file_path: str, third_file_path: str, variable_dictionary: dict = None) -> dict:
+    r'''
+    Function to read the variables of in_1.dat and in_3.dat
+    into `variable_dictionary` (a new dict when omitted).
+    Values are kept as the strings found in the files.
+    '''
+    if variable_dictionary is None:
+        variable_dictionary = {name: None for name in VARIABLE_NAMES}
+
+    with open(first_file_path, "r") as f:
+        for name in FIRST_FILE_VARIABLES:
+            variable_dictionary[name] = f.readline().strip()
+
+    with open(third_file_path, "r") as f:
+        for names in THIRD_FILE_LINES:
+            line = f.readline().split()
+            for idx, name in enumerate(names):
+                variable_dictionary[name] = line[idx]
+    return variable_dictionary
+
+
+def _format(name: str, value) -> str:
+    return str(int(float(value))) if name in INTEGER_VARIABLES else str(value)
+
+
+def write_variables(first_file_path: str, second_file_path: str, third_file_path: str, variable_dictionary: dict) -> None:
+    r'''
+    Function to write the variables of `variable_dictionary`
+    to in_1.dat, keeping its observed concentrations, and
+    to in_3.dat.
+    '''
+    with open(first_file_path, "r") as f:
+        observations = f.readlines()[len(FIRST_FILE_VARIABLES):]
+    with open(first_file_path, "w") as f:
+        for name in FIRST_FILE_VARIABLES:
+            f.write(_format(name, variable_dictionary[name]) + "\n")
+        f.write("".join(observations))
+
+    with open(third_file_path, "w") as f:
+        for names in THIRD_FILE_LINES:
+            f.write(" ".join(_format(name, variable_dictionary[name]) for name in names) + "\n")
+
+
+def read_timestamps(second_file_path: str) -> list:
+    r'''
+    Function to read the observation times of in_2.dat,
+    skipping the header lines counted on its first line.
+    '''
+    with open(second_file_path, "r") as f:
+        skip = int(f.readline())
+        for _ in range(skip):
+            f.readline()
+        return [float(x) for x in f.read().splitlines()]
+
+
+def read_concentrations(first_file_path: str) -> list:
+    r'''
+    Function to read the observed concentrations
+    following the variables of in_1.dat.
+    '''
+    with open(first_file_path, "r") as f:
+        lines = f.read().splitlines()
+    return [float(x) for x in lines[len(FIRST_FILE_VARIABLES):]]
+
+
+def write_values(path: str, values: list) -> None:
+    r'''
+    Function to write one value per line to `path`.
+    '''
+    with open(path, "w") as f:
+        f.write("\n".join(map(str, values)))
+
+
+def read_model_inputs(directory: str) -> tuple:
+    r'''
+    Function to read in_1.dat, in_2.dat and in_3.dat of
+    `directory` into a variable dictionary (keys of
+    `VARIABLE_NAMES`), the observed concentrations
+    and the observation times.
+    '''
+    first, second, third = [os.path.join(directory, name) for name in INPUT_FILES]
+    with open(first, "r") as f:
+        values = f.read().split()
+    variables = dict(zip(FIRST_FILE_VARIABLES, values[:6]))
+    observed = np.array(values[6:6 + int(float(values[5]))], dtype=np.float64)
+
+    with open(third, "r") as f:
+        values = f.read().split()
+    variables.update(zip([name for line in THIRD_FILE_LINES for name in line], values))
+
+    return variables, observed, parse_timestamps(second)
+
+
+def mode_definitions() -> OrderedDict:
+    r'''
+    Function to return the reduced model modes as
+    suggested in first feedback: per mode, the value
+    every variable is pinned to, None when it is free.
+    '''
+    pinned = 1e-16
+    modes = OrderedDict()
+    modes["ADE"] = {
+        "Porosity of the mesopore region": pinned,
+        "Porosity of the micropore region": pinned,
+        "Instantaneous sorption fraction in macropore region": 1,
+        "Instantaneous sorption fraction in mesopore region": pinned,
+        "Instantaneous sorption fraction in micropore region": pinned,
+        "Fraction of sorption site available for macropore region": 1,
+        "Fraction of sorption site available for mesopore region": pinned,
+        "Fraction of sorption site available for immobile region": pinned,
+        "Equilibrium sorption coefficient in mesopore region": pinned,
+        "Equilibrium sorption coefficient in micropore region": pinned,
+        "Rate-limited sorbed coefficient in macropore region": pinned,
+        "Rate-limited sorbed coefficient in mesopore region": pinned,
+        "Rate-limited sorbed coefficient in micropore region": pinned,
+        "Mesopore seepage velocity": pinned,
+        "Solute mass transfer rate b/w meso-micropore": pinned,
+        "Solute mass transfer rate b/w meso-macropore": pinned,
+    }
+    modes["MIM"] = {
+        "Porosity of the mesopore region": pinned,
+        "Porosity of the micropore region": pinned,
+        "Instantaneous sorption fraction in micropore region": pinned,
+        "Fraction of sorption site available for immobile region": pinned,
+        "Rate-limited sorbed coefficient in macropore region": pinned,
+        "Rate-limited sorbed coefficient in mesopore region": pinned,
+        "Rate-limited sorbed coefficient in micropore region": pinned,
+        "Mesopore seepage velocity": pinned,
+        "Solute mass transfer rate b/w meso-micropore": pinned,
+    }
+    modes["MPNE"] = {
+        "Porosity of the micropore region": pinned,
+        "Instantaneous sorption fraction in micropore region": pinned,
+        "Fraction of sorption site available for immobile region": pinned,
+        "Equilibrium sorption coefficient in micropore region": pinned,
+        "Solute mass transfer rate b/w meso-micropore": pinned,
+    }
+    modes["DADE"] = {
+        "Porosity of the micropore region": pinned,
+        "Instantaneous sorption fraction in macropore region": pinned,
+        "Instantaneous sorption fraction in mesopore region": pinned,
+        "Instantaneous sorption fraction in micropore region": pinned,
+        "Fraction of sorption site available for macropore region": pinned,
+        "Fraction of sorption site available for mesopore region": pinned,
+        "Fraction of sorption site available for immobile region": pinned,
+        "Equilibrium sorption coefficient in macropore region": pinned,
+        "Equilibrium sorption coefficient in mesopore region": pinned,
+        "Equilibrium sorption coefficient in micropore region": pinned,
+        "Rate-limited sorbed coefficient in macropore region": pinned,
+        "Rate-limited sorbed coefficient in mesopore region": pinned,
+        "Rate-limited sorbed coefficient in micropore region": pinned,
+        "Solute mass transfer rate b/w meso-micropore": pinned,
+    }
+    return OrderedDict((mode, {name: values.get(name) for name in VARIABLE_NAMES}) for mode, values in modes.items())
+
+
+def apply_mode(mode: str, variable_dictionary: dict) -> dict:
+    r'''
+    Function to pin the variables of `mode` in
+    `variable_dictionary`. TPNE, the full model,
+    pins nothing.
+    '''
+    if mode == "TPNE":
+        return variable_dictionary
+    modes = mode_definitions()
+    if mode not in modes:
+        raise ValueError("Unknown mode '{}', expected one of {}".format(mode, ", ".join(list(modes) + ["TPNE"])))
+    for name, value in modes[mode].items():
+        if value is not None:
+            variable_dictionary[name] = str(value)
+    return variable_dictionary
@@ -0,0 +1,106 @@
+"""
+@name
+    `gui_lazy.py`
+
+@description
+    `src file for deferred module imports and the startup timing report`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import json
+import time
+import types
+import importlib
+from collections import OrderedDict
+
+
+class LazyModule(types.ModuleType):
+    r'''
+    Class standing in for a module that is only imported
+    on first attribute access, so heavy packages such as
+    numpy and matplotlib.pyplot stay off the startup path.
+    Modules using it for annotations need
+    `from __future__ import annotations`.
+
+    Usage:
+        >>> plt = LazyModule("matplotlib.pyplot")
+        >>> plt.figure(1)    # matplotlib.pyplot is imported here
+    '''
+
+    def __init__(self, name: str):
+        super(LazyModule, self).__init__(name)
+        self.__dict__["_module"] = None
+
+    def __getattr__(self, attribute: str):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return getattr(module, attribute)
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+
+class StartupReport(object):
+    r'''
+    Class to time the startup phases of the application
+    and append every startup to a JSON report, keeping the
+    `keep` latest entries. Time spent waiting for the user
+    is left out with `resume()`.
+
+    Usage:
+        >>> STARTUP.mark("imports")
+        >>> STARTUP.resume()        # after a dialog closed
+        >>> STARTUP.mark("main window")
+        >>> print(STARTUP.write())
+    '''
+
+    def __init__(self, path: str = "./.tmp/startup.json", keep: int = 50):
+        self.path = path
+        self.keep = keep
+        self.phases = OrderedDict()
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def resume(self) -> None:
+        self._last = time.perf_counter()
+
+    def write(self) -> str:
+        r'''
+        Function to append the phases to the report, start
+        a new measurement and return a one-line summary.
+        '''
+        entry = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "phases": self.phases, "total": sum(self.phases.values())}
+        summary = "Startup took {:.2f}s ({})".format(entry["total"], ", ".join(
+            "{} {:.2f}s".format(name, seconds) for name, seconds in self.phases.items()))
+        try:
+            history = []
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    history = json.load(f)
+            history = (history + [entry])[-self.keep:]
+            if not os.path.exists(os.path.dirname(self.path)):
+                os.makedirs(os.path.dirname(self.path))
+            with open(self.path + ".part", "w") as f:
+                json.dump(history, f, indent=1)
+            os.replace(self.path + ".part", self.path)
+        except (OSError, ValueError):
+            pass
+        self.phases = OrderedDict()
+        self.resume()
+        return summary
+
+
+STARTUP = StartupReport()
@@ -0,0 +1,159 @@
+"""
+@name
+    `gui_loader.py`
+
+@description
+    `src file for parsing model output and timestamps into numpy arrays`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from gui_tracker import file_signature
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+
+def parse_timestamps(time_file_path: str) -> np.ndarray:
+    r'''
+    Function to parse the timestamp file. The first
+    value is the number of header lines to skip, the
+    remaining values are the observation times.
+    '''
+    with open(time_file_path, "r") as f:
+        values = np.array(f.read().split(), dtype=np.float64)
+    skip = int(values[0])
+    return values[1 + skip:]
+
+
+def parse_output(output_file_path: str) -> np.ndarray:
+    r'''
+    Function to parse output.dat into an (n, 2) array
+    of observed and simulated concentrations.
+    '''
+    with open(output_file_path, "r") as f:
+        values = np.array(f.read().split(), dtype=np.float64)
+    return values.reshape(-1, 2)
+
+
+class PlotDataLoader(object):
+    r'''
+    Class to load the plotting data once per file
+    version. Parsed arrays are kept per path and reused
+    while the (size, mtime_ns, inode) signature of the
+    file is unchanged.
+
+    Usage:
+        >>> loader = PlotDataLoader()
+        >>> time, observed, simulated = loader.load("./output.dat", "./in_2.dat")
+    '''
+
+    def __init__(self):
+        self._memory = {}
+
+    def _cached(self, path: str, parser) -> np.ndarray:
+        key = os.path.abspath(path)
+        signature = file_signature(path)
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        data = parser(path)
+        data.setflags(write=False)
+        self._memory[key] = (signature, data)
+        return data
+
+    def load(self, output_file_path: str, time_file_path: str) -> tuple:
+        r'''
+        Function to return (time, observed, simulated)
+        arrays of equal length.
+        '''
+        time = self._cached(time_file_path, parse_timestamps)
+        output = self._cached(output_file_path, parse_output)
+        n = min(len(time), len(output))
+        return time[:n], output[:n, 0], output[:n, 1]
+
+    def clear(self) -> None:
+        self._memory = {}
+
+
+class OutputTail(object):
+    r'''
+    Class to follow output.dat while the model is still
+    appending to it. Every `poll()` reads only the bytes
+    written since the last one and keeps a trailing
+    partial line for the next call. The file being
+    rewritten from the start resets the rows.
+
+    Usage:
+        >>> tail = OutputTail("./.tmp/runs/run-1/output.dat")
+        >>> if tail.poll():
+        ...     observed, simulated = tail.rows().T
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._partial = b""
+        self._buffer = np.empty((1024, 2), dtype=np.float64)
+        self._count = 0
+
+    def poll(self) -> int:
+        r'''
+        Function to parse the newly written complete lines,
+        returns the number of rows added.
+        '''
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        if size < self._offset:
+            with self._lock:
+                self._reset()
+        if size == self._offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        self._offset += len(data)
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        values = np.array(data[:cut].split(), dtype=np.float64)
+        rows = values[:len(values) // 2 * 2].reshape(-1, 2)
+        if len(rows) == 0:
+            return 0
+
+        with self._lock:
+            if self._count + len(rows) > len(self._buffer):
+                buffer = np.empty((max(2 * len(self._buffer), self._count + len(rows)), 2), dtype=np.float64)
+                buffer[:self._count] = self._buffer[:self._count]
+                self._buffer = buffer
+            self._buffer[self._count:self._count + len(rows)] = rows
+            self._count += len(rows)
+        return len(rows)
+
+    def rows(self) -> np.ndarray:
+        r'''
+        Function to return the (n, 2) observed and simulated
+        rows read so far. The array is a view, later polls
+        only write past its end.
+        '''
+        with self._lock:
+            return self._buffer[:self._count]
@@ -0,0 +1,207 @@
+"""
+@name
+    `gui_lod.py`
+
+@description
+    `src file for level-of-detail downsampling of long curves: min/max pyramids refetched on zoom`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+from __future__ import annotations
+
+import weakref
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, size: int) -> tuple:
+    r'''
+    Function to keep the minimum and the maximum, in
+    index order, of every `size` consecutive points, so
+    peaks and troughs survive the downsampling. NaNs are
+    only kept where a whole bin is NaN.
+    '''
+    n = len(x) // size * size
+    idx = []
+    for start, rows in ((0, y[:n].reshape(-1, size)), (n, y[n:].reshape(1, -1))):
+        if rows.size == 0:
+            continue
+        low = np.where(np.isnan(rows), np.inf, rows).argmin(axis=1)
+        high = np.where(np.isnan(rows), -np.inf, rows).argmax(axis=1)
+        base = start + np.arange(len(rows)) * size
+        idx.append(np.column_stack([base + np.minimum(low, high), base + np.maximum(low, high)]).ravel())
+    idx = np.concatenate(idx)
+    return x[idx], y[idx]
+
+
+def band_envelope(x: np.ndarray, lower: np.ndarray, upper: np.ndarray, bins: int) -> tuple:
+    r'''
+    Function to reduce a band to at most `bins` points,
+    the lowest `lower` and highest `upper` of every bin,
+    so the band never looks narrower than it is.
+    '''
+    size = -(-len(x) // max(bins, 1))
+    if size <= 1:
+        return x, lower, upper
+    n = -(-len(x) // size) * size
+    pad = n - len(x)
+    lower = np.concatenate([lower, np.full(pad, np.nan)]).reshape(-1, size)
+    upper = np.concatenate([upper, np.full(pad, np.nan)]).reshape(-1, size)
+    return x[::size], np.nanmin(lower, axis=1), np.nanmax(upper, axis=1)
+
+
+class LODPyramid(object):
+    r'''
+    Class holding a curve at full resolution and at
+    coarser min/max levels, each `factor` times smaller,
+    down to about `leaf` points. `view` returns the finest
+    level that fits the visible range into the point budget.
+
+    Usage:
+        >>> pyramid = LODPyramid(time, concentration)
+        >>> x, y = pyramid.view(10.0, 20.0, budget=2400)
+    '''
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, factor: int = 4, leaf: int = 1024):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.levels = [(x, y)]
+        # Unsorted x (not a time series) cannot be sliced by range, it stays at full resolution.
+        self.sorted = len(x) < 2 or bool(np.all(np.diff(x) >= 0))
+        while self.sorted and len(self.levels[-1][0]) > leaf:
+            self.levels.append(minmax_decimate(*self.levels[-1], 2 * factor))
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    def view(self, xmin: float, xmax: float, budget: int) -> tuple:
+        r'''
+        Function to return the points of the finest level
+        with at most `budget` points between `xmin` and
+        `xmax`, plus one on each side so the line runs
+        through the edges of the view.
+        '''
+        if not self.sorted:
+            return self.levels[0]
+        for x, y in self.levels:
+            start = max(np.searchsorted(x, xmin, side="left") - 1, 0)
+            stop = np.searchsorted(x, xmax, side="right") + 1
+            if stop - start <= budget:
+                break
+        return x[start:stop], y[start:stop]
+
+    def extent(self):
+        x, y = self.levels[-1]
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.any():
+            return None
+        x, y = x[finite], y[finite]
+        return np.array([[x.min(), y.min()], [x.max(), y.max()]])
+
+
+class LevelOfDetail(object):
+    r'''
+    Class to draw the lines and scatters of one axes at
+    screen resolution: curves longer than `threshold`
+    points get a <LODPyramid> and are refetched from it
+    whenever the x limits change (zoom and pan of the
+    navigation toolbar). Use <level_of_detail> to get the
+    instance of an axes.
+
+    Usage:
+        >>> lod = level_of_detail(ax)
+        >>> line, = ax.plot([], [])
+        >>> lod.set(line, time, concentration)
+    '''
+
+    # Points drawn per horizontal pixel of the axes.
+    POINTS_PER_PIXEL = 4
+
+    def __init__(self, ax, threshold: int = 5000):
+        # Weak references only, <level_of_detail> must not keep cleared axes alive.
+        self._ax = weakref.ref(ax)
+        self.threshold = threshold
+        self.callbacks = ax.callbacks
+        self._pyramids = weakref.WeakKeyDictionary()
+        ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
+    def budget(self) -> int:
+        return max(int(self._ax().bbox.width), 100) * self.POINTS_PER_PIXEL
+
+    def set(self, artist, x, y) -> None:
+        r'''
+        Function to give `artist` (Line2D or PathCollection)
+        the curve `x`, `y`, downsampled when it is long. The
+        artist is left untouched when the curve is unchanged.
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        pyramid = self._pyramids.get(artist)
+        if pyramid is not None and np.array_equal(pyramid.levels[0][0], x) and np.array_equal(pyramid.levels[0][1], y, equal_nan=True):
+            return
+
+        if len(x) > self.threshold:
+            pyramid = self._pyramids[artist] = LODPyramid(x, y)
+            # Full range first: the caller autoscales, which then refetches the view.
+            x, y = pyramid.view(-np.inf, np.inf, self.budget())
+        else:
+            self._pyramids[artist] = LODPyramid(x, y, leaf=len(x))
+        _set_artist_data(artist, x, y)
+
+    def discard(self, artist) -> None:
+        r'''
+        Function to stop managing `artist`, whose data is
+        then set directly (e.g. while a run is streamed).
+        '''
+        self._pyramids.pop(artist, None)
+
+    def extent(self):
+        r'''
+        Function to return the data limits of the full
+        resolution curves, None when there is none.
+        '''
+        extents = [pyramid.extent() for artist, pyramid in self._pyramids.items() if artist.axes is self._ax()]
+        extents = [extent for extent in extents if extent is not None]
+        if not extents:
+            return None
+        extents = np.array(extents)
+        return np.array([np.nanmin(extents[:, 0], axis=0), np.nanmax(extents[:, 1], axis=0)])
+
+    def _on_xlim_changed(self, ax):
+        xmin, xmax = sorted(ax.get_xlim())
+        budget = self.budget()
+        for artist, pyramid in list(self._pyramids.items()):
+            if len(pyramid.levels) > 1 and artist.axes is ax:
+                _set_artist_data(artist, *pyramid.view(xmin, xmax, budget))
+
+
+def _set_artist_data(artist, x, y) -> None:
+    if hasattr(artist, "set_offsets"):
+        artist.set_offsets(np.column_stack([x, y]))
+    else:
+        artist.set_data(x, y)
+
+
+_MANAGERS = weakref.WeakKeyDictionary()
+
+
+def level_of_detail(ax) -> LevelOfDetail:
+    r'''
+    Function to return the <LevelOfDetail> of `ax`, a new
+    one when the axes were cleared since (clearing drops
+    their callbacks and artists).
+    '''
+    lod = _MANAGERS.get(ax)
+    if lod is None or lod.callbacks is not ax.callbacks:
+        lod = _MANAGERS[ax] = LevelOfDetail(ax)
+    return lod
@@ -23,7 +23,9 @@ r'''
 Customary main.py 
 to run the GUI, uses GUIMain class from gui_func.py
 '''
+from gui_lazy import STARTUP
 from gui_func import GUIMain
+STARTUP.mark("imports")
 
 def main_loop():
     
@@ -32,7 +34,7 @@ def main_loop():
     flag = False
 
     while True:
-        event, values = GUI.window.read(timeout=50)
+        event, values = GUI.window.read(timeout=GUI.read_timeout)
 
         if event == GUI.WIN_CLOSED:
             break
@@ -64,6 +66,59 @@ def main_loop():
             GUI.refresh()
         elif event == "PE/FM":
             GUI.run_parameter_estimation()
+        elif event == "-SWEEP-":
+            GUI.run_parameter_sweep()
+        elif event == "-SENSITIVITY-":
+            GUI.run_sensitivity_analysis()
+        elif event == "-SENSITIVITY-DONE-":
+            GUI.on_sensitivity_done(values[event])
+        elif event == "-COMPARE-":
+            GUI.compare_all_modes()
+        elif event == "-COMPARE-DONE-":
+            GUI.on_compare_done(values[event])
+        elif event == "-ENSEMBLE-":
+            GUI.run_uncertainty_ensemble()
+        elif event == "-ENSEMBLE-DONE-":
+            GUI.on_ensemble_done(values[event])
+        elif event == "-GRID-":
+            GUI.run_grid_study()
+        elif event == "-GRID-DONE-":
+            GUI.on_grid_done(values[event])
+        elif event == "-TABLE-PREV-":
+            GUI.turn_table_page(-1)
+        elif event == "-TABLE-NEXT-":
+            GUI.turn_table_page(1)
+        elif event == "-TABLE-GOTO-":
+            GUI.goto_table_row(values["-TABLE-ROW-"])
+        elif event == "-TABLE-FIND-":
+            GUI.find_in_table(values["-TABLE-SEARCH-"], values["-BASE-VALUE-TABLE-"])
+        elif event == "-BASE-VALUE-TABLE-+EDIT":
+            if values["-BASE-VALUE-TABLE-"]:
+                GUI.edit_table_cells("-BASE-VALUE-TABLE-", GUI._table_start + values["-BASE-VALUE-TABLE-"][0])
+        elif event == "-TABS-":
+            GUI.on_tab_selected(values[event])
+        elif event == "-CANCEL-":
+            GUI.cancel_jobs()
+        elif event == "-LOG-":
+            print(values[event])
+        elif event == "-RUN-PROGRESS-":
+            GUI.on_run_progress()
+        elif event == "-PLOT-RENDERED-":
+            GUI.on_plot_rendered(values[event])
+        elif isinstance(event, str) and event.endswith("+INTERACT"):
+            GUI.make_interactive(event[:-len("+INTERACT")])
+        elif event == "-RUN-DONE-":
+            GUI.on_run_done(values[event])
+        elif event == "-PE-BOUNDS-":
+            GUI.on_pe_bounds()
+        elif event == "-PE-DONE-":
+            GUI.on_pe_done()
+        elif event == "-PE-FAILED-":
+            GUI.on_pe_failed()
+        elif event == "-PE-PROGRESS-":
+            GUI.on_pe_progress()
+        elif event == "-LOG-LINES-":
+            GUI.flush_log()
 
         if event == "-SEARCH-":
             GUI.refresh_search_list(values['-SEARCH-'])
@@ -76,17 +131,12 @@ def main_loop():
             flag = True
             break
 
-        if GUI.is_processing:
-            GUI.PopupAnimated(GUI.DEFAULT_BASE64_LOADING_GIF, background_color='green', transparent_color='green')
-            GUI.freeze_buttons()
-        else:
-            GUI.PopupAnimated(None)
-            GUI.unfreeze_buttons()
+        GUI.update_busy_state()
 
         if event in ("-TIMESTAMP-COPY-", "-BASE-COPY-"):
             GUI.import_data(event)
         
-    GUI.window.close()
+    GUI.close()
     if flag:
         del GUI
         main_loop()
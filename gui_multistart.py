@@ -0,0 +1,248 @@
+"""
+@name
+    `gui_multistart.py`
+
+@description
+    `src file for multi-start calibration from Latin-hypercube starting points`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import re
+import time
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from gui_pestfile import TemplateFile, ControlFile
+from gui_estimator import LevenbergMarquardt, EstimationError, EstimationCancelled, write_record
+
+
+# Bounds at PESTGEN's +/-1E10 defaults leave nothing to sample from.
+MAX_BOUND = 1.0e9
+
+_PHI = re.compile(r"Sum of squared weighted residuals \(ie phi\)\s*=\s*([-+0-9.EeDd]+)")
+
+
+def latin_hypercube(samples: int, lower: np.ndarray, upper: np.ndarray, seed: int = None) -> np.ndarray:
+    r'''
+    Function to draw `samples` Latin-hypercube points in the
+    box [lower, upper]: every parameter range is split into
+    `samples` strata and each stratum is used exactly once.
+    Ranges of positive parameters spanning more than two
+    decades are sampled on a log scale.
+
+    Returns a (samples, n_parameters) array.
+    '''
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    if np.any(~np.isfinite(lower)) or np.any(~np.isfinite(upper)) or np.any(np.abs(np.concatenate([lower, upper])) >= MAX_BOUND):
+        raise ValueError("Multi-start needs finite parameter bounds below {:G} in magnitude".format(MAX_BOUND))
+    if np.any(lower >= upper):
+        raise ValueError("Every lower bound must be below its upper bound")
+
+    rng = np.random.default_rng(seed)
+    n = len(lower)
+    strata = np.argsort(rng.random((samples, n)), axis=0)
+    unit = (strata + rng.random((samples, n))) / samples
+
+    logarithmic = (lower > 0) & (upper / np.where(lower > 0, lower, 1.0) > 100.0)
+    linear = lower + unit * (upper - lower)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_scaled = np.exp(np.log(np.where(logarithmic, lower, 1.0)) + unit * np.log(np.where(logarithmic, upper / lower, 1.0)))
+    return np.where(logarithmic, log_scaled, linear)
+
+
+def read_estimation_result(record_path: str) -> dict:
+    r'''
+    Function to read the final phi, the estimated
+    parameter values and their 95% confidence limits
+    from a run record written by `pest.exe` or by
+    <gui_estimator.write_record>.
+    '''
+    with open(record_path, "r") as f:
+        text = f.read()
+
+    phis = _PHI.findall(text)
+    phi = float(phis[-1].replace("D", "E").replace("d", "e")) if phis else float("nan")
+
+    parameters = OrderedDict()
+    limits = OrderedDict()
+    lines = text.splitlines()
+    for idx, line in enumerate(lines):
+        if line.strip() == "Parameters ----->":
+            for row in lines[idx + 1:]:
+                fields = row.split()
+                if "----->" in row:
+                    break
+                if len(fields) >= 2 and fields[0] not in ("Parameter", "value", "Note:"):
+                    try:
+                        parameters[fields[0]] = float(fields[1])
+                    except ValueError:
+                        continue
+                    try:
+                        limits[fields[0]] = (float(fields[2]), float(fields[3]))
+                    except (ValueError, IndexError):
+                        pass
+    return {"phi": phi, "parameters": parameters, "limits": limits}
+
+
+def _prepare_start(workspace, pst: ControlFile, values: dict, index: int) -> str:
+    path = workspace.file("start-{}".format(index))
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    for name in ("in_1.tpl", "output.ins", "in_2.dat", "in_3.dat", "test.exe", "output.dat"):
+        if os.path.exists(workspace.file(name)):
+            shutil.copy(workspace.file(name), os.path.join(path, name))
+    for name, value in values.items():
+        pst.parameters[name]["value"] = value
+    pst.write(os.path.join(path, "test.pst"))
+    TemplateFile.read(workspace.file("in_1.tpl")).write_model_input(os.path.join(path, "in_1.dat"), values)
+    return path
+
+
+def run_pest_starts(supervisor, app_dir: str, workspace, pst: ControlFile, starts: np.ndarray, timeout: float = None,
+                    log=print, cancel_event=None) -> list:
+    r'''
+    Function to run one `pest.exe` per starting point, each
+    in its own `start-<i>` directory of the session workspace,
+    concurrently under the process supervisor.
+
+    Returns one result dict per start (see `read_estimation_result`),
+    with phi NaN for failed starts.
+    '''
+    names = list(pst.parameters.keys())
+    jobs = []
+    for index, row in enumerate(starts, start=1):
+        path = _prepare_start(workspace, pst, OrderedDict(zip(names, map(float, row))), index)
+        jobs.append((index, path, supervisor.submit([os.path.join(app_dir, "pest.exe"), "test"], cwd=path, timeout=timeout,
+                                                    name="PEST start {}".format(index))))
+
+    results = []
+    for index, path, job in jobs:
+        while not job.wait(0.5).done():
+            if cancel_event is not None and cancel_event.is_set():
+                for _, _, pending in jobs:
+                    supervisor.cancel(pending)
+                raise EstimationCancelled("Multi-start cancelled")
+        record = os.path.join(path, "test.rec")
+        if job.ok and os.path.exists(record):
+            result = read_estimation_result(record)
+        else:
+            result = {"phi": float("nan"), "parameters": OrderedDict()}
+        result.update({"start": index, "initial": OrderedDict(zip(names, map(float, starts[index - 1]))), "record": record})
+        log(">>> [INFO] Multi-start {}/{} finished with phi = {}".format(index, len(jobs), result["phi"]))
+        results.append(result)
+    return results
+
+
+def run_native_starts(workspace, pst: ControlFile, starts: np.ndarray, keys: dict, variable_dictionary: dict,
+                      exe_file_path: str = None, engine: str = "Executable", workers: int = None, log=print, cancel_event=None) -> list:
+    r'''
+    Function to run one <LevenbergMarquardt> per starting
+    point concurrently. All estimators share one process pool;
+    every model run gets its own workspace and every start
+    writes its record to its own `start-<i>` directory.
+    '''
+    names = list(pst.parameters.keys())
+    lower = [p["lower"] for p in pst.parameters.values()]
+    upper = [p["upper"] for p in pst.parameters.values()]
+    observed = [o["value"] for o in pst.observations.values()]
+    input_paths = [workspace.file("in_1.dat"), workspace.file("in_2.dat"), workspace.file("in_3.dat")]
+
+    def estimate(index, row, pool):
+        path = workspace.file("start-{}".format(index))
+        if not os.path.exists(path):
+            os.makedirs(path)
+        estimator = LevenbergMarquardt([keys[name] for name in names], names, row, lower, upper, observed, variable_dictionary,
+                                       input_paths, exe_file_path, workers=workers, engine=engine, log=lambda *args: None,
+                                       cancel_event=cancel_event, pool=pool)
+        initial = OrderedDict(zip(names, map(float, row)))
+        try:
+            result = estimator.run()
+        except EstimationError as e:
+            log(" >>> [ERROR] Multi-start {} failed: {}".format(index, e))
+            return {"phi": float("nan"), "parameters": OrderedDict(), "start": index, "initial": initial, "record": None}
+        record = os.path.join(path, "test.rec")
+        write_record(record, result)
+        log(">>> [INFO] Multi-start {}/{} finished with phi = {:.6G}".format(index, len(starts), result["phi"]))
+        return {"phi": result["phi"], "parameters": OrderedDict(zip(names, map(float, result["values"]))),
+                "start": index, "initial": initial, "record": record}
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        with ThreadPoolExecutor(max_workers=len(starts)) as threads:
+            futures = [threads.submit(estimate, index, row, pool) for index, row in enumerate(starts, start=1)]
+            return [future.result() for future in futures]
+
+
+def summarize(results: list, names: list) -> str:
+    r'''
+    Function to rank the starts by final phi and return the
+    summary table, followed by the spread of every parameter
+    over the starts that reached the best phi within 1%.
+    '''
+    ranked = sorted(results, key=lambda x: (np.isnan(x["phi"]), x["phi"]))
+    lines = ["Multi-start results ----->", "",
+             " {:<5}{:<7}{:<14}".format("Rank", "Start", "Phi") + "".join("{:<14}".format(name) for name in names)]
+    for rank, result in enumerate(ranked, start=1):
+        values = [result["parameters"].get(name, float("nan")) for name in names]
+        lines.append(" {:<5}{:<7}{:<14.6G}".format(rank, result["start"], result["phi"]) + "".join("{:<14.6G}".format(x) for x in values))
+
+    finite = [x for x in ranked if np.isfinite(x["phi"])]
+    if finite:
+        best = finite[0]["phi"]
+        close = [x for x in finite if x["phi"] <= best * 1.01 + 1e-300]
+        lines += ["", " {} of {} starts reached the best phi within 1%".format(len(close), len(results)), "",
+                  " {:<14}{:<14}{:<14}{:<14}".format("Parameter", "Minimum", "Maximum", "Rel. spread")]
+        for name in names:
+            values = np.array([x["parameters"].get(name, np.nan) for x in finite], dtype=np.float64)
+            low, high = np.nanmin(values), np.nanmax(values)
+            spread = (high - low) / abs(finite[0]["parameters"].get(name, np.nan)) if finite[0]["parameters"].get(name) else np.nan
+            lines.append(" {:<14}{:<14.6G}{:<14.6G}{:<14.3G}".format(name, low, high, spread))
+    return "\n".join(lines) + "\n"
+
+
+def run_multistart(pipeline, context: dict, workspace, starts: int) -> list:
+    r'''
+    Function to draw `starts` Latin-hypercube starting points
+    inside the bounds of test.pst, estimate from each of them
+    with the engine of `context["engine"]`, write the ranked
+    summary to multistart.txt and copy the record of the best
+    start to test.rec.
+    '''
+    pst = ControlFile.read(workspace.file("test.pst"))
+    names = list(pst.parameters.keys())
+    points = latin_hypercube(starts, [p["lower"] for p in pst.parameters.values()], [p["upper"] for p in pst.parameters.values()])
+    pipeline.log(">>> [INFO] Multi-start calibration from {} Latin-hypercube points".format(starts))
+    start = time.time()
+
+    if context.get("engine") == "Native LM":
+        keys = {alias: key for key, alias in context["aliases"]}
+        exe_file_path = workspace.file("test.exe") if os.path.exists(workspace.file("test.exe")) else None
+        results = run_native_starts(workspace, pst, points, keys, context["variable_dictionary"], exe_file_path,
+                                    engine=context.get("model_engine", "Executable"), workers=context.get("workers"),
+                                    log=pipeline.log, cancel_event=context.get("cancel_event"))
+    else:
+        results = run_pest_starts(pipeline.supervisor, pipeline.app_dir, workspace, pst, points, timeout=context.get("timeout"),
+                                  log=pipeline.log, cancel_event=context.get("cancel_event"))
+
+    with open(workspace.file("multistart.txt"), "w") as f:
+        f.write(summarize(results, names))
+    finite = sorted([x for x in results if np.isfinite(x["phi"])], key=lambda x: x["phi"])
+    if not finite:
+        raise EstimationError("None of the {} starts finished".format(starts))
+    shutil.copy(finite[0]["record"], workspace.file("test.rec"))
+    pipeline.log(">>> [INFO] Multi-start finished in {:.2f}s, best phi = {:.6G} from start {}".format(
+        time.time() - start, finite[0]["phi"], finite[0]["start"]))
+    return results
@@ -0,0 +1,99 @@
+"""
+@name
+    `gui_pest.py`
+
+@description
+    `src file for parsing PEST screen output into convergence progress`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import re
+
+
+_NUMBER = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?)"
+_ITERATION = re.compile(r"OPTIMISATION ITERATION NO\.\s*:\s*(\d+)")
+_STARTING_PHI = re.compile(r"Starting phi for this iteration\s*:\s*" + _NUMBER)
+_LAMBDA = re.compile(r"Lambda\s*=\s*" + _NUMBER)
+_PHI = re.compile(r"^\s*Phi\s*=\s*" + _NUMBER)
+
+
+def _to_float(text: str) -> float:
+    return float(text.replace("D", "E").replace("d", "e"))
+
+
+class PestProgressParser(object):
+    r'''
+    Class to follow the screen output of `pest.exe` line by
+    line and extract, per optimisation iteration, the starting
+    phi and the Marquardt lambda trials with their phi.
+
+    `feed` returns True whenever a line changed the progress,
+    `records` then holds one dict per iteration with the keys
+    iteration, starting_phi, lambdas, phis, best_phi and best_lambda.
+
+    Usage:
+        >>> parser = PestProgressParser()
+        >>> for line in lines:
+                if parser.feed(line):
+                    redraw(parser.records)
+    '''
+
+    def __init__(self):
+        self.records = []
+        self._lambda = None
+
+    @property
+    def current(self) -> dict:
+        return self.records[-1] if self.records else None
+
+    def feed(self, line: str) -> bool:
+        match = _ITERATION.search(line)
+        if match:
+            self.records.append({"iteration": int(match.group(1)), "starting_phi": None, "lambdas": [], "phis": [],
+                                 "best_phi": None, "best_lambda": None})
+            self._lambda = None
+            return True
+
+        if self.current is None:
+            return False
+
+        match = _STARTING_PHI.search(line)
+        if match:
+            self.current["starting_phi"] = _to_float(match.group(1))
+            if self.current["best_phi"] is None:
+                self.current["best_phi"] = self.current["starting_phi"]
+            return True
+
+        match = _LAMBDA.search(line)
+        if match:
+            self._lambda = _to_float(match.group(1))
+            return False
+
+        match = _PHI.search(line)
+        if match:
+            phi = _to_float(match.group(1))
+            self.current["lambdas"].append(self._lambda)
+            self.current["phis"].append(phi)
+            if self.current["best_phi"] is None or phi < self.current["best_phi"]:
+                self.current["best_phi"] = phi
+                self.current["best_lambda"] = self._lambda
+            return True
+
+        return False
+
+    def summary(self) -> str:
+        r'''
+        Function to return a one line status
+        of the latest iteration for the log.
+        '''
+        record = self.current
+        if record is None:
+            return ""
+        return ">>> [INFO] PEST iteration {}: phi = {}, lambda = {}".format(
+            record["iteration"], record["best_phi"], record["best_lambda"])
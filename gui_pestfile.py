@@ -0,0 +1,402 @@
+"""
+@name
+    `gui_pestfile.py`
+
+@description
+    `src file for building, reading and validating PEST input files in-process`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import re
+from collections import OrderedDict
+
+
+MAX_NAME_LENGTH = 12
+
+
+class PestFileError(ValueError):
+    r'''
+    Exception raised for syntax or consistency
+    errors in PEST input files.
+    '''
+
+
+def _check_name(name: str, kind: str) -> str:
+    if not name or len(name) > MAX_NAME_LENGTH or re.search(r"\s", name):
+        raise PestFileError("Invalid {} name '{}' (1-{} characters, no blanks)".format(kind, name, MAX_NAME_LENGTH))
+    return name.lower()
+
+
+def format_value(value: float, width: int) -> str:
+    r'''
+    Function to write `value` with as many significant digits
+    as fit into `width` characters, the way PEST fills a
+    template parameter space.
+    '''
+    candidates = [repr(float(value))]
+    for precision in range(width, 0, -1):
+        candidates.append("{:.{}G}".format(value, precision))
+        exponent = "{:.{}E}".format(value, max(precision - 1, 0))
+        candidates.append(re.sub(r"E([-+])0*(\d)", r"E\1\2", exponent))
+    for text in candidates:
+        if len(text) <= width:
+            return text.rjust(width)
+    raise PestFileError("Value {} does not fit into a parameter space of width {}".format(value, width))
+
+
+def format_number(value: float) -> str:
+    return "{:.10G}".format(float(value))
+
+
+class TemplateFile(object):
+    r'''
+    Class for a PEST template file (`ptf`). Parameter spaces
+    are delimited by `delimiter` and their width is the width
+    of the number written into the model input file.
+
+    Usage:
+        >>> template = TemplateFile.read("in_1.tpl")
+        >>> template.parameters
+        >>> template.write_model_input("in_1.dat", {"qs": 0.26, "qf": 0.36})
+    '''
+
+    def __init__(self, lines: list, delimiter: str = "#"):
+        self.delimiter = delimiter
+        self.lines = lines
+        self.parameters = self._parse()
+
+    @classmethod
+    def read(cls, path: str):
+        with open(path, "r") as f:
+            header = f.readline().split()
+            lines = f.read().splitlines()
+        if len(header) != 2 or header[0].lower() != "ptf" or len(header[1]) != 1:
+            raise PestFileError("{}: first line must be 'ptf <delimiter>'".format(path))
+        return cls(lines, header[1])
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write("ptf {}\n".format(self.delimiter))
+            f.write("\n".join(self.lines))
+
+    def _spaces(self, line: str, number: int) -> list:
+        positions = [idx for idx, char in enumerate(line) if char == self.delimiter]
+        if len(positions) % 2:
+            raise PestFileError("Template line {}: unbalanced parameter delimiters".format(number))
+        spaces = []
+        for start, end in zip(positions[::2], positions[1::2]):
+            name = line[start + 1:end].strip()
+            spaces.append((start, end + 1, _check_name(name, "parameter")))
+        return spaces
+
+    def _parse(self) -> list:
+        parameters = []
+        for number, line in enumerate(self.lines, start=2):
+            for _, _, name in self._spaces(line, number):
+                if name not in parameters:
+                    parameters.append(name)
+        return parameters
+
+    def render(self, values: dict) -> str:
+        r'''
+        Function to return the model input file with every
+        parameter space replaced by its value.
+        '''
+        values = {name.lower(): value for name, value in values.items()}
+        missing = [name for name in self.parameters if name not in values]
+        if missing:
+            raise PestFileError("No value for template parameters: {}".format(", ".join(missing)))
+
+        rendered = []
+        for number, line in enumerate(self.lines, start=2):
+            pieces, last = [], 0
+            for start, end, name in self._spaces(line, number):
+                pieces.append(line[last:start])
+                pieces.append(format_value(values[name], end - start))
+                last = end
+            pieces.append(line[last:])
+            rendered.append("".join(pieces))
+        return "\n".join(rendered)
+
+    def write_model_input(self, path: str, values: dict) -> None:
+        with open(path, "w") as f:
+            f.write(self.render(values))
+
+
+_INSTRUCTION = re.compile(r"l(\d+)|\(([^)]+)\)(\d+):(\d+)|\[([^\]]+)\](\d+):(\d+)|!([^!]+)!|w", re.IGNORECASE)
+
+
+class InstructionFile(object):
+    r'''
+    Class for a PEST instruction file (`pif`). Supported
+    instructions are line advance `l<n>`, whitespace `w`,
+    semi-fixed `(obs)c1:c2`, fixed `[obs]c1:c2` and
+    non-fixed `!obs!` observations.
+
+    Usage:
+        >>> instructions = InstructionFile.read("output.ins")
+        >>> instructions.observations
+        >>> instructions.extract("output.dat")
+    '''
+
+    def __init__(self, lines: list, marker: str = "#"):
+        self.marker = marker
+        self.lines = lines
+        self.instructions = self._parse()
+        self.observations = [item[1] for item in self.instructions if item[0] == "obs"]
+        if len(set(self.observations)) != len(self.observations):
+            raise PestFileError("Instruction file reads an observation more than once")
+
+    @classmethod
+    def read(cls, path: str):
+        with open(path, "r") as f:
+            header = f.readline().split()
+            lines = f.read().splitlines()
+        if len(header) != 2 or header[0].lower() != "pif" or len(header[1]) != 1:
+            raise PestFileError("{}: first line must be 'pif <marker>'".format(path))
+        return cls(lines, header[1])
+
+    @classmethod
+    def for_columns(cls, names: list, first: int, last: int):
+        r'''
+        Function to build the instructions reading observation
+        `names[i]` from columns first..last of line i.
+        '''
+        return cls(["l1 ({}){}:{}".format(name, first, last) for name in names])
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write("pif {}\n".format(self.marker))
+            f.write("\n".join(self.lines))
+
+    def _parse(self) -> list:
+        instructions = []
+        for number, line in enumerate(self.lines, start=2):
+            for token in line.split():
+                match = _INSTRUCTION.fullmatch(token)
+                if match is None:
+                    raise PestFileError("Instruction line {}: cannot interpret '{}'".format(number, token))
+                if match.group(1):
+                    instructions.append(("line", int(match.group(1))))
+                elif match.group(2):
+                    first, last = int(match.group(3)), int(match.group(4))
+                    if first < 1 or last < first:
+                        raise PestFileError("Instruction line {}: bad column range in '{}'".format(number, token))
+                    instructions.append(("obs", _check_name(match.group(2), "observation"), first, last))
+                elif match.group(5):
+                    first, last = int(match.group(6)), int(match.group(7))
+                    if first < 1 or last < first:
+                        raise PestFileError("Instruction line {}: bad column range in '{}'".format(number, token))
+                    instructions.append(("obs", _check_name(match.group(5), "observation"), first, last))
+                elif match.group(8):
+                    instructions.append(("obs", _check_name(match.group(8), "observation"), None, None))
+                else:
+                    instructions.append(("space",))
+        return instructions
+
+    def extract(self, output_file_path: str) -> OrderedDict:
+        r'''
+        Function to read the observation values
+        from a model output file.
+        '''
+        with open(output_file_path, "r") as f:
+            lines = f.read().splitlines()
+
+        values = OrderedDict()
+        row, cursor = -1, 0
+        for item in self.instructions:
+            if item[0] == "line":
+                row += item[1]
+                cursor = 0
+                if row >= len(lines):
+                    raise PestFileError("{}: unexpected end of file".format(output_file_path))
+                continue
+            line = lines[row] if 0 <= row < len(lines) else ""
+            if item[0] == "space":
+                while cursor < len(line) and line[cursor].isspace():
+                    cursor += 1
+                continue
+            name, first, last = item[1], item[2], item[3]
+            if first is None:
+                match = re.compile(r"\s*(\S+)").match(line, cursor)
+                text = match.group(1) if match else ""
+                cursor = match.end() if match else len(line)
+            else:
+                text = line[first - 1:last]
+                cursor = last
+            try:
+                values[name] = float(text.strip().replace("D", "E").replace("d", "e"))
+            except ValueError:
+                raise PestFileError("{} line {}: cannot read observation '{}' from '{}'".format(output_file_path, row + 1, name, text))
+        return values
+
+
+class ControlFile(object):
+    r'''
+    Class for a PEST control file (`pcf`) held as structured
+    data: control settings, parameter groups, parameters,
+    observation groups, observations, model command line and
+    template/instruction file pairs.
+
+    Usage:
+        >>> pst = ControlFile.build(parameters, observations)
+        >>> pst.parameters["qf"]["lower"] = 0.0
+        >>> pst.validate([TemplateFile.read("in_1.tpl")], [InstructionFile.read("output.ins")])
+        >>> pst.write("test.pst")
+    '''
+
+    DEFAULT_CONTROL = [
+        ["restart", "estimation"],
+        None,
+        None,
+        ["5.0", "2.0", "0.3", "0.03", "10"],
+        ["3.0", "3.0", "0.001"],
+        ["0.1"],
+        ["30", "0.01", "3", "3", "0.01", "3"],
+        ["1", "1", "1"],
+    ]
+
+    def __init__(self):
+        self.control = []
+        self.parameter_groups = OrderedDict()
+        self.parameters = OrderedDict()
+        self.observation_groups = []
+        self.observations = OrderedDict()
+        self.command = "test"
+        self.templates = []
+        self.instructions = []
+
+    @classmethod
+    def build(cls, parameters: OrderedDict, observations: OrderedDict, command: str = "test",
+              templates: list = (("in_1.tpl", "in_1.dat"),), instructions: list = (("output.ins", "output.dat"),)):
+        r'''
+        Function to create a control file with the defaults
+        PESTGEN uses: one group per parameter, no transformation,
+        relative change limit and bounds of -1E10 / 1E10.
+        `parameters` maps name to initial value, `observations`
+        maps name to measured value.
+        '''
+        pst = cls()
+        for name, value in parameters.items():
+            name = _check_name(name, "parameter")
+            pst.parameter_groups[name] = ["relative", "0.01", "0.0", "switch", "2.0", "parabolic"]
+            pst.parameters[name] = {"transform": "none", "change_limit": "relative", "value": float(value),
+                                    "lower": -1.0e10, "upper": 1.0e10, "group": name, "scale": 1.0, "offset": 0.0, "dercom": 1}
+        pst.observation_groups = ["obsgroup"]
+        for name, value in observations.items():
+            pst.observations[_check_name(name, "observation")] = {"value": float(value), "weight": 1.0, "group": "obsgroup"}
+        pst.command = command
+        pst.templates = [list(x) for x in templates]
+        pst.instructions = [list(x) for x in instructions]
+        pst.control = [list(x) if x else None for x in cls.DEFAULT_CONTROL]
+        return pst
+
+    def _counts(self) -> list:
+        return [
+            [str(len(self.parameters)), str(len(self.observations)), str(len(self.parameter_groups)), "0", str(len(self.observation_groups))],
+            [str(len(self.templates)), str(len(self.instructions)), "single", "point", "1", "0", "0"],
+        ]
+
+    @classmethod
+    def read(cls, path: str):
+        sections = OrderedDict()
+        current = None
+        with open(path, "r") as f:
+            if f.readline().strip().lower() != "pcf":
+                raise PestFileError("{}: first line must be 'pcf'".format(path))
+            for line in f.read().splitlines():
+                if line.strip().startswith("*"):
+                    current = line.strip().lstrip("*").strip().lower()
+                    sections[current] = []
+                elif current is not None and line.strip():
+                    sections[current].append(line.split())
+
+        pst = cls()
+        pst.control = sections.get("control data", [])
+        for row in sections.get("parameter groups", []):
+            pst.parameter_groups[row[0].lower()] = row[1:]
+        for row in sections.get("parameter data", []):
+            if len(row) < 10:
+                raise PestFileError("{}: incomplete parameter data line '{}'".format(path, " ".join(row)))
+            pst.parameters[row[0].lower()] = {"transform": row[1], "change_limit": row[2], "value": float(row[3]),
+                                              "lower": float(row[4]), "upper": float(row[5]), "group": row[6].lower(),
+                                              "scale": float(row[7]), "offset": float(row[8]), "dercom": int(row[9])}
+        pst.observation_groups = [row[0].lower() for row in sections.get("observation groups", [])]
+        for row in sections.get("observation data", []):
+            if len(row) < 4:
+                raise PestFileError("{}: incomplete observation data line '{}'".format(path, " ".join(row)))
+            pst.observations[row[0].lower()] = {"value": float(row[1]), "weight": float(row[2]), "group": row[3].lower()}
+        command = sections.get("model command line", [])
+        pst.command = " ".join(command[0]) if command else ""
+        pairs = sections.get("model input/output", [])
+        pst.templates = [row[:2] for row in pairs if not row[0].lower().endswith(".ins")]
+        pst.instructions = [row[:2] for row in pairs if row[0].lower().endswith(".ins")]
+        return pst
+
+    def write(self, path: str) -> None:
+        control = list(self.control) if self.control else [list(x) if x else None for x in self.DEFAULT_CONTROL]
+        control[1:3] = self._counts()
+
+        lines = ["pcf", "* control data"]
+        lines += ["  ".join(row) for row in control]
+        lines.append("* parameter groups")
+        lines += ["  ".join([name] + values) for name, values in self.parameter_groups.items()]
+        lines.append("* parameter data")
+        for name, p in self.parameters.items():
+            lines.append("  ".join([name, p["transform"], p["change_limit"], format_number(p["value"]), format_number(p["lower"]),
+                                    format_number(p["upper"]), p["group"], format_number(p["scale"]), format_number(p["offset"]), str(p["dercom"])]))
+        lines.append("* observation groups")
+        lines += self.observation_groups
+        lines.append("* observation data")
+        for name, o in self.observations.items():
+            lines.append("  ".join([name, format_number(o["value"]), format_number(o["weight"]), o["group"]]))
+        lines.append("* model command line")
+        lines.append(self.command)
+        lines.append("* model input/output")
+        lines += ["  ".join(pair) for pair in self.templates + self.instructions]
+
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def validate(self, templates: list = (), instructions: list = ()) -> None:
+        r'''
+        Function to check bounds and transformations and,
+        given the <TemplateFile> and <InstructionFile> objects,
+        that parameter and observation names agree.
+        Raises <PestFileError> listing every problem found.
+        '''
+        errors = []
+        for name, p in self.parameters.items():
+            if p["group"] not in self.parameter_groups:
+                errors.append("parameter '{}' belongs to unknown group '{}'".format(name, p["group"]))
+            if p["transform"] not in ("none", "log", "fixed", "tied"):
+                errors.append("parameter '{}' has unknown transformation '{}'".format(name, p["transform"]))
+            if p["lower"] >= p["upper"]:
+                errors.append("parameter '{}' lower bound {} is not below upper bound {}".format(name, p["lower"], p["upper"]))
+            elif not p["lower"] <= p["value"] <= p["upper"]:
+                errors.append("parameter '{}' initial value {} is outside [{}, {}]".format(name, p["value"], p["lower"], p["upper"]))
+            if p["transform"] == "log" and p["lower"] <= 0:
+                errors.append("log-transformed parameter '{}' needs a positive lower bound".format(name))
+        for name, o in self.observations.items():
+            if o["group"] not in self.observation_groups:
+                errors.append("observation '{}' belongs to unknown group '{}'".format(name, o["group"]))
+            if o["weight"] < 0:
+                errors.append("observation '{}' has a negative weight".format(name))
+
+        if templates:
+            in_templates = set(name for template in templates for name in template.parameters)
+            errors += ["parameter '{}' does not appear in any template".format(x) for x in self.parameters if x not in in_templates]
+            errors += ["template parameter '{}' is missing from parameter data".format(x) for x in sorted(in_templates) if x not in self.parameters]
+        if instructions:
+            in_instructions = set(name for instruction in instructions for name in instruction.observations)
+            errors += ["observation '{}' is not read by any instruction".format(x) for x in self.observations if x not in in_instructions]
+            errors += ["instruction observation '{}' is missing from observation data".format(x) for x in sorted(in_instructions) if x not in self.observations]
+
+        if errors:
+            raise PestFileError("Control file errors:\n  " + "\n  ".join(errors))
@@ -0,0 +1,295 @@
+"""
+@name
+    `gui_pipeline.py`
+
+@description
+    `src file for the staged, cached parameter-estimation pipeline`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from collections import defaultdict, OrderedDict
+from gui_pestfile import TemplateFile, InstructionFile, ControlFile, PestFileError
+from gui_estimator import LevenbergMarquardt, EstimationError, EstimationCancelled, write_record
+from gui_multistart import run_multistart
+
+
+DEFAULT_CACHE_DIR = "./.tmp/pe_cache"
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+UTILITY_TIMEOUT = 120
+
+# Variables of in_1.dat that can be estimated, with their PEST parameter names.
+PE_ALIASES = OrderedDict([
+    ("Mesopore seepage velocity", "qs"),
+    ("Macropore seepage velocity", "qf"),
+    ("Solute mass transfer rate b/w meso-micropore", "omegaim"),
+    ("Solute mass transfer rate b/w meso-macropore", "omegasf"),
+    ("Dispersivity", "alpha"),
+])
+
+
+class PipelineError(RuntimeError):
+    r'''
+    Exception raised when a pipeline stage fails.
+    '''
+
+
+class PipelineCancelled(RuntimeError):
+    r'''
+    Exception raised when the pipeline is cancelled between stages.
+    '''
+
+
+class PipelineStage(object):
+    r'''
+    Class describing one pipeline stage.
+
+    `func(pipeline, context, workspace)` does the work inside the
+    session workspace. `depends` lists the context entries the stage
+    reads and `after` the earlier stages whose outputs it consumes;
+    together they form the cache key. `outputs` are the files the
+    stage produces, restored from the cache on a hit.
+    '''
+
+    def __init__(self, name: str, func, depends: tuple = (), after: tuple = (), outputs: tuple = (), cacheable: bool = True):
+        self.name = name
+        self.func = func
+        self.depends = depends
+        self.after = after
+        self.outputs = outputs
+        self.cacheable = cacheable
+
+
+class EstimationPipeline(object):
+    r'''
+    Class to run a sequence of <PipelineStage> in a session
+    workspace, logging status and timing per stage and reusing
+    the outputs of stages whose inputs did not change.
+
+    Usage:
+        >>> pipeline = EstimationPipeline(supervisor, APP_DIR)
+        >>> pipeline.run(PREPARE_STAGES, context, workspace)
+    '''
+
+    def __init__(self, supervisor, app_dir: str, cache_dir: str = DEFAULT_CACHE_DIR, utility_timeout: float = None, log=print):
+        self.supervisor = supervisor
+        self.app_dir = app_dir
+        self.cache_dir = cache_dir
+        self.utility_timeout = utility_timeout
+        self.log = log
+        self.keys = {}
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def run_utility(self, workspace, name: str, *args, timeout: float = None, on_line=None):
+        r'''
+        Function to run one of the PEST executables shipped
+        with the application inside the session workspace.
+        Output is logged once the program ends, unless it is
+        streamed line by line to `on_line`.
+        '''
+        job = self.supervisor.run([os.path.join(self.app_dir, name)] + list(args), cwd=workspace.path,
+                                  timeout=timeout if timeout is not None else self.utility_timeout, name=name, on_line=on_line)
+        if job.output and on_line is None:
+            self.log(job.output)
+        if not job.ok:
+            raise PipelineError("{} ended with state '{}'".format(name, job.state))
+        return job
+
+    def _key(self, stage: PipelineStage, context: dict) -> str:
+        digest = hashlib.sha256(stage.name.encode("utf-8"))
+        for name in stage.depends:
+            digest.update(json.dumps(context.get(name), sort_keys=True, default=str).encode("utf-8"))
+        for name in stage.after:
+            digest.update(self.keys[name].encode("ascii"))
+        return digest.hexdigest()
+
+    def run(self, stages: list, context: dict, workspace, cancel_event=None) -> None:
+        r'''
+        Function to run `stages` in order. Raises <PipelineError>
+        if a stage fails and <PipelineCancelled> if `cancel_event`
+        is set between two stages.
+        '''
+        for stage in stages:
+            if cancel_event is not None and cancel_event.is_set():
+                raise PipelineCancelled("Cancelled before stage '{}'".format(stage.name))
+
+            key = self._key(stage, context)
+            self.keys[stage.name] = key
+            entry = os.path.join(self.cache_dir, "{}-{}".format(stage.name, key[:16]))
+
+            if stage.cacheable and os.path.exists(entry) and all(os.path.exists(os.path.join(entry, name)) for name in stage.outputs):
+                for name in stage.outputs:
+                    shutil.copy(os.path.join(entry, name), workspace.file(name))
+                self.log(">>> [INFO] Stage '{}' unchanged, reused cached outputs".format(stage.name))
+                continue
+
+            self.log(">>> [INFO] Stage '{}' running".format(stage.name))
+            start = time.time()
+            try:
+                stage.func(self, context, workspace)
+            except (PipelineError, PestFileError, EstimationError):
+                self.log(" >>> [ERROR] Stage '{}' failed after {:.2f}s".format(stage.name, time.time() - start))
+                raise
+            self.log(">>> [INFO] Stage '{}' done in {:.2f}s".format(stage.name, time.time() - start))
+
+            if stage.cacheable:
+                if os.path.exists(entry):
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.makedirs(entry)
+                for name in stage.outputs:
+                    shutil.copy(workspace.file(name), os.path.join(entry, name))
+
+
+def read_record_sections(path: str) -> defaultdict:
+    r'''
+    Function to split the PEST run record into the
+    sections that start with a `----->` header.
+    '''
+    with open(path, "r") as f:
+        test_rec = f.read().splitlines()
+
+    test_rec_store = defaultdict(list)
+    curr = None
+
+    for line in test_rec:
+        if "----->" in line:
+            curr = line
+        if curr:
+            test_rec_store[curr].append(line)
+    return test_rec_store
+
+
+def _template(context) -> TemplateFile:
+    lines = []
+    for key, alias in context["aliases"]:
+        if context["variable_state"][key] == "determined":
+            lines.append("{}".format(context["values"][key]))
+        else:
+            lines.append("# {:<10}#".format(alias))
+    lines.append("{}".format(len(context["observations"])))
+    lines += list(map(str, context["observations"]))
+    return TemplateFile(lines, "#")
+
+
+def _parameter_values(context) -> OrderedDict:
+    return OrderedDict((alias, float(context["variable_state"][key])) for key, alias in context["aliases"]
+                       if context["variable_state"][key] != "determined")
+
+
+def _observation_names(context) -> list:
+    return ["o{}".format(idx) for idx in range(1, len(context["observations"]) + 1)]
+
+
+def _write_template(pipeline, context, workspace):
+    _template(context).write(workspace.file("in_1.tpl"))
+
+
+def _write_parameters(pipeline, context, workspace):
+    values = _parameter_values(context)
+    with open(workspace.file("in_1.par"), "w") as f:
+        f.write("single point\n")
+        for alias, value in values.items():
+            f.write("{} {} 1.0 0.0\n".format(alias, value))
+    TemplateFile.read(workspace.file("in_1.tpl")).write_model_input(workspace.file("in_1.dat"), values)
+
+
+def _write_instructions(pipeline, context, workspace):
+    instructions = InstructionFile.for_columns(_observation_names(context), 19, 26)
+    instructions.write(workspace.file("output.ins"))
+    if os.path.exists(workspace.file("output.dat")):
+        instructions.extract(workspace.file("output.dat"))
+
+
+def _write_observations(pipeline, context, workspace):
+    with open(workspace.file("measure.obf"), "w") as f:
+        f.write("\n".join("{} {}".format(name, value) for name, value in zip(_observation_names(context), context["observations"])))
+
+
+def _generate_control(pipeline, context, workspace):
+    observations = OrderedDict(zip(_observation_names(context), map(float, context["observations"])))
+    ControlFile.build(_parameter_values(context), observations).write(workspace.file("pestgen.pst"))
+
+
+def _write_control(pipeline, context, workspace):
+    pst = ControlFile.read(workspace.file("pestgen.pst"))
+    for name, parameter in pst.parameters.items():
+        bounds = context["bounds"][name]
+        parameter["lower"], parameter["upper"] = float(bounds["lower"]), float(bounds["upper"])
+    pst.command = "test"
+    pst.templates = [["in_1.tpl", "in_1.dat"]]
+    pst.instructions = [["output.ins", "output.dat"]]
+    pst.write(workspace.file("test.pst"))
+
+
+def _check_control(pipeline, context, workspace):
+    # In place of pestchek.exe: the log names its producer, so it is not mistaken for pestchek output.
+    pst = ControlFile.read(workspace.file("test.pst"))
+    pst.validate([TemplateFile.read(workspace.file("in_1.tpl"))], [InstructionFile.read(workspace.file("output.ins"))])
+    with open(workspace.file("control_check.log"), "w") as f:
+        f.write("Checked by the in-process validator ControlFile.validate (gui_pestfile.py), not by pestchek.exe\n")
+        f.write("test.pst with in_1.tpl and output.ins: {} parameters, {} observations, no errors found\n".format(
+            len(pst.parameters), len(pst.observations)))
+
+
+def _run_pest(pipeline, context, workspace):
+    pipeline.run_utility(workspace, "pest.exe", "test", timeout=context.get("timeout"), on_line=context.get("on_pest_line"))
+
+
+def _run_estimator(pipeline, context, workspace):
+    pst = ControlFile.read(workspace.file("test.pst"))
+    keys = {alias: key for key, alias in context["aliases"]}
+    parameters = list(pst.parameters.items())
+    estimator = LevenbergMarquardt(
+        [keys[name] for name, _ in parameters], [name for name, _ in parameters],
+        [p["value"] for _, p in parameters], [p["lower"] for _, p in parameters], [p["upper"] for _, p in parameters],
+        [o["value"] for o in pst.observations.values()], context["variable_dictionary"],
+        [workspace.file("in_1.dat"), workspace.file("in_2.dat"), workspace.file("in_3.dat")],
+        workspace.file("test.exe") if os.path.exists(workspace.file("test.exe")) else None, workers=context.get("workers"),
+        engine=context.get("model_engine", "Executable"), log=pipeline.log, on_iteration=context.get("on_iteration"),
+        cancel_event=context.get("cancel_event"))
+    try:
+        result = estimator.run()
+    except EstimationCancelled as e:
+        raise PipelineCancelled(str(e))
+    write_record(workspace.file("test.rec"), result)
+
+
+def _run_multistart(pipeline, context, workspace):
+    try:
+        run_multistart(pipeline, context, workspace, context["starts"])
+    except EstimationCancelled as e:
+        raise PipelineCancelled(str(e))
+
+
+PREPARE_STAGES = [
+    PipelineStage("template", _write_template, depends=("aliases", "variable_state", "values", "observations"), outputs=("in_1.tpl",)),
+    PipelineStage("parameters", _write_parameters, depends=("variable_state",), after=("template",), outputs=("in_1.par", "in_1.dat")),
+    PipelineStage("instructions", _write_instructions, depends=("n_observations",), outputs=("output.ins",)),
+    PipelineStage("observations", _write_observations, depends=("observations",), outputs=("measure.obf",)),
+    PipelineStage("pestgen", _generate_control, after=("parameters", "observations"), outputs=("pestgen.pst",)),
+]
+
+ESTIMATE_STAGES = [
+    PipelineStage("control", _write_control, depends=("bounds",), after=("pestgen",), outputs=("test.pst",)),
+    PipelineStage("check", _check_control, after=("control", "instructions"), outputs=("control_check.log",)),
+    PipelineStage("pest", _run_pest, cacheable=False),
+]
+
+NATIVE_STAGES = ESTIMATE_STAGES[:2] + [
+    PipelineStage("estimator", _run_estimator, cacheable=False),
+]
+
+MULTISTART_STAGES = ESTIMATE_STAGES[:2] + [
+    PipelineStage("multistart", _run_multistart, cacheable=False),
+]
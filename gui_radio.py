@@ -202,4 +202,185 @@ class GUIModeInitializer(object):
                             continue
                             # sg.popup_error("Oops!, values should be float, not letters {}".format(self.auto_dict[variable]))
         self.window.close()
-        return self.prepare_output(), self.global_mode
\ No newline at end of file
+        return self.prepare_output(), self.global_mode
+
+class GUISweepSetter(object):
+    r'''
+    Class to enter the parameter table
+    and the number of worker processes
+    for a parameter sweep.
+    '''
+    def __init__(self, variable_name, workers):
+        self.variable_name = list(variable_name)
+        self.layout = [
+            [sg.Column(layout=[[sg.Text("Parameter Sweep", font=("Helvetica", 16))]], element_justification="center", expand_x=True)],
+            [sg.Text("First row: variable names, one parameter set per row, separated by commas or tabs")],
+            [sg.Combo(self.variable_name, key="variable", size=(50, 1), readonly=True), sg.Button("Add Column", key="add")],
+            [sg.Multiline(size=(90, 15), key="table", font=("Consolas", 10))],
+            [sg.Checkbox("Cartesian product of columns", key="product"), sg.Text("Workers"), sg.In(default_text=str(workers), key="workers", size=(5, 1))],
+            [sg.Column(layout=[[sg.Button("Submit", key="exit", pad=(2, 2))]], expand_x=True, element_justification="center")]
+        ]
+
+        self.window = sg.Window(title="Sweep Setter", layout=self.layout, use_default_focus=False)
+
+    def run(self):
+
+        while True:
+            events, values = self.window.read()
+            if events == sg.WINDOW_CLOSED:
+                self.window.close()
+                return None
+            if events == "add" and values["variable"]:
+                lines = values["table"].rstrip("\n").split("\n")
+                lines[0] = ", ".join([x for x in [lines[0].strip(), values["variable"]] if x])
+                self.window["table"].update(value="\n".join(lines))
+                continue
+            if events == "exit":
+                try:
+                    workers = int(values["workers"])
+                    assert workers > 0
+                except (ValueError, AssertionError):
+                    sg.popup_error("Oops!, number of workers should be a positive integer")
+                    continue
+                break
+
+        self.window.close()
+        return values["table"], workers, values["product"]
+
+
+class GUISensitivitySetter(object):
+    r'''
+    Class to enter the parameter ranges, the
+    method and the sample size of a sensitivity
+    analysis.
+    '''
+    def __init__(self, variable_name, workers):
+        self.variable_name = list(variable_name)
+        self.layout = [
+            [sg.Column(layout=[[sg.Text("Sensitivity Analysis", font=("Helvetica", 16))]], element_justification="center", expand_x=True)],
+            [sg.Text("One row per variable: name, lower bound, upper bound")],
+            [sg.Combo(self.variable_name, key="variable", size=(50, 1), readonly=True), sg.Button("Add Row", key="add")],
+            [sg.Multiline(size=(90, 15), key="ranges", font=("Consolas", 10))],
+            [sg.Radio("Morris", "method", key="Morris", default=True), sg.Radio("Sobol", "method", key="Sobol"),
+             sg.Text("Trajectories / samples"), sg.In(default_text="20", key="size", size=(6, 1)),
+             sg.Text("Workers"), sg.In(default_text=str(workers), key="workers", size=(5, 1))],
+            [sg.Column(layout=[[sg.Button("Submit", key="exit", pad=(2, 2))]], expand_x=True, element_justification="center")]
+        ]
+
+        self.window = sg.Window(title="Sensitivity Setter", layout=self.layout, use_default_focus=False)
+
+    def run(self):
+
+        while True:
+            events, values = self.window.read()
+            if events == sg.WINDOW_CLOSED:
+                self.window.close()
+                return None
+            if events == "add" and values["variable"]:
+                text = values["ranges"].rstrip("\n")
+                self.window["ranges"].update(value="\n".join([x for x in [text, values["variable"] + ", , "] if x]))
+                continue
+            if events == "exit":
+                try:
+                    size = int(values["size"])
+                    workers = int(values["workers"])
+                    assert size > 1 and workers > 0
+                except (ValueError, AssertionError):
+                    sg.popup_error("Oops!, sample size should be an integer above 1 and workers a positive integer")
+                    continue
+                break
+
+        self.window.close()
+        return values["ranges"], "Sobol" if values["Sobol"] else "Morris", size, workers
+
+
+class GUIEnsembleSetter(object):
+    r'''
+    Class to choose the parameter distribution,
+    the ensemble size and the workers of a Monte
+    Carlo uncertainty ensemble.
+    '''
+    def __init__(self, variable_name, workers, estimate=None):
+        self.variable_name = list(variable_name)
+        self.estimate = estimate
+        self.layout = [
+            [sg.Column(layout=[[sg.Text("Uncertainty Ensemble", font=("Helvetica", 16))]], element_justification="center", expand_x=True)],
+            [sg.Radio("Normal from the last estimate (95% confidence limits)", "source", key="estimate", default=estimate is not None,
+                      disabled=estimate is None)],
+            [sg.Radio("Uniform over ranges: one row per variable, name, lower bound, upper bound", "source", key="ranges_source",
+                      default=estimate is None)],
+            [sg.Combo(self.variable_name, key="variable", size=(50, 1), readonly=True), sg.Button("Add Row", key="add")],
+            [sg.Multiline(size=(90, 12), key="ranges", font=("Consolas", 10))],
+            [sg.Text("Members"), sg.In(default_text="500", key="size", size=(7, 1)),
+             sg.Text("Workers"), sg.In(default_text=str(workers), key="workers", size=(5, 1))],
+            [sg.Column(layout=[[sg.Button("Submit", key="exit", pad=(2, 2))]], expand_x=True, element_justification="center")]
+        ]
+
+        self.window = sg.Window(title="Ensemble Setter", layout=self.layout, use_default_focus=False)
+
+    def run(self):
+
+        while True:
+            events, values = self.window.read()
+            if events == sg.WINDOW_CLOSED:
+                self.window.close()
+                return None
+            if events == "add" and values["variable"]:
+                text = values["ranges"].rstrip("\n")
+                self.window["ranges"].update(value="\n".join([x for x in [text, values["variable"] + ", , "] if x]))
+                continue
+            if events == "exit":
+                try:
+                    size = int(values["size"])
+                    workers = int(values["workers"])
+                    assert size > 1 and workers > 0
+                except (ValueError, AssertionError):
+                    sg.popup_error("Oops!, ensemble size should be an integer above 1 and workers a positive integer")
+                    continue
+                break
+
+        self.window.close()
+        return "estimate" if values["estimate"] else "ranges", values["ranges"], size, workers
+
+
+class GUIConvergenceSetter(object):
+    r'''
+    Class to choose the grid variables, the
+    ladder of refinements and the tolerance
+    of a grid-convergence study.
+    '''
+    def __init__(self, workers):
+        self.layout = [
+            [sg.Column(layout=[[sg.Text("Grid Convergence Study", font=("Helvetica", 16))]], element_justification="center", expand_x=True)],
+            [sg.Text("Refine"), sg.Checkbox("nz", key="nz", default=True), sg.Checkbox("delta_x", key="delta_x", default=True),
+             sg.Checkbox("delta_t", key="delta_t", default=True)],
+            [sg.Text("Coarser levels"), sg.Spin(list(range(0, 5)), initial_value=2, key="coarser", size=(3, 1)),
+             sg.Text("Finer levels"), sg.Spin(list(range(0, 4)), initial_value=1, key="finer", size=(3, 1))],
+            [sg.Text("Tolerance [%]"), sg.In(default_text="1", key="tolerance", size=(6, 1)),
+             sg.Text("Workers"), sg.In(default_text=str(workers), key="workers", size=(5, 1))],
+            [sg.Column(layout=[[sg.Button("Submit", key="exit", pad=(2, 2))]], expand_x=True, element_justification="center")]
+        ]
+
+        self.window = sg.Window(title="Grid Study Setter", layout=self.layout, use_default_focus=False)
+
+    def run(self):
+
+        while True:
+            events, values = self.window.read()
+            if events == sg.WINDOW_CLOSED:
+                self.window.close()
+                return None
+            if events == "exit":
+                refine = tuple(name for name in ("nz", "delta_x", "delta_t") if values[name])
+                try:
+                    tolerance = float(values["tolerance"]) / 100
+                    coarser, finer = int(values["coarser"]), int(values["finer"])
+                    workers = int(values["workers"])
+                    assert tolerance > 0 and workers > 0 and coarser + finer >= 2 and refine
+                except (ValueError, AssertionError):
+                    sg.popup_error("Oops!, pick at least one grid variable and three levels, a positive tolerance and workers")
+                    continue
+                break
+
+        self.window.close()
+        return tolerance, coarser, finer, refine, workers
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+@name
+    `gui_render.py`
+
+@description
+    `src file for updating and rasterizing figures off the GUI thread`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+    * matplotlib >= v3.0
+
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+
+def to_ppm(canvas) -> bytes:
+    r'''
+    Function to encode the rendered Agg buffer of `canvas`
+    as a binary PPM image, which Tk photo images load
+    without any imaging library.
+    '''
+    rgba = np.asarray(canvas.buffer_rgba())
+    height, width = rgba.shape[:2]
+    return b"P6 %d %d 255\n" % (width, height) + np.ascontiguousarray(rgba[:, :, :3]).tobytes()
+
+
+class FigureRenderer(object):
+    r'''
+    Class to run figure updates and their Agg rendering
+    on one background thread, so the GUI thread only swaps
+    finished images in. Jobs are coalesced per figure key:
+    a newer update replaces a pending one, every plot call
+    sets the whole figure.
+
+    `render(key, draw, rasterize)` runs on the worker: `draw`
+    is the pending update (or None) and `rasterize` whether
+    the figure is shown; its result is handed to
+    `on_rendered(key, result)`, still on the worker.
+
+    Usage:
+        >>> renderer = FigureRenderer(render, on_rendered)
+        >>> renderer.submit("fig_plot_1", draw=update, rasterize=True)
+    '''
+
+    def __init__(self, render, on_rendered, log=print):
+        self._render = render
+        self._on_rendered = on_rendered
+        self._log = log
+        self._pending = OrderedDict()
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="FigureRenderer", daemon=True)
+        self._thread.start()
+
+    def on_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, key: str, draw=None, rasterize: bool = True) -> None:
+        with self._condition:
+            previous = self._pending.pop(key, (None, False))
+            self._pending[key] = (draw or previous[0], rasterize or previous[1])
+            self._condition.notify_all()
+
+    def wait(self) -> None:
+        r'''
+        Function to block until every submitted job ran.
+        '''
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key, (draw, rasterize) = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                result = self._render(key, draw, rasterize)
+                if rasterize:
+                    self._on_rendered(key, result)
+            except Exception as e:
+                self._log(" >>> [ERROR] Rendering {} failed: {}".format(key, e))
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
@@ -0,0 +1,264 @@
+"""
+@name
+    `gui_sensitivity.py`
+
+@description
+    `src file for Morris and Sobol sensitivity analysis of the forward model`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import numpy as np
+from gui_sweep import run_sweep
+
+
+MORRIS, SOBOL = "Morris", "Sobol"
+DEFAULT_STUDY_ROOT = "./.tmp/sensitivity"
+
+
+def parse_ranges(text: str, variable_names: list) -> tuple:
+    r'''
+    Function to parse one `name, lower, upper` row per
+    variable (keys of `GUIBase._VariableDict`), separated
+    by commas, semicolons or tabs.
+
+    Returns the names and the lower and upper bound arrays.
+    '''
+    names, lower, upper = [], [], []
+    for line in [line for line in text.splitlines() if line.strip()]:
+        cells = [cell.strip() for cell in re.split(r"[,;\t]", line)]
+        if len(cells) != 3:
+            raise ValueError("Row '{}' should be: variable name, lower bound, upper bound".format(line))
+        if cells[0] not in variable_names:
+            raise ValueError("Unknown variable in range table: '{}'".format(cells[0]))
+        if cells[0] in names:
+            raise ValueError("Variable '{}' appears twice".format(cells[0]))
+        low, high = float(cells[1]), float(cells[2])
+        if not low < high:
+            raise ValueError("Lower bound of '{}' must be below its upper bound".format(cells[0]))
+        names.append(cells[0])
+        lower.append(low)
+        upper.append(high)
+    if not names:
+        raise ValueError("Range table is empty")
+    return names, np.array(lower), np.array(upper)
+
+
+def morris_design(trajectories: int, n_parameters: int, levels: int = 4, seed: int = 0) -> np.ndarray:
+    r'''
+    Function to build `trajectories` Morris one-at-a-time
+    trajectories on a `levels` grid of the unit hypercube.
+    Each trajectory has n_parameters + 1 points and moves
+    one parameter by delta = levels / (2 (levels - 1)) per step.
+
+    Returns a (trajectories * (n_parameters + 1), n_parameters) array.
+    '''
+    rng = np.random.default_rng(seed)
+    k = n_parameters
+    delta = levels / (2.0 * (levels - 1))
+    # Lower-triangular ones: row j has moved the first j parameters.
+    steps = np.tril(np.ones((k + 1, k)), -1)
+    design = []
+    for _ in range(trajectories):
+        base = rng.integers(0, levels // 2, size=k) / (levels - 1)
+        signs = rng.choice([-1.0, 1.0], size=k)
+        order = rng.permutation(k)
+        start = np.where(signs > 0, base, base + delta)
+        points = start + steps * (signs * delta)
+        permuted = np.empty_like(points)
+        permuted[:, order] = points
+        design.append(permuted)
+    return np.vstack(design)
+
+
+def saltelli_design(samples: int, n_parameters: int, seed: int = 0) -> np.ndarray:
+    r'''
+    Function to build the Saltelli design: matrices A and B
+    of `samples` random points each, followed by the k
+    matrices AB_i (A with column i taken from B).
+
+    Returns a (samples * (n_parameters + 2), n_parameters) array.
+    '''
+    rng = np.random.default_rng(seed)
+    a = rng.random((samples, n_parameters))
+    b = rng.random((samples, n_parameters))
+    blocks = [a, b]
+    for i in range(n_parameters):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        blocks.append(ab)
+    return np.vstack(blocks)
+
+
+def morris_indices(design: np.ndarray, outputs: np.ndarray, n_parameters: int) -> dict:
+    r'''
+    Function to compute the Morris mu* and sigma of every
+    parameter from the unit `design` and the (n_points, n_times)
+    `outputs`. Elementary effects are taken per time step and
+    reduced to their root mean square over the curve.
+    Trajectories with a failed run are skipped.
+    '''
+    k = n_parameters
+    x = design.reshape(-1, k + 1, k)
+    y = outputs.reshape(-1, k + 1, outputs.shape[-1])
+    valid = ~np.isnan(y).any(axis=(1, 2))
+    x, y = x[valid], y[valid]
+
+    dx = np.diff(x, axis=1)
+    moved = np.argmax(np.abs(dx), axis=2)
+    step = np.take_along_axis(dx, moved[..., None], axis=2)[..., 0]
+    effects = np.diff(y, axis=1) / step[..., None]
+
+    ordered = np.empty_like(effects)
+    rows = np.arange(len(effects))[:, None]
+    ordered[rows, moved] = effects
+    mu_star = np.sqrt(np.mean(np.mean(np.abs(ordered), axis=0) ** 2, axis=-1))
+    sigma = np.sqrt(np.mean(np.std(ordered, axis=0) ** 2, axis=-1))
+    return {"mu_star": mu_star, "sigma": sigma, "used": int(valid.sum())}
+
+
+def sobol_indices(outputs: np.ndarray, samples: int, n_parameters: int) -> dict:
+    r'''
+    Function to compute first-order (Saltelli 2010) and total
+    (Jansen) Sobol indices per time step and aggregate them
+    over the curve weighted by the output variance per time.
+    Sample rows with a failed run are skipped.
+    '''
+    k = n_parameters
+    y = outputs.reshape(k + 2, samples, outputs.shape[-1])
+    valid = ~np.isnan(y).any(axis=(0, 2))
+    y = y[:, valid]
+    fa, fb, fab = y[0], y[1], y[2:]
+
+    variance = np.var(np.concatenate([fa, fb]), axis=0)
+    first = np.mean(fb[None] * (fab - fa[None]), axis=1)
+    total = 0.5 * np.mean((fa[None] - fab) ** 2, axis=1)
+    weight = variance.sum()
+    if weight <= 0:
+        return {"S1": np.zeros(k), "ST": np.zeros(k), "used": int(valid.sum())}
+    return {"S1": first.sum(axis=-1) / weight, "ST": total.sum(axis=-1) / weight, "used": int(valid.sum())}
+
+
+class SensitivityStudy(object):
+    r'''
+    Class to run a Morris or Sobol study in batches through
+    <gui_sweep.run_sweep>. The design and every finished
+    batch are stored under `root/<study id>`, the id being a
+    hash of method, names, ranges, size, seed and the
+    `fingerprint` of the model inputs, so running the same
+    study again resumes with the missing batches.
+
+    Usage:
+        >>> study = SensitivityStudy(MORRIS, names, lower, upper, size=20)
+        >>> study.run(variable_dictionary, input_paths, exe_file_path, workers=8)
+        >>> study.indices()
+    '''
+
+    def __init__(self, method: str, names: list, lower: np.ndarray, upper: np.ndarray, size: int,
+                 batch_size: int = 64, seed: int = 0, fingerprint: str = "", root: str = DEFAULT_STUDY_ROOT):
+        if method not in (MORRIS, SOBOL):
+            raise ValueError("Unknown sensitivity method '{}'".format(method))
+        self.method = method
+        self.names = list(names)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.size = size
+        self.batch_size = batch_size
+        self.seed = seed
+
+        config = json.dumps([method, self.names, self.lower.tolist(), self.upper.tolist(), size, seed, batch_size, fingerprint])
+        self.path = os.path.join(root, "{}-{}".format(method.lower(), hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]))
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+        design_path = os.path.join(self.path, "design.npy")
+        if os.path.exists(design_path):
+            self.design = np.load(design_path)
+        else:
+            if method == MORRIS:
+                self.design = morris_design(size, len(self.names), seed=seed)
+            else:
+                self.design = saltelli_design(size, len(self.names), seed=seed)
+            np.save(design_path, self.design)
+
+    @property
+    def parameters(self) -> np.ndarray:
+        return self.lower + self.design * (self.upper - self.lower)
+
+    @property
+    def batches(self) -> int:
+        return int(np.ceil(len(self.design) / self.batch_size))
+
+    def _batch_path(self, index: int) -> str:
+        return os.path.join(self.path, "batch-{:05d}.npy".format(index))
+
+    def pending(self) -> list:
+        return [idx for idx in range(self.batches) if not os.path.exists(self._batch_path(idx))]
+
+    def run(self, variable_dictionary: dict, input_paths: list, exe_file_path: str, workers: int = None,
+            engine: str = "Executable", log=print, cancel_event=None) -> bool:
+        r'''
+        Function to evaluate the batches not on disk yet.
+        Setting `cancel_event` stops the running batch, which
+        is not saved and runs again on resume.
+        Returns True once every batch is done, False if it
+        was cancelled before.
+        '''
+        pending = self.pending()
+        log(">>> [INFO] {} study: {} model runs in {} batches, {} left ({})".format(
+            self.method, len(self.design), self.batches, len(pending), self.path))
+        parameters = self.parameters
+        start = time.time()
+        for done, index in enumerate(pending, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                log(">>> [INFO] {} study paused, {} batches left".format(self.method, len(pending) - done + 1))
+                return False
+            rows = parameters[index * self.batch_size:(index + 1) * self.batch_size]
+            results = run_sweep(self.names, rows.tolist(), variable_dictionary, input_paths, exe_file_path, workers=workers,
+                                log=lambda *args: None, cancel_event=cancel_event, engine=engine)
+            if cancel_event is not None and cancel_event.is_set():
+                log(">>> [INFO] {} study paused, {} batches left".format(self.method, len(pending) - done + 1))
+                return False
+            np.save(self._batch_path(index) + ".part.npy", results)
+            os.replace(self._batch_path(index) + ".part.npy", self._batch_path(index))
+            log(">>> [INFO] {} batch {}/{} done, {:.2f}s elapsed".format(self.method, done, len(pending), time.time() - start))
+        return True
+
+    def outputs(self) -> np.ndarray:
+        batches = [np.load(self._batch_path(idx)) for idx in range(self.batches)]
+        length = max(batch.shape[1] for batch in batches)
+        outputs = np.full((len(self.design), length), np.nan)
+        row = 0
+        for batch in batches:
+            outputs[row:row + len(batch), :batch.shape[1]] = batch
+            row += len(batch)
+        return outputs
+
+    def indices(self) -> dict:
+        r'''
+        Function to compute the indices of a finished study.
+        Returns a dict with the names, the ranking measure
+        (mu* or ST) under "score" and the other indices.
+        '''
+        if self.method == MORRIS:
+            result = morris_indices(self.design, self.outputs(), len(self.names))
+            result["score"] = result["mu_star"]
+        else:
+            result = sobol_indices(self.outputs(), self.size, len(self.names))
+            result["score"] = result["ST"]
+        result["names"] = self.names
+        result["method"] = self.method
+        return result
@@ -0,0 +1,312 @@
+"""
+@name
+    `gui_solver.py`
+
+@description
+    `src file for the NumPy finite-difference solver of the triple-porosity transport model`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import math
+import numpy as np
+from gui_engine import RunCancelled
+
+
+# Porosities, rates and velocities at or below this value switch a term off,
+# the reduced modes of `_initialize_variables` pin unused terms to 1e-16.
+INACTIVE = 1e-12
+
+# Largest cell Peclet number v dx / D = dx / Dispersivity of the centred
+# advection stencil, above which it oscillates. The grid is refined to stay
+# within it, up to MAX_CELLS cells; past that the dispersion is raised to
+# v dx / MAX_PECLET, the least numerical dispersion that keeps it monotone.
+MAX_PECLET = 2.0
+MAX_CELLS = 20000
+
+# Time steps between checks of the cancel event of a run.
+CANCEL_CHECK_STEPS = 200
+
+REGIONS = (
+    ("macropore", "Porosity of the macropore region", "Macropore seepage velocity", "macropore region"),
+    ("mesopore", "Porosity of the mesopore region", "Mesopore seepage velocity", "mesopore region"),
+    ("micropore", "Porosity of the micropore region", None, "micropore region"),
+)
+
+
+class Tridiagonal(object):
+    r'''
+    Class solving tridiagonal systems whose matrix stays
+    fixed, by cyclic reduction: the elimination factors are
+    computed once and every solve is O(n) vectorised work.
+    Every row of `lower`, `diagonal` and `upper` (shape (n,)
+    or (k, n)) is its own system; `lower[..., 0]` and
+    `upper[..., -1]` are not used. The reduction stops at
+    `direct` unknowns, whose small system is inverted.
+    Stable for diagonally dominant matrices.
+
+    Usage:
+        >>> system = Tridiagonal(lower, diagonal, upper)
+        >>> x = system.solve(rhs)
+    '''
+
+    def __init__(self, lower: np.ndarray, diagonal: np.ndarray, upper: np.ndarray, direct: int = 64):
+        self.vector = np.ndim(diagonal) == 1
+        size = np.shape(diagonal)[-1]
+        a, b, c = [np.array(values, dtype=np.float64).reshape(-1, size) for values in (lower, diagonal, upper)]
+        a[:, 0], c[:, -1] = 0.0, 0.0
+
+        # Every level eliminates the odd unknowns from the equations of the even ones.
+        self.levels = []
+        while b.shape[1] > direct:
+            odd = (a[:, 1::2], c[:, 1::2], 1.0 / b[:, 1::2])
+            evens, odds = (b.shape[1] + 1) // 2, b.shape[1] // 2
+            left = -a[:, 2::2] / b[:, 1::2][:, :evens - 1]
+            right = -c[:, 0::2][:, :odds] / b[:, 1::2]
+            a, b, c = np.zeros((len(b), evens)), b[:, 0::2].copy(), np.zeros((len(b), evens))
+            a[:, 1:] = left * odd[0][:, :evens - 1]
+            b[:, 1:] += left * odd[1][:, :evens - 1]
+            b[:, :odds] += right * odd[0]
+            c[:, :odds] = right * odd[1]
+            self.levels.append((left, right) + odd)
+
+        matrices = np.zeros((len(b), b.shape[1], b.shape[1]))
+        idx = np.arange(b.shape[1])
+        matrices[:, idx, idx] = b
+        matrices[:, idx[1:], idx[:-1]] = a[:, 1:]
+        matrices[:, idx[:-1], idx[1:]] = c[:, :-1]
+        self.inverse = np.linalg.inv(matrices)
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        r = np.asarray(rhs, dtype=np.float64).reshape(len(self.inverse), -1)
+        odd_rhs = []
+        for left, right, lower, upper, inverse in self.levels:
+            odd_rhs.append(r[:, 1::2])
+            r = r[:, 0::2].copy()
+            r[:, 1:] += left * odd_rhs[-1][:, :left.shape[1]]
+            r[:, :right.shape[1]] += right * odd_rhs[-1]
+
+        x = np.einsum("kij,kj->ki", self.inverse, r)
+        for (left, right, lower, upper, inverse), r in zip(reversed(self.levels), reversed(odd_rhs)):
+            odd = r - lower * x[:, :r.shape[1]]
+            odd[:, :x.shape[1] - 1] -= upper[:, :x.shape[1] - 1] * x[:, 1:]
+            full = np.empty((len(x), x.shape[1] + r.shape[1]))
+            full[:, 0::2], full[:, 1::2] = x, odd * inverse
+            x = full
+        return x[0] if self.vector else x
+
+
+def _value(variables: dict, name: str) -> float:
+    value = variables.get(name)
+    if value is None or str(value).strip() == "":
+        raise ValueError("No value for '{}'".format(name))
+    return float(value)
+
+
+class TransportModel(object):
+    r'''
+    Class holding the triple-porosity dual-permeability
+    three-site model built from a `_VariableDict`.
+
+    Per region r (macropore f, mesopore s, micropore m) with
+    porosity θ, bulk density ρ, instantaneous fraction F, site
+    fraction f, sorption coefficient Kd and kinetic rate a:
+
+        θ R ∂C/∂t = θ (D ∂²C/∂z² - v ∂C/∂z) - ρ a ((1-F) f Kd C - S) + exchange
+        ∂S/∂t     = a ((1-F) f Kd C - S)
+
+    with R = 1 + ρ F f Kd / θ and D = Dispersivity * v. Only the
+    macropore and mesopore regions are mobile. The exchange terms
+    are ωsf (C_s - C_f) between macropore and mesopore and
+    ωim (C_m - C_s) between mesopore and micropore. Regions,
+    kinetic sites and exchange terms whose coefficients are
+    <= `INACTIVE` are left out, which gives the ADE, MIM, MPNE
+    and DADE modes.
+
+    The inlet concentration is 1 up to the pulse time and 0 after;
+    the outlet at z = Length has a zero gradient. Space is
+    discretised with centred differences (second order) on a
+    grid of at most `MAX_PECLET` cell Peclet number, time with
+    Crank-Nicolson.
+    '''
+
+    def __init__(self, variables: dict):
+        self.length = _value(variables, "Length")
+        self.density = _value(variables, "Bulk density of porous media")
+        self.run_time = _value(variables, "Run time")
+        self.pulse_time = _value(variables, "Pulse time")
+        self.delta_t = _value(variables, "delta_t")
+        self.delta_x = _value(variables, "delta_x")
+        self.nz = int(_value(variables, "nz"))
+        self.dispersivity = _value(variables, "Dispersivity")
+        self.omega_sf = _value(variables, "Solute mass transfer rate b/w meso-macropore")
+        self.omega_im = _value(variables, "Solute mass transfer rate b/w meso-micropore")
+        if self.length <= 0 or self.delta_t <= 0 or self.nz < 1:
+            raise ValueError("Length, delta_t and nz must be positive")
+
+        site_names = {
+            "macropore": "Fraction of sorption site available for macropore region",
+            "mesopore": "Fraction of sorption site available for mesopore region",
+            "micropore": "Fraction of sorption site available for immobile region",
+        }
+        self.regions = []
+        for name, porosity, velocity, suffix in REGIONS:
+            theta = _value(variables, porosity)
+            if theta <= INACTIVE:
+                continue
+            instantaneous = _value(variables, "Instantaneous sorption fraction in " + suffix)
+            sites = _value(variables, site_names[name])
+            kd = _value(variables, "Equilibrium sorption coefficient in " + suffix)
+            rate = _value(variables, "Rate-limited sorbed coefficient in " + suffix)
+            v = _value(variables, velocity) if velocity else 0.0
+            self.regions.append({
+                "name": name,
+                "theta": theta,
+                "velocity": v if v > INACTIVE else 0.0,
+                "retardation": 1.0 + self.density * instantaneous * sites * kd / theta,
+                "kinetic_capacity": (1.0 - instantaneous) * sites * kd,
+                "rate": rate,
+            })
+        if not any(region["velocity"] > 0 for region in self.regions):
+            raise ValueError("At least one region needs a porosity and a seepage velocity above {}".format(INACTIVE))
+
+    @property
+    def cells(self) -> int:
+        r'''
+        Number of grid cells: the finest of `nz` cells,
+        cells of width `delta_x` and cells of width
+        MAX_PECLET * Dispersivity (capped at MAX_CELLS),
+        so coarse nz/delta_x settings still give an
+        accurate curve.
+        '''
+        cells = self.nz
+        if self.delta_x > 0:
+            cells = max(cells, int(math.ceil(self.length / self.delta_x - 1e-9)))
+        if self.dispersivity > 0:
+            cells = max(cells, min(int(math.ceil(self.length / (MAX_PECLET * self.dispersivity) - 1e-9)), MAX_CELLS))
+        return cells
+
+    def inlet(self, t: np.ndarray) -> np.ndarray:
+        return np.where(t <= self.pulse_time, 1.0, 0.0)
+
+    def _transport_operator(self, region: dict, dx: float, n: int) -> tuple:
+        r'''
+        Function to return the sub-diagonal, diagonal and
+        super-diagonal of the advection-dispersion operator
+        on `n` nodes, and the coefficient of the inlet node.
+        '''
+        v = region["velocity"]
+        d = max(self.dispersivity * v, v * dx / MAX_PECLET)
+        lower = (d / dx**2 + v / (2 * dx)) / region["retardation"]
+        upper = (d / dx**2 - v / (2 * dx)) / region["retardation"]
+        bands = np.array([np.full(n, lower), np.full(n, -(lower + upper)), np.full(n, upper)])
+        # Zero-gradient outlet through a mirrored ghost node.
+        bands[0, n - 1] = lower + upper
+        return bands, lower
+
+    def _reaction_operator(self) -> tuple:
+        # Mobile concentrations first, so the transport step works on a slice of the state.
+        states = [("C", idx) for idx, region in enumerate(self.regions) if region["velocity"] > 0]
+        states += [("C", idx) for idx, region in enumerate(self.regions) if region["velocity"] <= 0]
+        states += [("S", idx) for idx, region in enumerate(self.regions)
+                   if region["rate"] > INACTIVE and region["kinetic_capacity"] > INACTIVE]
+        position = {state: pos for pos, state in enumerate(states)}
+        operator = np.zeros((len(states), len(states)))
+
+        for idx, region in enumerate(self.regions):
+            c = position[("C", idx)]
+            capacity = region["theta"] * region["retardation"]
+            if ("S", idx) in position:
+                s = position[("S", idx)]
+                a = region["rate"]
+                operator[s, c] += a * region["kinetic_capacity"]
+                operator[s, s] -= a
+                operator[c, c] -= self.density * a * region["kinetic_capacity"] / capacity
+                operator[c, s] += self.density * a / capacity
+
+        names = [region["name"] for region in self.regions]
+        for first, second, omega in (("macropore", "mesopore", self.omega_sf), ("mesopore", "micropore", self.omega_im)):
+            if omega <= INACTIVE or first not in names or second not in names:
+                continue
+            i, j = names.index(first), names.index(second)
+            ci, cj = position[("C", i)], position[("C", j)]
+            capacity_i = self.regions[i]["theta"] * self.regions[i]["retardation"]
+            capacity_j = self.regions[j]["theta"] * self.regions[j]["retardation"]
+            operator[ci, ci] -= omega / capacity_i
+            operator[ci, cj] += omega / capacity_i
+            operator[cj, cj] -= omega / capacity_j
+            operator[cj, ci] += omega / capacity_j
+        return operator, position
+
+    def breakthrough(self, end_time: float = None, cancel_event=None) -> tuple:
+        r'''
+        Function to integrate the model up to `end_time`
+        (default: Run time) and return the times and the
+        flux-weighted outlet concentration at every step.
+        Raises <gui_engine.RunCancelled> once `cancel_event`
+        is set.
+        '''
+        end_time = self.run_time if end_time is None else end_time
+        n = self.cells
+        dx = self.length / n
+        dt = self.delta_t
+        steps = max(int(math.ceil(end_time / dt - 1e-9)), 1)
+
+        # Crank-Nicolson for transport, all mobile regions at once: one row
+        # per region, the implicit tridiagonal matrix is factored once.
+        reaction, position = self._reaction_operator()
+        bands, inflow, flux = [], [], []
+        for idx, region in enumerate(self.regions):
+            if region["velocity"] <= 0:
+                continue
+            operator, coefficient = self._transport_operator(region, dx, n)
+            bands.append(operator)
+            inflow.append(coefficient * 0.5 * dt)
+            flux.append(region["theta"] * region["velocity"])
+        lower, diagonal, upper = 0.5 * dt * np.stack(bands, axis=1)
+        implicit = Tridiagonal(-lower, 1.0 - diagonal, -upper)
+        inflow = np.array(inflow)
+        weights = np.array(flux) / sum(flux)
+        mobile = len(flux)
+
+        # Sorption and exchange are linear and local: one small
+        # Crank-Nicolson propagator applied to all nodes at once.
+        size = len(position)
+        exchange = np.linalg.solve(np.eye(size) - 0.5 * dt * reaction, np.eye(size) + 0.5 * dt * reaction)
+        # One row per state, node 0 is the inlet.
+        state, swap = np.zeros((size, n + 1)), np.zeros((size, n + 1))
+
+        times = np.arange(steps + 1) * dt
+        inlet = self.inlet(times)
+        outlet = np.zeros(steps + 1)
+        for step in range(1, steps + 1):
+            if cancel_event is not None and step % CANCEL_CHECK_STEPS == 0 and cancel_event.is_set():
+                raise RunCancelled("Simulation cancelled at t = {:g}".format(times[step]))
+            concentration = state[:mobile, 1:]
+            explicit = concentration * (1.0 + diagonal)
+            explicit[:, 1:] += lower[:, 1:] * concentration[:, :-1]
+            explicit[:, :-1] += upper[:, :-1] * concentration[:, 1:]
+            explicit[:, 0] += inflow * (inlet[step - 1] + inlet[step])
+            state[:mobile, 1:] = implicit.solve(explicit)
+            state, swap = np.matmul(exchange, state, out=swap), state
+            state[:mobile, 0] = inlet[step]
+            outlet[step] = weights @ state[:mobile, -1]
+        return times, outlet
+
+    def simulate(self, observation_times: np.ndarray, cancel_event=None) -> np.ndarray:
+        r'''
+        Function to return the outlet concentration
+        at `observation_times`.
+        '''
+        observation_times = np.asarray(observation_times, dtype=np.float64)
+        end_time = max(self.run_time, float(observation_times.max()) if len(observation_times) else 0.0)
+        times, outlet = self.breakthrough(end_time, cancel_event=cancel_event)
+        return np.interp(observation_times, times, outlet)
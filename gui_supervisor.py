@@ -0,0 +1,282 @@
+"""
+@name
+    `gui_supervisor.py`
+
+@description
+    `src file for the asyncio based supervisor of external processes`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import itertools
+import threading
+import subprocess
+from collections import deque
+
+
+MAX_OUTPUT_LINES = 5000
+QUEUED, RUNNING, FINISHED, FAILED, TIMEOUT, CANCELLED = "queued", "running", "finished", "failed", "timeout", "cancelled"
+
+
+def kill_process_tree(pid: int) -> None:
+    r'''
+    Function to kill a process together
+    with all of its children.
+    '''
+    if sys.platform == "win32":
+        subprocess.call(["taskkill", "/F", "/T", "/PID", str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class LineBuffer(object):
+    r'''
+    Class to hand output lines from a background thread to
+    the GUI thread. At most `maxlen` lines are held, older ones
+    are dropped, and `notify` is called only when the buffer
+    goes from empty to non-empty, so a chatty process posts
+    one event per GUI drain instead of one per line.
+    '''
+
+    def __init__(self, maxlen: int = 1000, notify=None):
+        self._lines = deque(maxlen=maxlen)
+        self._dropped = 0
+        self._notified = False
+        self._notify = notify
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+            notify = not self._notified
+            self._notified = True
+        if notify and self._notify is not None:
+            self._notify()
+
+    def drain(self) -> list:
+        with self._lock:
+            lines = list(self._lines)
+            if self._dropped:
+                lines.insert(0, "... {} lines skipped ...".format(self._dropped))
+            self._lines.clear()
+            self._dropped = 0
+            self._notified = False
+        return lines
+
+
+class Job(object):
+    r'''
+    Class holding the state of one supervised process:
+    command, working directory, timeout, exit code,
+    duration and the last `MAX_OUTPUT_LINES` lines of output.
+    '''
+    _ids = itertools.count(1)
+
+    def __init__(self, command: list, cwd: str = None, timeout: float = None, name: str = None, on_done=None, on_line=None):
+        self.id = next(self._ids)
+        self.command = [str(x) for x in command]
+        self.cwd = cwd
+        self.timeout = timeout
+        self.name = name if name else os.path.basename(self.command[0])
+        self.on_done = on_done
+        self.on_line = on_line
+        self.state = QUEUED
+        self.returncode = None
+        self.duration = None
+        self.output = ""
+        self._task = None
+        self._lines = deque(maxlen=MAX_OUTPUT_LINES)
+        self._cancel_requested = False
+        self._finished = threading.Event()
+
+    @property
+    def ok(self) -> bool:
+        return self.state == FINISHED and self.returncode == 0
+
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: float = None):
+        r'''
+        Function to block until the job has ended.
+        Returns the job itself.
+        '''
+        self._finished.wait(timeout)
+        return self
+
+    def __repr__(self):
+        return "<Job {} {} [{}]>".format(self.id, self.name, self.state)
+
+
+class ProcessSupervisor(object):
+    r'''
+    Class to run external processes on an asyncio event loop
+    in a background thread. Every job gets an optional
+    wall-clock timeout, can be cancelled (killing its process
+    tree) and at most `max_concurrent` jobs run at once.
+
+    Usage:
+        >>> supervisor = ProcessSupervisor(max_concurrent=4)
+        >>> job = supervisor.submit(["test.exe"], cwd="./.tmp/runs/run-1", timeout=600)
+        >>> job.wait().returncode
+        >>> supervisor.cancel_all()
+    '''
+
+    def __init__(self, max_concurrent: int = None, log=print):
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.log = log
+        self._jobs = {}
+        self._lock = threading.Lock()
+        if sys.platform == "win32":
+            self._loop = asyncio.ProactorEventLoop()
+        else:
+            self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="ProcessSupervisor", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._ready.set()
+        self._loop.run_forever()
+
+    @property
+    def jobs(self) -> list:
+        r'''
+        List of the jobs that have not ended yet.
+        '''
+        with self._lock:
+            return list(self._jobs.values())
+
+    def submit(self, command: list, cwd: str = None, timeout: float = None, name: str = None, on_done=None, on_line=None) -> Job:
+        r'''
+        Function to queue a process and return its <Job>
+        immediately. `on_line` is called with every output line
+        as it arrives and `on_done` with the job once it has
+        ended, both from the supervisor thread.
+        '''
+        job = Job(command, cwd=cwd, timeout=timeout, name=name, on_done=on_done, on_line=on_line)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._loop.call_soon_threadsafe(self._start, job)
+        return job
+
+    def run(self, command: list, cwd: str = None, timeout: float = None, name: str = None, on_line=None) -> Job:
+        r'''
+        Function to run a process and block until it ends.
+        '''
+        return self.submit(command, cwd=cwd, timeout=timeout, name=name, on_line=on_line).wait()
+
+    def _start(self, job: Job):
+        job._task = self._loop.create_task(self._execute(job))
+        if job._cancel_requested:
+            job._task.cancel()
+
+    async def _execute(self, job: Job):
+        process = None
+        start = time.time()
+        try:
+            async with self._semaphore:
+                if sys.platform == "win32":
+                    kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+                else:
+                    kwargs = {"start_new_session": True}
+                start = time.time()
+                process = await asyncio.create_subprocess_exec(*job.command, cwd=job.cwd, stdout=asyncio.subprocess.PIPE,
+                                                               stderr=asyncio.subprocess.STDOUT, **kwargs)
+                job.state = RUNNING
+                await asyncio.wait_for(self._read_output(job, process), job.timeout)
+                job.returncode = process.returncode
+                job.state = FINISHED if process.returncode == 0 else FAILED
+        except asyncio.TimeoutError:
+            job.state = TIMEOUT
+            await self._kill(process)
+        except asyncio.CancelledError:
+            job.state = CANCELLED
+            await self._kill(process)
+        except OSError as e:
+            job.state = FAILED
+            job.output = str(e)
+        finally:
+            if job._lines:
+                job.output = "\n".join(job._lines)
+            job.duration = time.time() - start
+            self._finish(job)
+
+    async def _read_output(self, job: Job, process):
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            # Console programs redraw progress with carriage returns.
+            for text in line.decode("utf-8", errors="replace").rstrip("\r\n").split("\r"):
+                job._lines.append(text)
+                if job.on_line is not None:
+                    try:
+                        job.on_line(text)
+                    except Exception as e:
+                        self.log(" >>> [ERROR] Output handler of {} failed: {}".format(job.name, e))
+        await process.wait()
+
+    async def _kill(self, process):
+        if process is None or process.returncode is not None:
+            return
+        kill_process_tree(process.pid)
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            pass
+
+    def _finish(self, job: Job):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        if job.state == FINISHED:
+            self.log(">>> [INFO] {} finished with exit code 0 in {:.2f}s".format(job.name, job.duration))
+        elif job.state == FAILED:
+            self.log(" >>> [ERROR] {} failed with exit code {} after {:.2f}s".format(job.name, job.returncode, job.duration))
+        elif job.state == TIMEOUT:
+            self.log(" >>> [ERROR] {} killed after the {}s timeout".format(job.name, job.timeout))
+        else:
+            self.log(">>> [INFO] {} cancelled after {:.2f}s".format(job.name, job.duration))
+        job._finished.set()
+        if job.on_done is not None:
+            try:
+                job.on_done(job)
+            except Exception as e:
+                self.log(" >>> [ERROR] Completion handler of {} failed: {}".format(job.name, e))
+
+    def cancel(self, job: Job) -> None:
+        r'''
+        Function to cancel a queued or running job.
+        '''
+        def request():
+            job._cancel_requested = True
+            if job._task is not None:
+                job._task.cancel()
+        self._loop.call_soon_threadsafe(request)
+
+    def cancel_all(self) -> None:
+        for job in self.jobs:
+            self.cancel(job)
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._loop.call_soon_threadsafe(self._loop.stop)
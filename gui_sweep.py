@@ -0,0 +1,179 @@
+"""
+@name
+    `gui_sweep.py`
+
+@description
+    `src file for running parameter sweeps of the forward model on a process pool`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+import os
+import re
+import time
+import itertools
+import multiprocessing
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from gui_loader import parse_output
+from gui_workspace import WorkspaceManager
+from gui_engine import create_engine, RunCancelled, CANCEL_POLL
+from gui_io import write_variables
+
+
+# Event of the pool this worker process belongs to, set to stop its model runs.
+_STOP = None
+
+
+def _init_worker(stop) -> None:
+    global _STOP
+    _STOP = stop
+
+
+def parse_parameter_table(text: str, variable_names: list, product: bool = False) -> tuple:
+    r'''
+    Function to parse a pasted parameter table.
+
+    The first row holds variable names (keys of `GUIBase._VariableDict`),
+    columns are separated by commas, semicolons or tabs. With `product`
+    set, every column is read as a list of values and the sweep covers
+    their cartesian product, e.g. Dispersivity x Macropore seepage velocity.
+
+    Returns the column names and a list of rows of floats.
+    '''
+    rows = [line for line in text.splitlines() if line.strip()]
+    if len(rows) < 2:
+        raise ValueError("Parameter table needs a header row and at least one row of values")
+
+    split = lambda line: [cell.strip() for cell in re.split(r"[,;\t]", line)]
+    names = split(rows[0])
+    for name in names:
+        if name not in variable_names:
+            raise ValueError("Unknown variable in parameter table: '{}'".format(name))
+
+    table = []
+    for line in rows[1:]:
+        cells = split(line)
+        if len(cells) != len(names):
+            raise ValueError("Row '{}' does not have {} values".format(line, len(names)))
+        table.append([float(cell) if cell else None for cell in cells])
+
+    if product:
+        columns = [[row[idx] for row in table if row[idx] is not None] for idx in range(len(names))]
+        table = [list(row) for row in itertools.product(*columns)]
+    elif any(None in row for row in table):
+        raise ValueError("Empty cells are only allowed with the cartesian product option")
+
+    return names, table
+
+
+def _sweep_worker(args: tuple) -> tuple:
+    r'''
+    Function run in a pool process: stage the inputs into a
+    fresh workspace, write the parameter set through
+    <gui_io.write_variables>, run the model engine and parse output.dat.
+    '''
+    index, names, values, variable_dictionary, input_paths, exe_file_path, workspace_root, engine = args
+    manager = WorkspaceManager(workspace_root)
+    workspace = manager.create("sweep")
+    try:
+        manager.stage_inputs(workspace, *input_paths, exe_file_path=exe_file_path)
+        variables = deepcopy(variable_dictionary)
+        for name, value in zip(names, values):
+            variables[name] = str(value)
+        write_variables(workspace.file("in_1.dat"), workspace.file("in_2.dat"), workspace.file("in_3.dat"), variables)
+
+        start = time.time()
+        try:
+            returncode = create_engine(engine, exe_file_path).run(workspace.path, cancel_event=_STOP)
+        except (ValueError, ArithmeticError, OSError, RunCancelled) as e:
+            return index, None, str(e), time.time() - start
+        duration = time.time() - start
+        if returncode != 0 or not os.path.exists(workspace.file("output.dat")):
+            return index, None, "exit code {}".format(returncode), duration
+        return index, parse_output(workspace.file("output.dat"))[:, 1], None, duration
+    finally:
+        manager.release(workspace)
+
+
+def iter_runs(tasks: list, workers: int, cancel_event=None):
+    r'''
+    Function to run the <_sweep_worker> `tasks` on a pool
+    of `workers` processes and yield their results as they
+    finish. Setting `cancel_event` ends the iteration, drops
+    the tasks not started yet and stops the model runs of
+    the running ones.
+    '''
+    stop = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stop,))
+    try:
+        pending = {pool.submit(_sweep_worker, task) for task in tasks}
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                stop.set()
+                return
+            finished, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+    finally:
+        # Queued tasks are dropped, running ones return as soon as they see `stop`.
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_sweep(names: list, table: list, variable_dictionary: dict, input_paths: list, exe_file_path: str,
+              workers: int = None, workspace_root: str = "./.tmp/runs", log=print, cancel_event=None,
+              engine: str = "Executable") -> np.ndarray:
+    r'''
+    Function to evaluate every parameter set of `table` on a
+    pool of `workers` processes (default: number of cores).
+    Setting `cancel_event` drops the sets not started yet
+    and stops the model runs of the running ones.
+    `engine` names the model engine of `gui_engine.ENGINES`.
+
+    Returns an (n_sets, n_times) float64 array of simulated
+    concentrations; rows of failed runs are NaN.
+    '''
+    workers = workers or os.cpu_count() or 1
+    input_paths = [os.path.abspath(path) for path in input_paths]
+    exe_file_path = os.path.abspath(exe_file_path) if exe_file_path else None
+    workspace_root = os.path.abspath(workspace_root)
+
+    log(">>> [INFO] Sweep of {} parameter sets on {} workers ({})".format(len(table), workers, engine))
+    outputs = [None] * len(table)
+    start = time.time()
+
+    tasks = [(idx, names, row, variable_dictionary, input_paths, exe_file_path, workspace_root, engine) for idx, row in enumerate(table)]
+    done = 0
+    for index, simulated, error, duration in iter_runs(tasks, workers, cancel_event):
+        done += 1
+        outputs[index] = simulated
+        status = "failed ({})".format(error) if error else "done in {:.2f}s".format(duration)
+        log(">>> [INFO] Sweep [{}/{}] set {} {}".format(done, len(table), index + 1, status))
+    if done < len(table) and cancel_event is not None and cancel_event.is_set():
+        log(">>> [INFO] Sweep cancelled after {} of {} sets".format(done, len(table)))
+
+    length = max([len(row) for row in outputs if row is not None], default=0)
+    results = np.full((len(table), length), np.nan)
+    for idx, row in enumerate(outputs):
+        if row is not None:
+            results[idx, :len(row)] = row
+
+    log(">>> [INFO] Sweep finished in {:.2f}s".format(time.time() - start))
+    return results
+
+
+def save_sweep(path: str, names: list, table: list, results: np.ndarray) -> None:
+    r'''
+    Function to save a sweep as .npz with the parameter
+    names, the parameter table and the result array.
+    '''
+    np.savez(path, names=np.array(names), parameters=np.array(table, dtype=np.float64), results=results)
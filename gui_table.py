@@ -0,0 +1,126 @@
+"""
+@name
+    `gui_table.py`
+
+@description
+    `src file for the experimental data held as numpy arrays and served one page of table rows at a time`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+@dependency
+    * numpy >= v18.0
+
+"""
+
+from __future__ import annotations
+
+from gui_lazy import LazyModule
+
+np = LazyModule("numpy")
+
+
+def _as_array(values) -> np.ndarray:
+    r'''
+    Function to convert values to a float array, with
+    NaN for entries that are not numbers (e.g. "NA").
+    '''
+    array = np.empty(len(values), dtype=np.float64)
+    try:
+        array[:] = values
+    except (TypeError, ValueError):
+        for idx, value in enumerate(values):
+            try:
+                array[idx] = float(value)
+            except (TypeError, ValueError):
+                array[idx] = np.nan
+    return array
+
+
+def _format(values: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(values), "NA", values.astype(str))
+
+
+class ObservationTable(object):
+    r'''
+    Class holding the observation times and concentrations
+    as float arrays (NaN shown as "NA") and serving the
+    rows of the experimental data table one page at a time,
+    so a table element only ever holds `page_size` rows.
+
+    Usage:
+        >>> table = ObservationTable(times, concentrations)
+        >>> rows = table.page(table.page_start(4200))
+        >>> table.find("0.25", after=4200)
+    '''
+
+    def __init__(self, times=(), concentrations=(), page_size: int = 100):
+        self.page_size = page_size
+        self.times = _as_array(times)
+        self.concentrations = _as_array(concentrations)
+        self._strings = None
+
+    def __len__(self):
+        return max(len(self.times), len(self.concentrations))
+
+    def set_times(self, values) -> None:
+        self.times = _as_array(values)
+        self._strings = None
+
+    def set_concentrations(self, values) -> None:
+        self.concentrations = _as_array(values)
+        self._strings = None
+
+    def set_concentration(self, row: int, value: float) -> list:
+        r'''
+        Function to change the concentration of `row`,
+        returns the new table row to patch in.
+        '''
+        self.concentrations[row] = float(value)
+        self._strings = None
+        return self.rows(row, row + 1)[0]
+
+    def page_start(self, row: int) -> int:
+        return max(min(row, len(self) - 1), 0) // self.page_size * self.page_size
+
+    def rows(self, start: int, stop: int) -> list:
+        r'''
+        Function to return the table rows [S.No, Time,
+        Concentration] from `start` to `stop`, missing
+        entries as "NA".
+        '''
+        stop = min(stop, len(self))
+        times, concentrations = [_format(column).tolist() for column in self._columns(start, stop)]
+        return [[start + idx + 1, time, concentration] for idx, (time, concentration) in enumerate(zip(times, concentrations))]
+
+    def _columns(self, start: int, stop: int) -> list:
+        columns = []
+        for values in (self.times, self.concentrations):
+            column = np.full(max(stop - start, 0), np.nan)
+            part = values[start:stop]
+            column[:len(part)] = part
+            columns.append(column)
+        return columns
+
+    def page(self, start: int) -> list:
+        return self.rows(start, start + self.page_size)
+
+    def find(self, text: str, after: int = -1):
+        r'''
+        Function to return the first row after `after`
+        (wrapping around) whose time or concentration
+        contains `text`, None when there is none.
+        '''
+        if self._strings is None:
+            self._strings = [_format(column) for column in self._columns(0, len(self))]
+        text = text.strip()
+        if not text or not len(self):
+            return None
+        matches = np.flatnonzero((np.char.find(self._strings[0], text) >= 0) | (np.char.find(self._strings[1], text) >= 0))
+        if not len(matches):
+            return None
+        later = matches[matches > after]
+        return int(later[0] if len(later) else matches[0])
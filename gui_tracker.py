@@ -0,0 +1,140 @@
+"""
+@name
+    `gui_tracker.py`
+
+@description
+    `src file for input change detection with a persisted manifest`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import json
+import hashlib
+
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_MANIFEST_PATH = "./.tmp/manifest.json"
+
+
+def file_signature(path: str) -> list:
+    r'''
+    Function to return the cheap identity
+    of a file as [size, mtime_ns, inode].
+    '''
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    r'''
+    Function to compute the SHA-256 of a file
+    in fixed size chunks, without reading it
+    fully into memory.
+    '''
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileChangeTracker(object):
+    r'''
+    Class to detect changes in the input files and
+    the executable across GUI sessions.
+
+    The (size, mtime_ns, inode) signature of a file is
+    compared first and the file is hashed only when the
+    signature differs from the one in the manifest.
+    Content changes are staged by `stage` and written to
+    the manifest by `commit`, once the model run they
+    triggered has finished.
+
+    Usage:
+        >>> tracker = FileChangeTracker("./.tmp/manifest.json")
+        >>> if tracker.stage(["./in_1.dat", "./in_2.dat", "./in_3.dat", "./test.exe"]):
+                ... run the model ...
+                tracker.commit()
+    '''
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self._entries = self._load()
+        self._pending = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.manifest_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.manifest_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = self.manifest_path + ".part"
+        with open(temp_path, "w") as f:
+            json.dump(self._entries, f, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def stage(self, paths: list) -> bool:
+        r'''
+        Function to check the given files against the manifest.
+        Returns True if the content of any file changed since
+        the last commit.
+        '''
+        isupdates = False
+        touched = False
+
+        for path in paths:
+            key = self._key(path)
+            signature = file_signature(path)
+            entry = self._entries.get(key)
+
+            if entry is not None and entry["stat"] == signature:
+                self._pending.pop(key, None)
+                continue
+
+            checksum = hash_file(path)
+            if entry is not None and entry["sha256"] == checksum:
+                # Same content, new stat (e.g. re-copied by a setter):
+                # safe to refresh immediately so the next check is stat-only.
+                entry["stat"] = signature
+                self._pending.pop(key, None)
+                touched = True
+            else:
+                self._pending[key] = {"stat": signature, "sha256": checksum}
+                isupdates = True
+
+        if touched:
+            self._save()
+        return isupdates
+
+    def commit(self) -> None:
+        r'''
+        Function to persist the staged fingerprints.
+        '''
+        if not self._pending:
+            return
+        self._entries.update(self._pending)
+        self._pending = {}
+        self._save()
+
+    def discard(self) -> None:
+        r'''
+        Function to drop the staged fingerprints,
+        e.g. when the model run failed.
+        '''
+        self._pending = {}
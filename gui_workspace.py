@@ -0,0 +1,151 @@
+"""
+@name
+    `gui_workspace.py`
+
+@description
+    `src file for isolated per-run working directories`
+
+@package
+    `GUI for Fortran/C++ Application`
+
+@official_repository
+    `https://github.com/the-utkarshjain/GUI-for-Fortran`
+
+"""
+
+import os
+import time
+import uuid
+import shutil
+import threading
+
+
+DEFAULT_WORKSPACE_ROOT = "./.tmp/runs"
+
+
+class RunWorkspace(object):
+    r'''
+    Class representing the scratch directory of a single
+    forward run or parameter-estimation session. Inputs are
+    staged into the directory and the executable is started
+    with it as working directory, so concurrent runs never
+    share `in_*.dat`, `output.dat` or PEST files.
+    '''
+
+    def __init__(self, path: str, kind: str):
+        self.path = path
+        self.kind = kind
+        self.created = time.time()
+
+    def file(self, name: str) -> str:
+        r'''
+        Function to return the path of `name`
+        inside the workspace.
+        '''
+        return os.path.join(self.path, name)
+
+    def stage(self, source_path: str, name: str = None) -> str:
+        r'''
+        Function to copy `source_path` into the workspace,
+        optionally under a new file name.
+        '''
+        destination = self.file(name if name else os.path.basename(source_path))
+        shutil.copy(source_path, destination)
+        return destination
+
+    def collect(self, name: str, destination_path: str) -> bool:
+        r'''
+        Function to copy a produced file out of the workspace.
+        Returns False if the file was not produced.
+        '''
+        source = self.file(name)
+        if not os.path.exists(source):
+            return False
+        temp_path = destination_path + ".part"
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, destination_path)
+        return True
+
+    def __repr__(self):
+        return "<RunWorkspace {} at {}>".format(self.kind, self.path)
+
+
+class WorkspaceManager(object):
+    r'''
+    Class to create, track and clean up run workspaces
+    below a common root directory.
+
+    Usage:
+        >>> manager = WorkspaceManager("./.tmp/runs")
+        >>> workspace = manager.create("run")
+        >>> workspace.stage("./in_1.dat")
+        >>> ... run the model with cwd=workspace.path ...
+        >>> workspace.collect("output.dat", "./output.dat")
+        >>> manager.release(workspace)
+    '''
+
+    def __init__(self, root: str = DEFAULT_WORKSPACE_ROOT):
+        self.root = root
+        self._active = {}
+        self._lock = threading.Lock()
+        if not os.path.exists(root):
+            os.makedirs(root)
+
+    def create(self, kind: str = "run") -> RunWorkspace:
+        r'''
+        Function to create a new empty workspace.
+        '''
+        name = "{}-{}-{}".format(kind, time.strftime("%Y%m%d-%H%M%S"), uuid.uuid4().hex[:8])
+        path = os.path.join(self.root, name)
+        os.makedirs(path)
+        workspace = RunWorkspace(path, kind)
+        with self._lock:
+            self._active[path] = workspace
+        return workspace
+
+    def stage_inputs(self, workspace: RunWorkspace, first_file_path: str, second_file_path: str, third_file_path: str, exe_file_path: str = None) -> None:
+        r'''
+        Function to stage the three input files (and the
+        executable, if given) under the names the model expects.
+        '''
+        workspace.stage(first_file_path, "in_1.dat")
+        workspace.stage(second_file_path, "in_2.dat")
+        workspace.stage(third_file_path, "in_3.dat")
+        if exe_file_path is not None:
+            workspace.stage(exe_file_path, "test.exe")
+
+    @property
+    def active(self) -> list:
+        with self._lock:
+            return list(self._active.values())
+
+    def release(self, workspace: RunWorkspace, keep: bool = False) -> None:
+        r'''
+        Function to stop tracking a workspace and
+        delete it unless `keep` is set.
+        '''
+        with self._lock:
+            self._active.pop(workspace.path, None)
+        if not keep:
+            shutil.rmtree(workspace.path, ignore_errors=True)
+
+    def cleanup(self, keep_latest: int = 0) -> None:
+        r'''
+        Function to delete workspaces left on disk that are
+        not in use, keeping the `keep_latest` most recent ones
+        of every kind (e.g. finished PE sessions for inspection).
+        '''
+        with self._lock:
+            active = set(os.path.abspath(path) for path in self._active)
+
+        by_kind = {}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isdir(path) or os.path.abspath(path) in active:
+                continue
+            by_kind.setdefault(name.split("-")[0], []).append(path)
+
+        for paths in by_kind.values():
+            paths.sort(key=os.path.getmtime, reverse=True)
+            for path in paths[keep_latest:]:
+                shutil.rmtree(path, ignore_errors=True)
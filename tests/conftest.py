@@ -0,0 +1,21 @@
+import os
+import sys
+import shutil
+import pytest
+
+# The gui_* modules live in the repository root.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gui_io import INPUT_FILES
+
+
+@pytest.fixture
+def case_dir(tmp_path):
+    r'''
+    Fixture with a copy of the shipped in_1.dat,
+    in_2.dat and in_3.dat in a temporary directory.
+    '''
+    for name in INPUT_FILES:
+        shutil.copy(os.path.join(ROOT, name), str(tmp_path / name))
+    return str(tmp_path)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from gui_io import read_model_inputs, mode_definitions, apply_mode
+from gui_compare import mode_variables, model_statistics, format_comparison
+
+
+def test_model_statistics_match_hand_computation():
+    observed = np.array([1.0, 2.0, 3.0, 4.0])
+    simulated = np.array([[1.0, 2.0, 3.0, 5.0], [0.0, 2.0, 5.0, 3.0]])
+    statistics = model_statistics(observed, simulated, [2, 1])
+    # n = 4, SSE = 1 and 6: n ln(2 pi SSE / n) + n, plus 2k (AIC) or k ln(n) (BIC).
+    assert np.allclose(statistics["SSE"], [1.0, 6.0])
+    assert np.allclose(statistics["RMSE"], [0.5, np.sqrt(1.5)])
+    assert statistics["AIC"] == pytest.approx([9.806331, 14.973369], abs=1e-6)
+    assert statistics["BIC"] == pytest.approx([8.578920, 14.359663], abs=1e-6)
+
+
+def test_failed_modes_rank_last():
+    statistics = model_statistics(np.ones(3), np.array([[np.nan] * 3, [1.0, 1.0, 2.0]]), [1, 1])
+    table = format_comparison({"modes": ["ADE", "MIM"], "parameters": [1, 1], "statistics": statistics})
+    assert [line.split()[0] for line in table.splitlines()[1:]] == ["MIM", "ADE"]
+
+
+def test_mode_variables_pin_through_gui_io(case_dir):
+    variables = read_model_inputs(case_dir)[0]
+    modes = mode_variables(variables)
+    assert list(modes) == list(mode_definitions()) + ["TPNE"]
+    for mode, (pinned, free) in modes.items():
+        assert pinned == apply_mode(mode, dict(variables))
+    # Every reduced mode fits fewer parameters than the full model.
+    assert all(free < modes["TPNE"][1] for mode, (pinned, free) in modes.items() if mode != "TPNE")
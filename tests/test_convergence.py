@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from gui_engine import AUTO
+from gui_convergence import discretization_errors, grid_engine, grid_ladder, RATIO
+
+
+def test_discretization_errors_of_a_second_order_series():
+    t = np.linspace(0.0, 1.0, 50)
+    exact = np.sin(3 * t)
+    # Five levels, coarsest first: the error shrinks by RATIO ** 2 per refinement.
+    h = 0.2 / RATIO ** np.arange(5)
+    curves = exact + (h ** 2)[:, None] * np.cos(5 * t)
+
+    errors, order = discretization_errors(curves)
+    assert order == pytest.approx(2.0, abs=1e-9)
+    true_errors = np.sqrt(np.mean((curves - exact) ** 2, axis=1)) / np.max(np.abs(curves))
+    assert np.allclose(errors, true_errors, rtol=1e-9)
+
+
+def test_grid_independent_curves_get_no_order():
+    errors, order = discretization_errors(np.tile(np.linspace(0.0, 1.0, 20), (4, 1)))
+    assert order is None
+    assert np.all(errors == 0)
+
+
+def test_grid_study_never_resolves_to_a_grid_free_engine():
+    assert grid_engine(AUTO, None).name == "NumPy FD"
+    assert grid_engine(AUTO, "test.exe").name == "Executable"
+    with pytest.raises(ValueError):
+        grid_engine("Analytical ADE", None)
+
+
+def test_grid_ladder_refines_every_variable():
+    ladder = grid_ladder({"nz": "100", "delta_x": "0.1", "delta_t": "0.01"}, coarser=1, finer=1)
+    assert [factor for factor, grid in ladder] == [0.5, 1.0, 2.0]
+    assert ladder[0][1] == {"nz": 50, "delta_x": 0.2, "delta_t": 0.02}
+    assert ladder[2][1] == {"nz": 200, "delta_x": 0.05, "delta_t": 0.005}
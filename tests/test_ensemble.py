@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from gui_ensemble import StreamingQuantiles
+
+
+def _stream(curves, probabilities=(0.05, 0.5, 0.95)):
+    bands = StreamingQuantiles(probabilities)
+    for curve in curves:
+        bands.update(curve)
+    return bands
+
+
+def _p_square(values, p):
+    # Scalar P-square of Jain & Chlamtac (1985) for one quantile of one time step.
+    q, n = sorted(values[:5]), [1, 2, 3, 4, 5]
+    desired, increments = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5], [0, p / 2, p, (1 + p) / 2, 1]
+    for x in values[5:]:
+        q[0], q[4] = min(q[0], x), max(q[4], x)
+        cell = min(sum(x >= height for height in q[1:4]), 3)
+        n = [position + (idx > cell) for idx, position in enumerate(n)]
+        desired = [a + b for a, b in zip(desired, increments)]
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * ((n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                                                               + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < parabolic < q[i + 1]:
+                    parabolic = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i], n[i] = parabolic, n[i] + d
+    return q[2]
+
+
+def test_vectorized_update_matches_scalar_p_square():
+    rng = np.random.default_rng(5)
+    curves = rng.lognormal(size=(600, 4))
+    bands = _stream(curves)
+    reference = [[_p_square(curves[:, step].tolist(), p) for step in range(4)] for p in bands.probabilities]
+    assert np.allclose(bands.result(), reference, rtol=1e-12)
+
+
+# Largest error as a fraction of the 5-95% spread of a time step. P-square is weaker in
+# skewed tails; 10% stays below the sampling error of the lognormal 95% quantile itself.
+@pytest.mark.parametrize("distribution, tolerance", [("normal", 0.02), ("uniform", 0.02), ("lognormal", 0.1)])
+def test_quantiles_match_np_quantile(distribution, tolerance):
+    rng = np.random.default_rng(17)
+    curves = getattr(rng, distribution)(size=(4000, 30)) * np.linspace(1.0, 3.0, 30)
+    bands = _stream(curves)
+    exact = np.quantile(curves, bands.probabilities, axis=0)
+    assert np.all(np.abs(bands.result() - exact) < tolerance * (exact[2] - exact[0]))
+    assert np.allclose(bands.mean, curves.mean(axis=0))
+
+
+def test_quantiles_stay_ordered():
+    rng = np.random.default_rng(3)
+    bands = _stream(rng.exponential(size=(1000, 12)), (0.05, 0.25, 0.5, 0.75, 0.95))
+    assert np.all(np.diff(bands.result(), axis=0) >= 0)
+
+
+def test_few_curves_use_exact_quantiles():
+    curves = np.arange(12, dtype=np.float64).reshape(4, 3)
+    bands = _stream(curves)
+    assert bands.count == 4
+    assert np.allclose(bands.result(), np.quantile(curves, bands.probabilities, axis=0))
+
+
+def test_no_curves():
+    assert StreamingQuantiles().result() is None
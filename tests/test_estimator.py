@@ -0,0 +1,47 @@
+import os
+import numpy as np
+import pytest
+from gui_io import read_model_inputs, apply_mode, INPUT_FILES
+from gui_analytical import breakthrough
+from gui_estimator import LevenbergMarquardt, t_quantile
+
+
+NAMES = ["Dispersivity", "Macropore seepage velocity"]
+
+
+@pytest.mark.parametrize("probability, dof, expected", [
+    (0.975, 3, 3.182446), (0.975, 5, 2.570582), (0.975, 10, 2.228139), (0.975, 30, 2.042272),
+    (0.95, 10, 1.812461), (0.995, 20, 2.845340), (0.025, 8, -2.306004),
+])
+def test_t_quantile_matches_tables(probability, dof, expected):
+    assert t_quantile(probability, dof) == pytest.approx(expected, rel=2e-3 if dof < 10 else 1e-5)
+
+
+def test_levenberg_marquardt_recovers_known_parameters(case_dir):
+    variables, observed, times = read_model_inputs(case_dir)
+    variables = apply_mode("ADE", variables)
+    # A faster front than the shipped case, so the whole breakthrough falls inside the run.
+    true = np.array([0.05, 0.6])
+    variables.update({name: str(value) for name, value in zip(NAMES, true)})
+    synthetic = breakthrough(variables, times[:len(observed)])
+
+    lm = LevenbergMarquardt(NAMES, ["disp", "vel"], true * [1.5, 1.15], true / 10, true * 10, synthetic, variables,
+                            [os.path.join(case_dir, name) for name in INPUT_FILES], None, workers=2,
+                            engine="Analytical ADE", workspace_root=os.path.join(case_dir, "runs"), log=lambda *args: None)
+    result = lm.run()
+    assert np.allclose(result["values"], true, rtol=1e-4)
+    assert np.all(result["lower_limits"] <= true) and np.all(true <= result["upper_limits"])
+
+
+def test_jacobian_steps_stay_inside_bounds():
+    lower, upper = np.array([0.995, 0.999, 0.5, 5.0]), np.array([1.005, 1.0, 1.0, 5.0])
+    lm = LevenbergMarquardt(NAMES * 2, NAMES * 2, [1.0, 1.0, 1.0, 5.0], lower, upper, [0.0], {}, [], None)
+    evaluated = []
+    # Residuals of observed 0 against a model simulating the sum of the parameters.
+    lm._evaluate = lambda sets: evaluated.extend(sets) or [np.array([-np.sum(values)]) for values in sets]
+    jacobian = lm._jacobian(np.array([1.0, 1.0, 1.0, 5.0]), np.array([-8.0]))
+
+    evaluated = np.array(evaluated)
+    assert np.all(evaluated >= lower) and np.all(evaluated <= upper)
+    # d(sum)/dp is 1 for every parameter that can move, 0 for the one pinned by lower == upper.
+    assert np.allclose(jacobian, [[1.0, 1.0, 1.0, 0.0]])
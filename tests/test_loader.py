@@ -0,0 +1,84 @@
+import os
+import time
+import numpy as np
+from gui_io import read_model_inputs
+from gui_engine import write_output
+from gui_loader import parse_output, parse_timestamps, PlotDataLoader, OutputTail
+
+
+def _string_timestamps(path):
+    # Parsing of the plots before gui_loader.
+    times = []
+    with open(path, "r") as f:
+        data = f.read().splitlines()
+        for row in range(1, len(data)):
+            if row > int(data[0]):
+                times.append(float(data[row]))
+    return times
+
+
+def _string_output(path):
+    observed, simulated = [], []
+    with open(path, "r") as f:
+        for line in f.read().splitlines():
+            x, y = line.split()
+            observed.append(float(x))
+            simulated.append(float(y))
+    return observed, simulated
+
+
+def _write_case_output(case_dir, simulated=None):
+    observed = read_model_inputs(case_dir)[1]
+    simulated = np.linspace(0.0, 1.0, len(observed)) ** 3 if simulated is None else simulated
+    path = os.path.join(case_dir, "output.dat")
+    write_output(path, observed, simulated)
+    return path
+
+
+def test_parse_timestamps_matches_string_parsing(case_dir):
+    path = os.path.join(case_dir, "in_2.dat")
+    times = parse_timestamps(path)
+    assert times.dtype == np.float64
+    assert times.tolist() == _string_timestamps(path)
+
+
+def test_parse_output_matches_string_parsing(case_dir):
+    path = _write_case_output(case_dir)
+    output = parse_output(path)
+    observed, simulated = _string_output(path)
+    assert output.shape == (len(observed), 2)
+    assert output[:, 0].tolist() == observed
+    assert output[:, 1].tolist() == simulated
+
+
+def test_parse_output_reads_crlf_files(case_dir):
+    path = _write_case_output(case_dir)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b"\n", b"\r\n"))
+    assert parse_output(path).tolist() == np.array(_string_output(path)).T.tolist()
+
+
+def test_plot_data_loader_reuses_unchanged_files(case_dir):
+    path = _write_case_output(case_dir)
+    loader = PlotDataLoader()
+    first = loader.load(path, os.path.join(case_dir, "in_2.dat"))
+    assert all(a is b or np.shares_memory(a, b) for a, b in zip(first, loader.load(path, os.path.join(case_dir, "in_2.dat"))))
+
+    time.sleep(0.01)
+    _write_case_output(case_dir, simulated=np.full(len(first[0]), 0.5))
+    assert np.all(loader.load(path, os.path.join(case_dir, "in_2.dat"))[2] == 0.5)
+
+
+def test_output_tail_reads_complete_lines_only(tmp_path):
+    path = str(tmp_path / "output.dat")
+    tail = OutputTail(path)
+    assert tail.poll() == 0
+    with open(path, "w") as f:
+        f.write("0.1  0.01\n0.2  0.0")
+    assert tail.poll() == 1
+    with open(path, "a") as f:
+        f.write("2\n0.3  0.03\n")
+    assert tail.poll() == 2
+    assert tail.rows().tolist() == [[0.1, 0.01], [0.2, 0.02], [0.3, 0.03]]
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from gui_multistart import latin_hypercube
+
+
+@pytest.mark.parametrize("samples", [1, 7, 50])
+def test_latin_hypercube_uses_every_stratum_once(samples):
+    # Linear ranges, one spanning zero, and a five-decade range sampled on a log scale.
+    lower, upper = np.array([0.0, -2.0, 1e-4]), np.array([1.0, 3.0, 10.0])
+    points = latin_hypercube(samples, lower, upper, seed=samples)
+    assert points.shape == (samples, 3)
+    assert np.all(points >= lower) and np.all(points <= upper)
+
+    unit = (points - lower) / (upper - lower)
+    unit[:, 2] = np.log(points[:, 2] / lower[2]) / np.log(upper[2] / lower[2])
+    strata = np.floor(unit * samples).astype(int)
+    for column in strata.T:
+        assert sorted(column) == list(range(samples))
+
+
+def test_latin_hypercube_rejects_unbounded_ranges():
+    with pytest.raises(ValueError):
+        latin_hypercube(5, np.array([0.0]), np.array([np.inf]))
+    with pytest.raises(ValueError):
+        latin_hypercube(5, np.array([1.0]), np.array([1.0]))
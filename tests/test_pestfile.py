@@ -0,0 +1,128 @@
+import os
+import numpy as np
+import pytest
+import gui_pipeline
+from gui_io import read_model_inputs, read_variables, FIRST_FILE_VARIABLES
+from gui_engine import write_output
+from gui_workspace import RunWorkspace
+from gui_pestfile import TemplateFile, InstructionFile, ControlFile, PestFileError, format_value
+
+
+ALIASES = ["qs", "qf", "omegaim", "omegasf", "alpha"]
+
+
+def _shipped_template(case_dir):
+    with open(os.path.join(case_dir, "in_1.dat"), "r") as f:
+        lines = f.read().splitlines()
+    return TemplateFile(["# {:<10}#".format(alias) for alias in ALIASES] + lines[len(ALIASES):], "#"), lines
+
+
+def _output(case_dir):
+    variables, observed, times = read_model_inputs(case_dir)
+    simulated = np.linspace(0.0, 0.9, len(observed)) ** 2
+    write_output(os.path.join(case_dir, "output.dat"), observed, simulated)
+    return observed, simulated
+
+
+@pytest.mark.parametrize("value", [0.264, 1e-16, 4.7e-05, 123456789.0, -0.00976])
+@pytest.mark.parametrize("width", [8, 12])
+def test_format_value_fits_the_parameter_space(value, width):
+    text = format_value(value, width)
+    assert len(text) == width
+    assert float(text) == pytest.approx(value, rel=10 ** -(width - 7))
+
+
+def test_template_renders_shipped_in_1(case_dir):
+    template, lines = _shipped_template(case_dir)
+    assert template.parameters == ALIASES
+    values = dict(zip(ALIASES, map(float, lines[:len(ALIASES)])))
+    template.write_model_input(os.path.join(case_dir, "in_1.dat"), values)
+
+    rendered = read_variables(os.path.join(case_dir, "in_1.dat"), os.path.join(case_dir, "in_3.dat"))
+    for name, line in zip(FIRST_FILE_VARIABLES, lines):
+        assert float(rendered[name]) == pytest.approx(float(line), rel=1e-9)
+    with open(os.path.join(case_dir, "in_1.dat"), "r") as f:
+        assert f.read().splitlines()[len(ALIASES):] == lines[len(ALIASES):]
+
+
+def test_template_file_round_trip(case_dir):
+    template, lines = _shipped_template(case_dir)
+    path = os.path.join(case_dir, "in_1.tpl")
+    template.write(path)
+    copy = TemplateFile.read(path)
+    assert (copy.delimiter, copy.lines, copy.parameters) == (template.delimiter, template.lines, template.parameters)
+
+
+def test_template_rejects_unbalanced_delimiters():
+    with pytest.raises(PestFileError):
+        TemplateFile(["# qs #", "# qf"])
+
+
+def test_instructions_read_output(case_dir):
+    observed, simulated = _output(case_dir)
+    names = ["o{}".format(idx) for idx in range(1, len(observed) + 1)]
+    output = os.path.join(case_dir, "output.dat")
+    assert list(InstructionFile.for_columns(names, 1, 18).extract(output).values()) == pytest.approx(observed, rel=1e-12)
+    # Columns 19-26 hold the simulated value in 7 characters.
+    assert np.allclose(list(InstructionFile.for_columns(names, 19, 26).extract(output).values()), simulated, rtol=1e-3, atol=1e-5)
+
+
+def test_instruction_file_round_trip(case_dir):
+    observed, simulated = _output(case_dir)
+    names = ["o{}".format(idx) for idx in range(1, len(observed) + 1)]
+    instructions = InstructionFile.for_columns(names, 19, 26)
+    path = os.path.join(case_dir, "output.ins")
+    instructions.write(path)
+    copy = InstructionFile.read(path)
+    assert copy.observations == names
+    assert copy.extract(os.path.join(case_dir, "output.dat")) == instructions.extract(os.path.join(case_dir, "output.dat"))
+
+
+def test_non_fixed_instructions(tmp_path):
+    path = str(tmp_path / "out.txt")
+    with open(path, "w") as f:
+        f.write("header\n  1.5   2.5D-01\n")
+    values = InstructionFile(["l2 !a! w !b!"]).extract(path)
+    assert dict(values) == {"a": 1.5, "b": 0.25}
+
+
+def test_control_file_round_trip(tmp_path):
+    pst = ControlFile.build({"qf": 0.36, "alpha": 0.00976}, {"o1": 0.1, "o2": 0.2})
+    pst.parameters["alpha"]["lower"], pst.parameters["alpha"]["upper"] = 1e-4, 1.0
+    path = str(tmp_path / "test.pst")
+    pst.write(path)
+    copy = ControlFile.read(path)
+    assert copy.parameters == pst.parameters
+    assert copy.observations == pst.observations
+    assert (copy.command, copy.templates, copy.instructions) == (pst.command, pst.templates, pst.instructions)
+    copy.validate([TemplateFile(["# qf #", "# alpha #"])], [InstructionFile.for_columns(["o1", "o2"], 19, 26)])
+
+
+def test_control_file_validation_lists_errors():
+    pst = ControlFile.build({"qf": 0.36}, {"o1": 0.1})
+    pst.parameters["qf"]["lower"], pst.parameters["qf"]["upper"] = 1.0, 2.0
+    with pytest.raises(PestFileError) as error:
+        pst.validate([TemplateFile(["# qs #"])], [InstructionFile.for_columns(["o2"], 19, 26)])
+    message = str(error.value)
+    assert "outside" in message and "'qs' is missing" in message and "'o1' is not read" in message
+
+
+def test_check_stage_names_the_validator(case_dir):
+    variables, observed, times = read_model_inputs(case_dir)
+    workspace = RunWorkspace(case_dir, "pe")
+    context = {
+        "aliases": list(gui_pipeline.PE_ALIASES.items()),
+        "variable_state": {key: "determined" for key in gui_pipeline.PE_ALIASES},
+        "values": {key: variables[key] for key in gui_pipeline.PE_ALIASES},
+        "observations": observed.tolist(),
+        "n_observations": len(observed),
+    }
+    context["variable_state"]["Dispersivity"] = variables["Dispersivity"]
+    context["bounds"] = {"alpha": {"lower": "1e-4", "upper": "1"}}
+    for stage in gui_pipeline.PREPARE_STAGES + gui_pipeline.ESTIMATE_STAGES[:2]:
+        stage.func(None, context, workspace)
+
+    assert not os.path.exists(workspace.file("pestchek.log"))
+    with open(workspace.file("control_check.log"), "r") as f:
+        log = f.read()
+    assert "not by pestchek.exe" in log and "1 parameters, {} observations".format(len(observed)) in log
@@ -0,0 +1,71 @@
+import threading
+import numpy as np
+import pytest
+import gui_sensitivity
+from gui_sensitivity import (MORRIS, SOBOL, SensitivityStudy, morris_design, morris_indices, saltelli_design,
+                             sobol_indices)
+
+
+def _linear(points):
+    # y = x1 + 2 x2, x3 has no effect: S1 = (1, 4, 0) / 5 on the unit cube and mu* = (1, 2, 0).
+    return (points[:, 0] + 2 * points[:, 1])[:, None]
+
+
+def test_morris_indices_of_a_linear_model():
+    design = morris_design(20, 3, seed=1)
+    indices = morris_indices(design, _linear(design), 3)
+    assert np.allclose(indices["mu_star"], [1.0, 2.0, 0.0])
+    assert np.allclose(indices["sigma"], 0.0, atol=1e-12)
+    assert indices["used"] == 20
+
+
+def test_sobol_indices_of_a_linear_model():
+    # The estimators are unbiased, their standard deviation is about 0.013 at this size.
+    samples = 65536
+    design = saltelli_design(samples, 3, seed=1)
+    indices = sobol_indices(_linear(design), samples, 3)
+    assert np.allclose(indices["S1"], [0.2, 0.8, 0.0], atol=0.03)
+    assert np.allclose(indices["ST"], [0.2, 0.8, 0.0], atol=0.03)
+
+
+def test_failed_runs_are_skipped():
+    design = morris_design(10, 3, seed=2)
+    outputs = _linear(design)
+    outputs[5] = np.nan
+    indices = morris_indices(design, outputs, 3)
+    assert indices["used"] == 9
+    assert np.allclose(indices["mu_star"], [1.0, 2.0, 0.0])
+
+
+@pytest.mark.parametrize("method", [MORRIS, SOBOL])
+def test_study_resumes_with_the_batches_not_on_disk(tmp_path, monkeypatch, method):
+    cancel_event, state = threading.Event(), {"cancel_in": 2}
+    batches = []
+
+    def run_sweep(names, rows, *args, **kwargs):
+        batches.append(len(rows))
+        if len(batches) == state["cancel_in"]:
+            # Cancel while the second batch runs: the sweep returns it incomplete.
+            cancel_event.set()
+        unit = (np.array(rows) - study.lower) / (study.upper - study.lower)
+        return _linear(unit)
+
+    monkeypatch.setattr(gui_sensitivity, "run_sweep", run_sweep)
+    study = SensitivityStudy(method, ["a", "b", "c"], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], size=16, batch_size=10,
+                             root=str(tmp_path))
+    assert study.pending() == list(range(study.batches))
+
+    assert study.run({}, [], None, cancel_event=cancel_event) is False
+    # The cancelled batch was not saved and is still pending.
+    assert study.pending() == list(range(1, study.batches))
+
+    batches.clear()
+    cancel_event.clear()
+    state["cancel_in"] = None
+    resumed = SensitivityStudy(method, ["a", "b", "c"], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], size=16, batch_size=10,
+                               root=str(tmp_path))
+    assert resumed.path == study.path
+    assert resumed.run({}, [], None, cancel_event=cancel_event) is True
+    assert len(batches) == study.batches - 1
+    assert resumed.pending() == []
+    assert np.allclose(resumed.outputs(), _linear(study.design))
@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pytest
+from gui_io import read_model_inputs, apply_mode
+from gui_loader import parse_output
+from gui_solver import Tridiagonal, TransportModel, MAX_PECLET
+from gui_engine import NumericalEngine
+from gui_analytical import breakthrough
+
+
+# Largest difference from the Ogata-Banks solution, in units of the inlet concentration.
+TOLERANCE = 0.005
+
+
+def _ade(case_dir, **changes):
+    variables, observed, times = read_model_inputs(case_dir)
+    variables = apply_mode("ADE", variables)
+    variables.update({name.replace("_", " "): str(value) for name, value in changes.items()})
+    return variables, times
+
+
+def _dense(lower, diagonal, upper):
+    return np.diag(diagonal) + np.diag(lower[1:], -1) + np.diag(upper[:-1], 1)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 64, 65, 130, 1001])
+def test_tridiagonal_matches_dense_solve(n):
+    rng = np.random.default_rng(n)
+    lower, upper, rhs = rng.random((3, n))
+    diagonal = 2.5 + rng.random(n)
+    x = Tridiagonal(lower, diagonal, upper, direct=4).solve(rhs)
+    assert np.allclose(x, np.linalg.solve(_dense(lower, diagonal, upper), rhs), atol=1e-12)
+
+
+def test_tridiagonal_solves_every_row_as_a_system():
+    rng = np.random.default_rng(0)
+    lower, upper, rhs = rng.random((3, 3, 300))
+    diagonal = 2.5 + rng.random((3, 300))
+    x = Tridiagonal(lower, diagonal, upper).solve(rhs)
+    for row in range(3):
+        assert np.allclose(x[row], np.linalg.solve(_dense(lower[row], diagonal[row], upper[row]), rhs[row]), atol=1e-12)
+
+
+def test_grid_is_refined_to_the_peclet_limit(case_dir):
+    variables, times = _ade(case_dir)
+    model = TransportModel(variables)
+    assert model.length / model.cells <= MAX_PECLET * model.dispersivity
+    assert model.cells >= model.nz
+
+
+def test_ade_matches_ogata_banks_on_shipped_inputs(case_dir):
+    variables, times = _ade(case_dir)
+    simulated = TransportModel(variables).simulate(times)
+    assert np.max(np.abs(simulated - breakthrough(variables, times))) < TOLERANCE
+
+
+@pytest.mark.parametrize("changes", [
+    {"Run_time": 80, "Pulse_time": 20},
+    {"Dispersivity": 0.05, "Macropore_seepage_velocity": 0.5},
+    {"Dispersivity": 0.02, "nz": 10, "delta_x": 0},
+])
+def test_ade_pulse_matches_ogata_banks(case_dir, changes):
+    variables, times = _ade(case_dir, **changes)
+    times = np.linspace(0.5, float(variables["Run time"]), 80)
+    simulated = TransportModel(variables).simulate(times)
+    assert np.max(np.abs(simulated - breakthrough(variables, times))) < 2 * TOLERANCE
+
+
+def test_outlet_stays_within_inlet_bounds(case_dir):
+    variables, observed, times = read_model_inputs(case_dir)
+    variables.update({"Run time": "400", "Pulse time": "10", "delta_t": "0.1"})
+    times, outlet = TransportModel(variables).breakthrough()
+    assert np.all(outlet > -1e-9) and np.all(outlet < 1 + 1e-9)
+
+
+def test_numerical_engine_writes_output(case_dir):
+    variables, observed, times = read_model_inputs(case_dir)
+    assert NumericalEngine().run(case_dir) == 0
+    output = parse_output(os.path.join(case_dir, "output.dat"))
+    assert np.array_equal(output[:, 0], observed)
+    assert np.allclose(output[:, 1], TransportModel(variables).simulate(times[:len(observed)]), rtol=1e-5, atol=1e-7)